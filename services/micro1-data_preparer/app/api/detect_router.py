@@ -2,11 +2,15 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from typing import Optional
 import pandas as pd
-import io
 import yaml
 
+from app.services.admission import MemoryBudgetExceeded, load_admitted
 from app.services.autodetect import detect_metadata, metadata_to_pipeline_config
-from app.storage.minio_client import upload_bytes
+from app.services.dataset_sketch import store_sketch
+from app.services.ingest import UnsupportedFormatError, strip_extension
+from app.services.pipeline_cache import pipeline_cache
+from app.services.spool import SpooledFile, spool_chunks, spool_upload
+from app.storage.minio_client import iter_object_chunks, upload_bytes, upload_file
 from app.core.logger import logger
 from app.models.response_models import DetectResponse
 from app.core.config import settings
@@ -20,26 +24,50 @@ async def detect(
     store_to_minio: Optional[bool] = Form(True)
 ):
     """
-    Upload a CSV and return detected metadata:
-     - stores raw CSV in MinIO at raw/<filename> when store_to_minio=True
+    Upload a dataset (CSV, compressed CSV, Parquet, Arrow/Feather or JSON Lines)
+    and return detected metadata:
+     - stores the raw file in MinIO at raw/<filename> when store_to_minio=True
      - writes a pipeline YAML at pipelines/<filename_no_ext>.yml when store_to_minio=True
+     - stores column sketches at sketches/raw/<filename>/... for /drift when store_to_minio=True
     """
 
-    # Validate file type
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    # Stream the upload to disk, validating the file type on the first chunk
+    try:
+        spooled = await spool_upload(file)
+    except UnsupportedFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
-    # Read and parse CSV
     try:
-        raw = await file.read()
-        if len(raw) == 0:
-            raise HTTPException(status_code=400, detail="Empty file provided")
-        df = pd.read_csv(io.BytesIO(raw))
+        return detect_spooled(spooled, store_to_minio)
+    finally:
+        spooled.close()
+
+
+def detect_spooled(spooled: SpooledFile, store_to_minio: bool, raw_object: Optional[str] = None) -> dict:
+    """
+    Run detection on a spooled dataset and optionally store raw file + pipeline YAML.
+
+    Args:
+        spooled: Dataset spooled to local disk
+        store_to_minio: Store the raw file (unless raw_object is given) and pipeline YAML
+        raw_object: Object the raw data already lives at (e.g. a completed upload)
+    """
+    if spooled.size == 0:
+        raise HTTPException(status_code=400, detail="Empty file provided")
+    fmt = spooled.format
+    filename = spooled.filename
+
+    # Read and parse dataset (rejected up front if it would not fit the memory budget)
+    try:
+        df, admission = load_admitted(spooled)
 
         if df.empty:
-            raise HTTPException(status_code=400, detail="CSV contains no data")
+            raise HTTPException(status_code=400, detail="File contains no data")
 
-        logger.info(f"Successfully read CSV: {file.filename} with {len(df)} rows, {len(df.columns)} columns")
+        logger.info(f"Successfully read {fmt.format}: {filename} with {len(df)} rows, {len(df.columns)} columns")
+    except MemoryBudgetExceeded as exc:
+        logger.error(f"Rejected {filename}: {exc}")
+        raise HTTPException(status_code=413, detail={"message": str(exc), "estimate": exc.estimate.to_dict()})
     except pd.errors.EmptyDataError:
         logger.error("CSV file is empty")
         raise HTTPException(status_code=400, detail="CSV file is empty")
@@ -47,8 +75,8 @@ async def detect(
         logger.error(f"Failed parsing CSV: {exc}")
         raise HTTPException(status_code=400, detail=f"Invalid CSV format: {str(exc)}")
     except Exception as exc:
-        logger.error(f"Failed reading CSV: {exc}")
-        raise HTTPException(status_code=400, detail=f"Failed to read CSV: {str(exc)}")
+        logger.error(f"Failed reading {fmt.format}: {exc}")
+        raise HTTPException(status_code=400, detail=f"Failed to read {fmt.format}: {str(exc)}")
 
     # Run detection
     try:
@@ -64,21 +92,27 @@ async def detect(
         "date_columns": meta.get("date_columns", []),
         "numeric_columns": meta.get("numeric_columns", []),
         "categorical_columns": meta.get("categorical_columns", []),
+        "text_columns": meta.get("text_columns", []),
         "minio_object": None,
-        "pipeline_yml": None
+        "pipeline_yml": None,
+        "size_bytes": spooled.size,
+        "sha256": spooled.sha256
     }
 
     # Store to MinIO if requested
     if store_to_minio:
-        # Store raw CSV
-        object_name = f"raw/{file.filename}"
-        try:
-            upload_bytes(object_name, raw)
-            response["minio_object"] = object_name
-            logger.info(f"Stored raw CSV to MinIO: {object_name}")
-        except Exception as exc:
-            logger.error(f"Failed to store raw file in MinIO: {exc}")
-            raise HTTPException(status_code=500, detail=f"Failed to store raw file: {str(exc)}")
+        # Store raw file (already in MinIO for completed uploads)
+        if raw_object:
+            response["minio_object"] = raw_object
+        else:
+            object_name = f"raw/{filename}"
+            try:
+                upload_file(object_name, spooled.path, metadata={"sha256": spooled.sha256})
+                response["minio_object"] = object_name
+                logger.info(f"Stored raw file to MinIO: {object_name}")
+            except Exception as exc:
+                logger.error(f"Failed to store raw file in MinIO: {exc}")
+                raise HTTPException(status_code=500, detail=f"Failed to store raw file: {str(exc)}")
 
         # Generate and store pipeline config
         try:
@@ -90,11 +124,12 @@ async def detect(
 
             yml_bytes = yaml.dump(pipeline_conf, sort_keys=False, default_flow_style=False).encode("utf-8")
 
-            # Use consistent naming: remove .csv extension and add .yml
-            base_name = file.filename.rsplit('.', 1)[0]
+            # Use consistent naming: remove dataset extension and add .yml
+            base_name = strip_extension(filename)
             yml_name = f"pipelines/{base_name}.yml"
 
-            upload_bytes(yml_name, yml_bytes)
+            result = upload_bytes(yml_name, yml_bytes)
+            pipeline_cache.put(yml_name, pipeline_conf, etag=getattr(result, "etag", None))
             response["pipeline_yml"] = yml_name
 
             logger.info(f"Stored pipeline YAML to MinIO: {yml_name}")
@@ -105,5 +140,27 @@ async def detect(
             # Clean up raw file if pipeline storage failed
             raise HTTPException(status_code=500, detail=f"Failed to store pipeline config: {str(exc)}")
 
-    logger.info(f"Detection completed successfully for {file.filename}")
-    return response
\ No newline at end of file
+        # Column sketches of this version, for drift detection (best effort)
+        try:
+            response["sketch_object"] = store_sketch(df, response["minio_object"], spooled.sha256)
+        except Exception as exc:
+            logger.warning(f"Failed to store column sketches: {exc}")
+
+    logger.info(f"Detection completed successfully for {filename}")
+    return response
+
+
+def detect_stored_object(object_name: str, store_to_minio: bool = True) -> dict:
+    """Stream an object already in MinIO to the spool and run detection on it"""
+    filename = object_name.split('/')[-1]
+    try:
+        spooled = spool_chunks(iter_object_chunks(object_name, settings.SPOOL_CHUNK_SIZE), filename)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except UnsupportedFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    try:
+        return detect_spooled(spooled, store_to_minio, raw_object=object_name)
+    finally:
+        spooled.close()
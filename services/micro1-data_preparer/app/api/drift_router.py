@@ -0,0 +1,84 @@
+# app/api/drift_router.py
+# --------------------------------------------------------------------
+# Drift between dataset versions, computed from stored column sketches
+# only (the data itself is never read).
+#
+#   GET  /drift/versions?dataset=raw/data.csv  -> stored sketch versions
+#   POST /drift  dataset=raw/data.csv          -> latest vs previous version
+#   POST /drift  baseline=<sketch> current=<sketch>
+# --------------------------------------------------------------------
+import time
+from typing import List, Optional
+
+from fastapi import APIRouter, Form, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+
+from app.core.logger import logger
+from app.services.dataset_sketch import sketch_from_bytes
+from app.services.drift import compare_sketches
+from app.storage.minio_client import download_bytes, list_objects
+
+router = APIRouter()
+
+
+def _versions(dataset: str) -> List[str]:
+    prefix = f"sketches/{dataset.strip('/')}/"
+    # Names start with a UTC timestamp, so lexical order is chronological
+    return sorted(name for name in list_objects(prefix) if name.endswith(".json") and "/" not in name[len(prefix):])
+
+
+def _load(object_name: str) -> dict:
+    try:
+        return sketch_from_bytes(download_bytes(object_name))
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"{object_name}: {str(exc)}")
+
+
+@router.get("/versions")
+async def sketch_versions(dataset: str = Query(...)):
+    """List stored sketch versions of a dataset (oldest first)"""
+    versions = await run_in_threadpool(_versions, dataset)
+    return {"dataset": dataset, "versions": versions}
+
+
+@router.post("")
+async def drift(
+    dataset: Optional[str] = Form(None),
+    baseline: Optional[str] = Form(None),
+    current: Optional[str] = Form(None),
+    bins: int = Form(10),
+):
+    """
+    Compare two dataset versions from their sketches.
+
+    Either give dataset (compares its two most recent versions, or baseline
+    against the latest version), or give both baseline and current sketch
+    object names. Returns PSI / KS per column and a retrain recommendation.
+    """
+    started = time.perf_counter()
+
+    if current is None or baseline is None:
+        if not dataset:
+            raise HTTPException(status_code=400, detail="Provide 'dataset', or both 'baseline' and 'current'")
+        versions = await run_in_threadpool(_versions, dataset)
+        if current is None:
+            if not versions:
+                raise HTTPException(status_code=404, detail=f"No sketches stored for {dataset}")
+            current = versions[-1]
+        if baseline is None:
+            older = [v for v in versions if v < current]
+            if not older:
+                raise HTTPException(status_code=404, detail=f"No earlier version of {dataset} to compare with")
+            baseline = older[-1]
+
+    base_sketch = await run_in_threadpool(_load, baseline)
+    cur_sketch = await run_in_threadpool(_load, current)
+
+    report = compare_sketches(base_sketch, cur_sketch, bins=bins)
+    report["baseline"] = baseline
+    report["current"] = current
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    logger.info(f"Drift {baseline} -> {current}: {len(report['drifted_columns'])} drifted columns")
+    return report
@@ -1,15 +1,28 @@
 # app/api/prepare_router.py
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
+import time
 import pandas as pd
-import io
-import yaml
 
 from app.messaging.nats_client import publish_step_done
 
+from app.services.admission import MemoryBudgetExceeded, load_admitted
+from app.services.dataset_profile import store_profile
+from app.services.dataset_sketch import store_sketch
+from app.services.flight_service import register_frame
+from app.services.local_handoff import publish_frame
+from app.services.partitioned import append_partition, prepare_partitioned
 from app.services.pipeline import run_pipeline
-from app.storage.minio_client import upload_bytes, download_bytes
+from app.services.pipeline_cache import pipeline_cache
+from app.services.sampling import parse_sample_specs, sample_label, stratified_sample
+from app.services.validator import DataValidationError
+from app.services.splits import SPLIT_NAMES, build_split_index, parse_split_ratios, split_counts
+from app.services.ingest import UnsupportedFormatError, parse_columns, strip_extension
+from app.services.spool import spool_chunks, spool_upload
+from app.storage.minio_client import upload_bytes, iter_object_chunks
 from app.core.logger import logger
+from app.core.config import settings
 
 router = APIRouter()
 
@@ -20,12 +33,26 @@ async def prepare(
         file: UploadFile = File(None),
         minio_object: Optional[str] = Form(None),
         pipeline_yml: Optional[str] = Form(None),
-        target_column: Optional[str] = Form(None)
+        target_column: Optional[str] = Form(None),
+        backend: Optional[str] = Form(None),
+        columns: Optional[str] = Form(None),
+        samples: Optional[str] = Form(None),
+        split: Optional[str] = Form(None),
+        folds: Optional[int] = Form(None),
+        split_objects: Optional[bool] = Form(False)
 ):
     """
     Prepare the dataset. Provide either file OR minio_object.
     Optionally provide pipeline_yml (MinIO path), otherwise attempts to use
     'pipelines/<rawfilename>.yml' if minio_object is provided.
+    backend selects the execution engine ('pandas' or 'polars'); it overrides
+    the pipeline's own 'backend' key. columns (comma-separated) limits which
+    input columns are read; columnar formats skip the others entirely.
+    samples (e.g. "0.01,0.1" or "10000") additionally stores down-sampled
+    copies of the processed dataset, stratified by target_column if given.
+    split ("train,val,test" ratios, e.g. "0.7,0.15,0.15") stores a
+    deterministic split index next to the output, with stratified k-fold
+    ids when folds is set; split_objects also stores one CSV per split.
 
     Returns cleaned data preview and metadata.
     """
@@ -40,33 +67,53 @@ async def prepare(
             detail="Provide either 'file' OR 'minio_object', not both"
         )
 
+    projection = parse_columns(columns)
+    try:
+        sample_specs = parse_sample_specs(samples)
+        split_ratios = parse_split_ratios(split)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if folds is not None and (split_ratios is None or folds < 2):
+        raise HTTPException(status_code=400, detail="'folds' requires 'split' and must be at least 2")
+
     if file:
-        if not file.filename.endswith('.csv'):
-            raise HTTPException(status_code=400, detail="Only CSV files are supported")
         try:
-            raw = await file.read()
-            if len(raw) == 0:
+            spooled = await spool_upload(file)
+        except UnsupportedFormatError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        try:
+            if spooled.size == 0:
                 raise HTTPException(status_code=400, detail="Empty file provided")
-
-            df = pd.read_csv(io.BytesIO(raw))
+            try:
+                df, admission = load_admitted(spooled, columns=projection)
+            except MemoryBudgetExceeded:
+                raise
+            except Exception as exc:
+                logger.error(f"Failed reading uploaded file: {exc}")
+                raise HTTPException(status_code=400, detail=f"Failed to read {spooled.format.format}: {str(exc)}")
             if df.empty:
-                raise HTTPException(status_code=400, detail="CSV contains no data")
+                raise HTTPException(status_code=400, detail="File contains no data")
             original_filename = file.filename
-            logger.info(f"Loaded CSV from upload: {original_filename} ({len(df)} rows)")
-        except Exception as exc:
-            logger.error(f"Failed reading uploaded file: {exc}")
-            raise HTTPException(status_code=400, detail=f"Failed to read CSV: {str(exc)}")
+            logger.info(f"Loaded {spooled.format.format} from upload: {original_filename} ({len(df)} rows)")
+        except MemoryBudgetExceeded as exc:
+            logger.error(f"Rejected {file.filename}: {exc}")
+            raise HTTPException(status_code=413, detail={"message": str(exc), "estimate": exc.estimate.to_dict()})
+        finally:
+            spooled.close()
 
     elif minio_object:
         try:
-            raw = download_bytes(minio_object)
-            df = pd.read_csv(io.BytesIO(raw))
+            with spool_chunks(iter_object_chunks(minio_object, settings.SPOOL_CHUNK_SIZE), minio_object) as spooled:
+                df, admission = load_admitted(spooled, columns=projection)
             if df.empty:
-                raise HTTPException(status_code=400, detail="CSV from MinIO contains no data")
+                raise HTTPException(status_code=400, detail="File from MinIO contains no data")
             original_filename = minio_object.split('/')[-1]
-            logger.info(f"Loaded CSV from MinIO: {minio_object} ({len(df)} rows)")
+            logger.info(f"Loaded {spooled.format.format} from MinIO: {minio_object} ({len(df)} rows)")
+        except MemoryBudgetExceeded as exc:
+            logger.error(f"Rejected {minio_object}: {exc}")
+            raise HTTPException(status_code=413, detail={"message": str(exc), "estimate": exc.estimate.to_dict()})
         except Exception as exc:
-            logger.error(f"Failed to download CSV from MinIO: {exc}")
+            logger.error(f"Failed to download dataset from MinIO: {exc}")
             raise HTTPException(status_code=400, detail=f"Cannot download file from MinIO: {str(exc)}")
     else:
         raise HTTPException(status_code=400, detail="Must provide either 'file' or 'minio_object'")
@@ -76,28 +123,32 @@ async def prepare(
     pipeline_source = "default (auto-generated)"
     if pipeline_yml:
         try:
-            yml_bytes = download_bytes(pipeline_yml)
-            pipeline_conf = yaml.safe_load(yml_bytes)
+            pipeline_conf = pipeline_cache.get(pipeline_yml)
             pipeline_source = pipeline_yml
         except Exception as exc:
             logger.error(f"Failed to load pipeline YAML: {exc}")
             raise HTTPException(status_code=400, detail=f"Cannot load pipeline YAML: {str(exc)}")
     else:
-        name_no_ext = original_filename.rsplit('.', 1)[0]
+        name_no_ext = strip_extension(original_filename)
         guessed_path = f"pipelines/{name_no_ext}.yml"
         try:
-            yml_bytes = download_bytes(guessed_path)
-            pipeline_conf = yaml.safe_load(yml_bytes)
-            pipeline_source = guessed_path
-        except Exception:
+            pipeline_conf = pipeline_cache.get(guessed_path, required=False)
+            if pipeline_conf is not None:
+                pipeline_source = guessed_path
+        except Exception as exc:
+            logger.warning(f"Ignoring guessed pipeline {guessed_path}: {exc}")
             pipeline_conf = None  # fallback to automatic pipeline
 
     # 3) Run pipeline
     try:
-        processed = run_pipeline(df, pipeline_conf, target_column=target_column)
+        step_report = []
+        processed = run_pipeline(df, pipeline_conf, target_column=target_column, backend=backend, report=step_report)
         if processed.empty:
             raise ValueError("Pipeline produced empty dataset")
         logger.info(f"Pipeline completed: {len(processed)} rows, {len(processed.columns)} columns")
+    except DataValidationError as exc:
+        logger.error(f"Data validation failed: {exc}")
+        raise HTTPException(status_code=422, detail={"message": str(exc), "report": exc.report})
     except Exception as exc:
         logger.error(f"Pipeline error: {exc}")
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(exc)}")
@@ -106,7 +157,7 @@ async def prepare(
     try:
         processed_bytes = processed.to_csv(index=False).encode("utf-8")
         timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
-        base_name = original_filename.rsplit('.', 1)[0]
+        base_name = strip_extension(original_filename)
         out_name = f"processed/{base_name}_processed_{timestamp}.csv"
         upload_bytes(out_name, processed_bytes)
         logger.info(f"Stored processed CSV: {out_name}")
@@ -114,6 +165,72 @@ async def prepare(
         logger.error(f"Failed to store processed CSV: {exc}")
         raise HTTPException(status_code=500, detail=f"Failed to store processed CSV: {str(exc)}")
 
+    # Arrow copy for colocated consumers (best effort, no-op unless LOCAL_HANDOFF_DIR is set)
+    handoff = publish_frame(processed, out_name, processed_bytes)
+    register_frame(out_name, processed)
+
+    # Column sketches of the processed version, for drift detection (best effort)
+    sketch_name = None
+    try:
+        sketch_name = store_sketch(processed, f"processed/{base_name}")
+    except Exception as exc:
+        logger.warning(f"Failed to store column sketches: {exc}")
+
+    # Per-column profile for the model selector (best effort)
+    profile_name = None
+    try:
+        profile_name = store_profile(processed, out_name)
+    except Exception as exc:
+        logger.warning(f"Failed to store dataset profile: {exc}")
+
+    # 4b) Store stratified samples next to the full output
+    sample_objects = []
+    stratify = target_column if target_column in processed.columns else None
+    for spec in sample_specs:
+        try:
+            sampled = stratified_sample(
+                processed,
+                fraction=spec if isinstance(spec, float) else None,
+                n=spec if isinstance(spec, int) else None,
+                stratify=stratify,
+            )
+            sample_name = f"processed/{base_name}_processed_{timestamp}_sample_{sample_label(spec)}.csv"
+            upload_bytes(sample_name, sampled.to_csv(index=False).encode("utf-8"))
+            sample_objects.append({"size": spec, "minio_object": sample_name, "rows": len(sampled)})
+            logger.info(f"Stored sample ({sample_label(spec)}): {sample_name}")
+        except Exception as exc:
+            logger.error(f"Failed to store sample {spec}: {exc}")
+            raise HTTPException(status_code=500, detail=f"Failed to store sample {spec}: {str(exc)}")
+
+    # 4c) Store the train/val/test split index (and optionally one object per split)
+    split_info = None
+    if split_ratios is not None:
+        try:
+            index = build_split_index(processed, split_ratios, n_folds=folds, stratify=stratify)
+            index_name = f"processed/{base_name}_processed_{timestamp}_splits.csv"
+            upload_bytes(index_name, index.to_csv(index=False).encode("utf-8"))
+            split_info = {
+                "index_object": index_name,
+                "ratios": dict(zip(SPLIT_NAMES, split_ratios)),
+                "counts": split_counts(index),
+                "stratified_by": stratify,
+                "folds": folds,
+                "seed": settings.SPLIT_SEED,
+            }
+            if split_objects:
+                split_info["objects"] = {}
+                for name in SPLIT_NAMES:
+                    rows = processed[(index["split"] == name).to_numpy()]
+                    if rows.empty:
+                        continue
+                    part_name = f"processed/{base_name}_processed_{timestamp}_{name}.csv"
+                    upload_bytes(part_name, rows.to_csv(index=False).encode("utf-8"))
+                    split_info["objects"][name] = part_name
+            logger.info(f"Stored split index: {index_name} {split_info['counts']}")
+        except Exception as exc:
+            logger.error(f"Failed to store split index: {exc}")
+            raise HTTPException(status_code=500, detail=f"Failed to store split index: {str(exc)}")
+
     # 5) Prepare preview data (first 10 rows) to send to frontend
     preview_data = processed.head(10).to_dict(orient="records")
 
@@ -124,8 +241,34 @@ async def prepare(
         "columns": len(processed.columns),
         "pipeline_used": pipeline_source,
         "cleaned_data": preview_data,  # frontend can preview first 10 rows
+        "load_strategy": admission.strategy,
+        "rows_removed": {
+            "duplicates": sum(r["rows_removed"] for r in step_report if r["type"] == "deduplicate"),
+            "total": len(df) - len(processed),
+        },
     }
 
+    reductions = [r["details"] for r in step_report if r["type"] == "reduce_features" and "details" in r]
+    if reductions:
+        response["feature_reduction"] = {
+            "dropped": {col: d for details in reductions for col, d in details["dropped"].items()},
+        }
+
+    if sketch_name:
+        response["sketch_object"] = sketch_name
+
+    if profile_name:
+        response["profile_object"] = profile_name
+
+    if handoff:
+        response["local_handoff"] = handoff
+
+    if sample_objects:
+        response["samples"] = sample_objects
+
+    if split_info:
+        response["split"] = split_info
+
     if target_column:
         response["target_column"] = target_column
         response["feature_columns"] = [c for c in processed.columns if c != target_column]
@@ -148,4 +291,175 @@ async def prepare(
 
 
     
-    return response
\ No newline at end of file
+    return response
+
+
+@router.post("/partitioned")
+async def prepare_partitioned_dataset(
+        pipeline_id: str = Form(...),
+        prefix: str = Form(...),
+        pattern: Optional[str] = Form(None),
+        output: Optional[str] = Form(None),
+        pipeline_yml: Optional[str] = Form(None),
+        target_column: Optional[str] = Form(None),
+        columns: Optional[str] = Form(None),
+        resume: bool = Form(True),
+        workers: Optional[int] = Form(None)
+):
+    """
+    Prepare a dataset stored as many raw objects under one prefix.
+
+    prefix selects the raw partitions (e.g. "raw/events/"), optionally
+    filtered by a glob pattern on their path below it ("2024-*.csv").
+    Statistics are fitted over all partitions in parallel, then every
+    partition is transformed with the shared parameters and stored as
+    processed/<output>/part-*.parquet next to a _manifest.json. With
+    resume (default) a re-run skips partitions already finished.
+
+    Pipeline: pipeline_yml, else 'pipelines/<output>.yml', else
+    auto-generated from the first partition.
+    """
+    started = time.perf_counter()
+    prefix = prefix.strip("/") + "/"
+    output = (output or prefix.rstrip("/").split("/")[-1]).strip("/")
+    if not output:
+        raise HTTPException(status_code=400, detail="Cannot derive an output name, provide 'output'")
+
+    pipeline_conf = None
+    pipeline_source = "default (auto-generated)"
+    candidate = pipeline_yml or f"pipelines/{output}.yml"
+    try:
+        pipeline_conf = pipeline_cache.get(candidate, required=bool(pipeline_yml))
+        if pipeline_conf is not None:
+            pipeline_source = candidate
+    except Exception as exc:
+        if pipeline_yml:
+            logger.error(f"Failed to load pipeline YAML: {exc}")
+            raise HTTPException(status_code=400, detail=f"Cannot load pipeline YAML: {str(exc)}")
+        logger.warning(f"Ignoring guessed pipeline {candidate}: {exc}")
+
+    try:
+        result = await run_in_threadpool(
+            prepare_partitioned,
+            prefix,
+            output,
+            pipeline_conf,
+            pattern=pattern,
+            target_column=target_column,
+            columns=parse_columns(columns),
+            resume=resume,
+            workers=workers,
+        )
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except DataValidationError as exc:
+        logger.error(f"Data validation failed: {exc}")
+        raise HTTPException(status_code=422, detail={"message": str(exc), "report": exc.report})
+    except MemoryBudgetExceeded as exc:
+        raise HTTPException(status_code=413, detail={"message": str(exc), "estimate": exc.estimate.to_dict()})
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        logger.error(f"Partitioned prepare failed: {exc}")
+        raise HTTPException(status_code=500, detail=f"Processing failed: {str(exc)}")
+
+    manifest = result["manifest"]
+    response = {
+        "message": "Processing completed successfully" if manifest["complete"] else "Processing incomplete, re-run to resume",
+        "output_prefix": manifest["output"],
+        "manifest_object": result["manifest_object"],
+        "fitted_object": manifest["fitted"],
+        "partitions": len(manifest["partitions"]),
+        "processed": len(result["processed"]),
+        "skipped": len(result["skipped"]),
+        "failed": result["failed"],
+        "rows": manifest["rows"],
+        "columns": len(manifest["columns"] or []),
+        "pipeline_used": pipeline_source,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+    if target_column:
+        response["target_column"] = target_column
+        response["feature_columns"] = [c for c in manifest["columns"] or [] if c != target_column]
+
+    if manifest["complete"]:
+        try:
+            await publish_step_done(
+                "DataPreparer",
+                {
+                    "pipelineId": pipeline_id,
+                    "step": "DataPreparer",
+                    "status": "SUCCESS"
+                }
+            )
+            logger.info("📤 Published DataPreparer SUCCESS to orchestrator")
+        except Exception as exc:
+            logger.error(f"Failed to notify orchestrator: {exc}")
+
+    return response
+
+
+@router.post("/append")
+async def append_to_prepared_dataset(
+        pipeline_id: str = Form(...),
+        minio_object: str = Form(...),
+        output: str = Form(...),
+        refit: bool = Form(False),
+        columns: Optional[str] = Form(None)
+):
+    """
+    Append a new raw object to a prepared (partitioned) dataset.
+
+    Only the new rows are read and transformed, with the dataset's stored
+    fitted parameters, and written as a new partition of
+    processed/<output>/. refit first merges the new rows' statistics into
+    the stored ones (mergeable sketches / moments) and uses the refitted
+    parameters; earlier partitions are not rewritten.
+    """
+    started = time.perf_counter()
+    try:
+        result = await run_in_threadpool(
+            append_partition, minio_object, output, refit=refit, columns=parse_columns(columns)
+        )
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except DataValidationError as exc:
+        logger.error(f"Data validation failed: {exc}")
+        raise HTTPException(status_code=422, detail={"message": str(exc), "report": exc.report})
+    except MemoryBudgetExceeded as exc:
+        raise HTTPException(status_code=413, detail={"message": str(exc), "estimate": exc.estimate.to_dict()})
+    except Exception as exc:
+        logger.error(f"Append to {output} failed: {exc}")
+        raise HTTPException(status_code=500, detail=f"Processing failed: {str(exc)}")
+
+    manifest = result["manifest"]
+    entry = result["entry"]
+    response = {
+        "message": "Partition appended" if result["appended"] else "Object already part of the dataset",
+        "output_prefix": manifest["output"],
+        "manifest_object": result["manifest_object"],
+        "minio_object": entry["object"],
+        "appended": result["appended"],
+        "refitted": result["refitted"],
+        "fitted_revision": manifest.get("fitted_revision", 1),
+        "rows_appended": entry["rows"] if result["appended"] else 0,
+        "rows": manifest["rows"],
+        "partitions": len(manifest["partitions"]),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+    try:
+        await publish_step_done(
+            "DataPreparer",
+            {
+                "pipelineId": pipeline_id,
+                "step": "DataPreparer",
+                "status": "SUCCESS"
+            }
+        )
+        logger.info("📤 Published DataPreparer SUCCESS to orchestrator")
+    except Exception as exc:
+        logger.error(f"Failed to notify orchestrator: {exc}")
+
+    return response
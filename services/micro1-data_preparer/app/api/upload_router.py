@@ -0,0 +1,248 @@
+# app/api/upload_router.py
+# --------------------------------------------------------------------
+# Resumable chunked uploads mapped directly onto MinIO multipart uploads.
+#
+#   POST   /uploads                          -> initiate, returns upload_id
+#   PUT    /uploads/{upload_id}/parts/{n}    -> upload part n (any order, in parallel)
+#   GET    /uploads/{upload_id}              -> parts received so far (for resuming)
+#   POST   /uploads/{upload_id}/complete     -> assemble object, then run detection
+#   DELETE /uploads/{upload_id}              -> abort and discard parts
+#
+#   POST   /uploads/presign                  -> presigned PUT URL for raw/<filename>
+#   POST   /uploads/presign/complete         -> run detection on the uploaded object
+#
+# With presigned URLs the client writes straight to MinIO and the bytes
+# never pass through this process; detection streams the object back.
+#
+# Every part must carry a Content-MD5 (base64) or X-Checksum-SHA256 (hex)
+# header; the server verifies it before forwarding the part, and MinIO
+# verifies the MD5 again on receipt.
+# --------------------------------------------------------------------
+import base64
+import hashlib
+import os
+import threading
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Form, Header, HTTPException, Path, Request
+from minio.error import S3Error
+from starlette.concurrency import run_in_threadpool
+
+from app.api.detect_router import detect_stored_object
+from app.core.config import settings
+from app.core.logger import logger
+from app.storage.minio_client import (
+    abort_multipart_upload, complete_multipart_upload, create_multipart_upload,
+    find_multipart_upload, list_uploaded_parts, presigned_put_url, upload_part
+)
+
+router = APIRouter()
+
+# S3 limits: parts are numbered 1..10000
+MAX_PART_NUMBER = 10000
+
+# upload_id -> object name. Lost on restart; _resolve_upload then reads the
+# record create_multipart_upload stored in MinIO.
+_sessions: Dict[str, str] = {}
+_sessions_lock = threading.Lock()
+
+
+def verify_part_checksum(data: bytes, content_md5: Optional[str], sha256: Optional[str]) -> str:
+    """
+    Check a part against the client-supplied checksum(s).
+
+    Returns:
+        str: base64 MD5 of the data (forwarded to MinIO as Content-MD5)
+
+    Raises:
+        ValueError: If no checksum is given or a checksum does not match
+    """
+    if not content_md5 and not sha256:
+        raise ValueError("A Content-MD5 or X-Checksum-SHA256 header is required for each part")
+
+    md5_b64 = base64.b64encode(hashlib.md5(data).digest()).decode()
+    if content_md5 and content_md5.strip() != md5_b64:
+        raise ValueError("Content-MD5 does not match the received part")
+    if sha256 and sha256.strip().lower() != hashlib.sha256(data).hexdigest():
+        raise ValueError("X-Checksum-SHA256 does not match the received part")
+    return md5_b64
+
+
+async def _resolve_upload(upload_id: str) -> str:
+    with _sessions_lock:
+        object_name = _sessions.get(upload_id)
+    if object_name is None:
+        object_name = await run_in_threadpool(find_multipart_upload, upload_id)
+        if object_name is None:
+            raise HTTPException(status_code=404, detail=f"Upload not found: {upload_id}")
+        with _sessions_lock:
+            _sessions[upload_id] = object_name
+    return object_name
+
+
+async def _read_part(request: Request) -> bytes:
+    """Read the request body, refusing parts above UPLOAD_MAX_PART_SIZE"""
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > settings.UPLOAD_MAX_PART_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Part exceeds UPLOAD_MAX_PART_SIZE ({settings.UPLOAD_MAX_PART_SIZE} bytes)"
+            )
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _raw_object_name(filename: str) -> str:
+    name = os.path.basename(filename or "")
+    if not name or name in (".", ".."):
+        raise HTTPException(status_code=400, detail="A filename is required")
+    return f"raw/{name}"
+
+
+# Declared before the /{upload_id} routes so "presign" is not taken as an id
+@router.post("/presign")
+async def presign_upload(filename: str = Form(...)):
+    """
+    Issue a presigned URL to PUT a raw dataset directly into MinIO.
+
+    The client uploads with `PUT <url>` and then calls /uploads/presign/complete
+    with the returned object_name.
+    """
+    object_name = _raw_object_name(filename)
+    try:
+        url = await run_in_threadpool(presigned_put_url, object_name, settings.UPLOAD_PRESIGN_EXPIRY)
+    except Exception as exc:
+        logger.error(f"Failed to presign upload for {object_name}: {exc}")
+        raise HTTPException(status_code=500, detail=f"Failed to presign upload: {str(exc)}")
+
+    return {
+        "url": url,
+        "method": "PUT",
+        "object_name": object_name,
+        "expires_in": settings.UPLOAD_PRESIGN_EXPIRY,
+    }
+
+
+@router.post("/presign/complete")
+async def complete_presigned_upload(object_name: str = Form(...), store_to_minio: Optional[bool] = Form(True)):
+    """Run detection on an object uploaded through a presigned URL"""
+    if object_name != _raw_object_name(object_name.split("/")[-1]):
+        raise HTTPException(status_code=400, detail="object_name must be a raw/<filename> object")
+    return await run_in_threadpool(detect_stored_object, object_name, store_to_minio)
+
+
+@router.post("")
+async def initiate_upload(filename: str = Form(...)):
+    """
+    Start a resumable upload of a raw dataset to raw/<filename>.
+
+    Returns the upload_id and the recommended part size; parts other than the
+    last must be at least 5 MiB (S3 multipart rule).
+    """
+    object_name = _raw_object_name(filename)
+    try:
+        upload_id = await run_in_threadpool(create_multipart_upload, object_name)
+    except Exception as exc:
+        logger.error(f"Failed to initiate upload for {object_name}: {exc}")
+        raise HTTPException(status_code=500, detail=f"Failed to initiate upload: {str(exc)}")
+
+    with _sessions_lock:
+        _sessions[upload_id] = object_name
+
+    return {
+        "upload_id": upload_id,
+        "object_name": object_name,
+        "part_size": settings.UPLOAD_PART_SIZE,
+        "max_part_size": settings.UPLOAD_MAX_PART_SIZE,
+    }
+
+
+@router.put("/{upload_id}/parts/{part_number}")
+async def put_part(
+    request: Request,
+    upload_id: str,
+    part_number: int = Path(..., ge=1, le=MAX_PART_NUMBER),
+    content_md5: Optional[str] = Header(None, alias="Content-MD5"),
+    checksum_sha256: Optional[str] = Header(None, alias="X-Checksum-SHA256"),
+):
+    """Upload one part (raw request body). Re-sending a part number replaces it."""
+    object_name = await _resolve_upload(upload_id)
+    data = await _read_part(request)
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty part")
+
+    try:
+        md5_b64 = verify_part_checksum(data, content_md5, checksum_sha256)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    try:
+        etag = await run_in_threadpool(upload_part, object_name, upload_id, part_number, data, md5_b64)
+    except S3Error as exc:
+        status = 404 if exc.code == "NoSuchUpload" else 502
+        raise HTTPException(status_code=status, detail=f"Failed to store part {part_number}: {exc.code}")
+    except Exception as exc:
+        logger.error(f"Failed to store part {part_number} of {upload_id}: {exc}")
+        raise HTTPException(status_code=500, detail=f"Failed to store part: {str(exc)}")
+
+    return {"upload_id": upload_id, "part_number": part_number, "etag": etag, "size": len(data)}
+
+
+@router.get("/{upload_id}")
+async def upload_status(upload_id: str):
+    """List the parts received so far so an interrupted client can resume"""
+    object_name = await _resolve_upload(upload_id)
+    try:
+        parts = await run_in_threadpool(list_uploaded_parts, object_name, upload_id)
+    except S3Error as exc:
+        status = 404 if exc.code == "NoSuchUpload" else 502
+        raise HTTPException(status_code=status, detail=f"Failed to list parts: {exc.code}")
+
+    return {
+        "upload_id": upload_id,
+        "object_name": object_name,
+        "parts": [{"part_number": p.part_number, "etag": p.etag, "size": p.size} for p in parts],
+    }
+
+
+@router.post("/{upload_id}/complete")
+async def complete_upload(upload_id: str, store_to_minio: Optional[bool] = Form(True)):
+    """
+    Assemble the uploaded parts into raw/<filename> and run detection on it.
+
+    Returns the same payload as /detect (minio_object points at the upload).
+    """
+    object_name = await _resolve_upload(upload_id)
+    try:
+        parts = await run_in_threadpool(list_uploaded_parts, object_name, upload_id)
+        if not parts:
+            raise HTTPException(status_code=400, detail="No parts uploaded")
+        await run_in_threadpool(complete_multipart_upload, object_name, upload_id, parts)
+    except S3Error as exc:
+        status = 404 if exc.code == "NoSuchUpload" else 400
+        raise HTTPException(status_code=status, detail=f"Failed to complete upload: {exc.code} {exc.message}")
+
+    with _sessions_lock:
+        _sessions.pop(upload_id, None)
+
+    response = await run_in_threadpool(detect_stored_object, object_name, store_to_minio)
+    response["upload_id"] = upload_id
+    response["parts"] = len(parts)
+    return response
+
+
+@router.delete("/{upload_id}")
+async def abort_upload(upload_id: str):
+    """Abort an upload and discard any parts received"""
+    object_name = await _resolve_upload(upload_id)
+    try:
+        await run_in_threadpool(abort_multipart_upload, object_name, upload_id)
+    except S3Error as exc:
+        status = 404 if exc.code == "NoSuchUpload" else 502
+        raise HTTPException(status_code=status, detail=f"Failed to abort upload: {exc.code}")
+
+    with _sessions_lock:
+        _sessions.pop(upload_id, None)
+    return {"upload_id": upload_id, "status": "aborted"}
@@ -4,6 +4,7 @@
 # pydantic/versions issues and keeps configuration explicit.
 # --------------------------------------------------------------------
 import os
+import tempfile
 
 
 class Settings:
@@ -12,6 +13,45 @@ class Settings:
     MINIO_ROOT_PASSWORD: str
     MINIO_BUCKET: str
     MINIO_SECURE: bool
+    MINIO_PUBLIC_ENDPOINT: str
+    MINIO_PUBLIC_SECURE: bool
+    MINIO_REGION: str
+    QUANTILE_SKETCH_K: int
+    PREPARE_WORKERS: int
+    PREPARE_EXECUTOR: str
+    PARALLEL_MIN_ROWS: int
+    PIPELINE_BACKEND: str
+    PIPELINE_CACHE_TTL: float
+    PIPELINE_CACHE_NEGATIVE_TTL: float
+    SPOOL_DIR: str
+    SPOOL_CHUNK_SIZE: int
+    SPOOL_MEMORY_MAP: bool
+    UPLOAD_PART_SIZE: int
+    UPLOAD_MAX_PART_SIZE: int
+    UPLOAD_PRESIGN_EXPIRY: int
+    SAMPLE_SEED: int
+    SPLIT_SEED: int
+    VALIDATION_SAMPLE_ROWS: int
+    SKETCH_TOP_K: int
+    DRIFT_PSI_THRESHOLD: float
+    DRIFT_KS_THRESHOLD: float
+    MEMORY_BUDGET_MB: float
+    MEMORY_BUDGET_FRACTION: float
+    ADMISSION_OVERHEAD: float
+    ADMISSION_SAMPLE_BYTES: int
+    ADMISSION_SAMPLE_ROWS: int
+    PARTITION_WORKERS: int
+    REDUCE_SAMPLE_ROWS: int
+    TEXT_HASH_FEATURES: int
+    TEXT_CHUNK_ROWS: int
+    AUTO_VECTORIZE_TEXT: bool
+    LOCAL_HANDOFF_DIR: str
+    LOCAL_HANDOFF_MAX_BYTES: int
+    FLIGHT_HOST: str
+    FLIGHT_PORT: int
+    FLIGHT_ENDPOINT_ROWS: int
+    FLIGHT_CACHE_BYTES: int
+    PROFILE_MAX_VALUES: int
 
     def __init__(self):
         self.MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "localhost:9000")
@@ -20,9 +60,113 @@ class Settings:
         self.MINIO_BUCKET = os.getenv("MINIO_BUCKET", "data-preparer")
         # Convert string to boolean for MINIO_SECURE
         self.MINIO_SECURE = os.getenv("MINIO_SECURE", "false").lower() in ("true", "1", "yes")
+        # Host clients reach MinIO on (e.g. localhost:9000 or s3.example.com).
+        # Presigned URLs are signed for this host, the host being part of the
+        # signature; empty: MINIO_ENDPOINT. The region is given explicitly so
+        # signing never has to contact the public host.
+        self.MINIO_PUBLIC_ENDPOINT = os.getenv("MINIO_PUBLIC_ENDPOINT", "")
+        self.MINIO_PUBLIC_SECURE = os.getenv("MINIO_PUBLIC_SECURE", os.getenv("MINIO_SECURE", "false")).lower() in ("true", "1", "yes")
+        self.MINIO_REGION = os.getenv("MINIO_REGION", "us-east-1")
 
         # Add project name for API metadata
         self.PROJECT_NAME = os.getenv("PROJECT_NAME", "Data Preparer")
 
+        # Accuracy parameter of the quantile sketches used for medians/IQR.
+        # Columns with at most this many values get exact quantiles.
+        self.QUANTILE_SKETCH_K = int(os.getenv("QUANTILE_SKETCH_K", "200"))
 
-settings = Settings()
\ No newline at end of file
+        # Column-parallel step execution: worker count (defaults to all cores,
+        # also the cap for per-step 'workers'), executor kind ("thread";
+        # "process" or "auto" = processes for object columns are opt-in, as
+        # they fork the server process) and the row count below which steps
+        # stay single-threaded.
+        self.PREPARE_WORKERS = int(os.getenv("PREPARE_WORKERS", str(os.cpu_count() or 1)))
+        self.PREPARE_EXECUTOR = os.getenv("PREPARE_EXECUTOR", "thread")
+        self.PARALLEL_MIN_ROWS = int(os.getenv("PARALLEL_MIN_ROWS", "50000"))
+
+        # Default execution backend for pipelines: "pandas" or "polars"
+        self.PIPELINE_BACKEND = os.getenv("PIPELINE_BACKEND", "pandas")
+
+        # Parsed pipeline YAML cache: seconds an entry is trusted before its
+        # ETag is revalidated, and how long a missing object is remembered.
+        self.PIPELINE_CACHE_TTL = float(os.getenv("PIPELINE_CACHE_TTL", "30"))
+        self.PIPELINE_CACHE_NEGATIVE_TTL = float(os.getenv("PIPELINE_CACHE_NEGATIVE_TTL", "60"))
+
+        # Uploads and downloaded objects are streamed to this directory in
+        # fixed-size chunks and parsed from disk (memory-mapped if enabled).
+        self.SPOOL_DIR = os.getenv("SPOOL_DIR", os.path.join(tempfile.gettempdir(), "data-preparer-spool"))
+        self.SPOOL_CHUNK_SIZE = int(os.getenv("SPOOL_CHUNK_SIZE", str(8 * 1024 * 1024)))
+        self.SPOOL_MEMORY_MAP = os.getenv("SPOOL_MEMORY_MAP", "true").lower() in ("true", "1", "yes")
+
+        # Resumable uploads (/uploads): part size suggested to clients and
+        # the largest part accepted per request (S3 minimum is 5 MiB).
+        self.UPLOAD_PART_SIZE = int(os.getenv("UPLOAD_PART_SIZE", str(16 * 1024 * 1024)))
+        self.UPLOAD_MAX_PART_SIZE = int(os.getenv("UPLOAD_MAX_PART_SIZE", str(64 * 1024 * 1024)))
+        # Lifetime in seconds of presigned direct-to-MinIO upload URLs
+        self.UPLOAD_PRESIGN_EXPIRY = int(os.getenv("UPLOAD_PRESIGN_EXPIRY", "3600"))
+
+        # Default seed of the 'sample' step and /prepare samples
+        self.SAMPLE_SEED = int(os.getenv("SAMPLE_SEED", "42"))
+
+        # Seed of the materialized train/val/test split and k-fold index
+        self.SPLIT_SEED = int(os.getenv("SPLIT_SEED", "42"))
+
+        # 'validate' step: allowed-set / regex checks sample this many rows
+        self.VALIDATION_SAMPLE_ROWS = int(os.getenv("VALIDATION_SAMPLE_ROWS", "1000000"))
+
+        # Column sketches for drift detection: values tracked per categorical
+        # column, and the PSI / KS levels above which a column counts as drifted
+        self.SKETCH_TOP_K = int(os.getenv("SKETCH_TOP_K", "100"))
+        self.DRIFT_PSI_THRESHOLD = float(os.getenv("DRIFT_PSI_THRESHOLD", "0.2"))
+        self.DRIFT_KS_THRESHOLD = float(os.getenv("DRIFT_KS_THRESHOLD", "0.1"))
+
+        # Admission control for dataset loads. The budget is MEMORY_BUDGET_MB
+        # when set, otherwise MEMORY_BUDGET_FRACTION of the container memory
+        # limit. ADMISSION_OVERHEAD scales the parsed size to the peak working
+        # set; the estimate parses ADMISSION_SAMPLE_BYTES of text (or
+        # ADMISSION_SAMPLE_ROWS columnar rows).
+        self.MEMORY_BUDGET_MB = float(os.getenv("MEMORY_BUDGET_MB", "0"))
+        self.MEMORY_BUDGET_FRACTION = float(os.getenv("MEMORY_BUDGET_FRACTION", "0.5"))
+        self.ADMISSION_OVERHEAD = float(os.getenv("ADMISSION_OVERHEAD", "2.0"))
+        self.ADMISSION_SAMPLE_BYTES = int(os.getenv("ADMISSION_SAMPLE_BYTES", str(4 * 1024 * 1024)))
+        self.ADMISSION_SAMPLE_ROWS = int(os.getenv("ADMISSION_SAMPLE_ROWS", "10000"))
+
+        # Partitioned prepare (/prepare/partitioned): partitions loaded and
+        # transformed concurrently. Each one is admitted against the memory
+        # budget on its own, so keep workers * partition size within memory.
+        self.PARTITION_WORKERS = int(os.getenv("PARTITION_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+        # 'reduce_features' step: rows sampled for the near-zero variance and
+        # correlation checks (constant / duplicate checks use every row)
+        self.REDUCE_SAMPLE_ROWS = int(os.getenv("REDUCE_SAMPLE_ROWS", "20000"))
+
+        # 'vectorize_text' step: default number of hashed features per text
+        # column and rows tokenized per chunk
+        self.TEXT_HASH_FEATURES = int(os.getenv("TEXT_HASH_FEATURES", "1024"))
+        self.TEXT_CHUNK_ROWS = int(os.getenv("TEXT_CHUNK_ROWS", "50000"))
+        # Automatic pipelines hash detected text columns only when enabled:
+        # each becomes TEXT_HASH_FEATURES columns, written densely to CSV.
+        # Otherwise text columns are label-encoded like categoricals.
+        self.AUTO_VECTORIZE_TEXT = os.getenv("AUTO_VECTORIZE_TEXT", "false").lower() in ("true", "1", "yes")
+
+        # Local handoff: processed datasets are also written as Arrow IPC
+        # files to this directory (e.g. /dev/shm/microlearn-handoff, shared
+        # with colocated selector / trainer containers). Empty disables it.
+        # Oldest files are evicted beyond LOCAL_HANDOFF_MAX_BYTES.
+        self.LOCAL_HANDOFF_DIR = os.getenv("LOCAL_HANDOFF_DIR", "")
+        self.LOCAL_HANDOFF_MAX_BYTES = int(os.getenv("LOCAL_HANDOFF_MAX_BYTES", str(2 * 1024 ** 3)))
+
+        # Arrow Flight dataset server (0 disables it). Each FlightInfo has
+        # one endpoint per FLIGHT_ENDPOINT_ROWS rows so clients can stream
+        # them in parallel; served tables are kept in a FLIGHT_CACHE_BYTES LRU.
+        self.FLIGHT_HOST = os.getenv("FLIGHT_HOST", "0.0.0.0")
+        self.FLIGHT_PORT = int(os.getenv("FLIGHT_PORT", "0"))
+        self.FLIGHT_ENDPOINT_ROWS = int(os.getenv("FLIGHT_ENDPOINT_ROWS", "250000"))
+        self.FLIGHT_CACHE_BYTES = int(os.getenv("FLIGHT_CACHE_BYTES", str(1024 ** 3)))
+
+        # Dataset profile sidecar (for the model selector): value counts are
+        # kept for columns with at most this many distinct values
+        self.PROFILE_MAX_VALUES = int(os.getenv("PROFILE_MAX_VALUES", "100"))
+
+
+settings = Settings()
@@ -8,7 +8,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.health_router import router as health_router
 from app.api.detect_router import router as detect_router
 from app.api.prepare_router import router as prepare_router
+from app.api.upload_router import router as upload_router
+from app.api.drift_router import router as drift_router
 from app.storage.minio_client import init_minio
+from app.services.column_parallel import shutdown_pools
+from app.services.flight_service import start_flight_server, stop_flight_server
 from app.core.logger import logger
 
 app = FastAPI(title="MicroLearn DataPreparer", version="1.0.0")
@@ -23,6 +27,8 @@ app.add_middleware(
 app.include_router(health_router, prefix="/health", tags=["Health"])
 app.include_router(detect_router, prefix="/detect", tags=["Detect"])
 app.include_router(prepare_router, prefix="/prepare", tags=["Prepare"])
+app.include_router(upload_router, prefix="/uploads", tags=["Uploads"])
+app.include_router(drift_router, prefix="/drift", tags=["Drift"])
 
 
 @app.on_event("startup")
@@ -38,9 +44,16 @@ async def startup_event():
         logger.error(f"✗ Failed to initialize MinIO: {e}")
         logger.warning("App will continue but MinIO operations may fail")
 
+    try:
+        start_flight_server()
+    except Exception as e:
+        logger.error(f"✗ Failed to start Arrow Flight server: {e}")
+
     logger.info("DataPreparer started")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    shutdown_pools()
+    stop_flight_server()
     logger.info("DataPreparer stopped")
\ No newline at end of file
@@ -10,5 +10,9 @@ class DetectResponse(BaseModel):
     date_columns: List[str]
     numeric_columns: List[str]
     categorical_columns: List[str]
+    text_columns: List[str] = []
     minio_object: Optional[str] = None
     pipeline_yml: Optional[str] = None
+    size_bytes: Optional[int] = None
+    sha256: Optional[str] = None
+    sketch_object: Optional[str] = None
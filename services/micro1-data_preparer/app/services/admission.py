@@ -0,0 +1,203 @@
+# app/services/admission.py
+# --------------------------------------------------------------------
+# Memory-aware admission control for dataset loads.
+#
+# Before a spooled dataset is parsed, its in-memory size is estimated:
+#
+#  - CSV / JSON Lines: a decompressed prefix of the file (ADMISSION_SAMPLE_BYTES)
+#    is parsed; bytes-per-row and memory-per-row of that sample are scaled
+#    to the (estimated) uncompressed size.
+#  - Parquet / Arrow IPC: the row count comes from file metadata and the
+#    memory per row from the first ADMISSION_SAMPLE_ROWS rows.
+#
+# The peak working set is taken as estimate * ADMISSION_OVERHEAD (the
+# pipeline copies the frame) and compared to the memory budget:
+#
+#  - fits              -> "eager": read_dataset as before
+#  - otherwise         -> "reject": MemoryBudgetExceeded (HTTP 413)
+#
+# The estimate is the size with the dtypes an eager read gives. Holding
+# parsed chunks with smaller dtypes does not make a larger dataset fit:
+# the pipeline needs eager dtypes (downcast integers overflow, categoricals
+# encode differently), so the frame it gets has eager size either way.
+#
+# The budget is MEMORY_BUDGET_MB, or MEMORY_BUDGET_FRACTION of the
+# container memory limit (cgroup) / physical memory.
+# --------------------------------------------------------------------
+import gzip
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.ingest import DatasetFormat, read_dataset
+
+_CGROUP_LIMIT_FILES = ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes")
+
+
+class MemoryBudgetExceeded(ValueError):
+    """Raised when a dataset would not fit the memory budget"""
+
+    def __init__(self, estimate: "MemoryEstimate"):
+        super().__init__(
+            f"Dataset needs about {estimate.estimated_bytes * settings.ADMISSION_OVERHEAD / 2**20:.0f} MiB, "
+            f"memory budget is {estimate.budget_bytes / 2**20:.0f} MiB"
+        )
+        self.estimate = estimate
+
+
+@dataclass
+class MemoryEstimate:
+    source_bytes: int
+    uncompressed_bytes: int
+    estimated_rows: int
+    estimated_bytes: int       # eager in-memory size of the parsed frame
+    budget_bytes: int
+    sample_rows: int
+    strategy: str = "eager"    # eager | reject
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def memory_budget() -> int:
+    """Bytes a single dataset load may use"""
+    if settings.MEMORY_BUDGET_MB:
+        return int(settings.MEMORY_BUDGET_MB * 2**20)
+
+    limit = None
+    for path in _CGROUP_LIMIT_FILES:
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+            if value.isdigit() and int(value) < 2**60:
+                limit = int(value)
+                break
+        except OSError:
+            continue
+    if limit is None:
+        try:
+            limit = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        except (ValueError, OSError, AttributeError):
+            limit = 4 * 2**30
+    return int(limit * settings.MEMORY_BUDGET_FRACTION)
+
+
+def _text_prefix(path: str, fmt: DatasetFormat, max_bytes: int) -> Tuple[bytes, int, bool]:
+    """Decompressed prefix (cut at a line end), compressed bytes consumed, and whether EOF was reached"""
+    raw = open(path, "rb")
+    try:
+        if fmt.compression == "gzip":
+            reader = gzip.GzipFile(fileobj=raw)
+        elif fmt.compression == "zstd":
+            import zstandard
+            reader = zstandard.ZstdDecompressor().stream_reader(raw)
+        else:
+            reader = raw
+        data = reader.read(max_bytes + 1)
+        consumed = raw.tell()
+    finally:
+        raw.close()
+
+    complete = len(data) <= max_bytes
+    if not complete:
+        data = data[: data.rfind(b"\n", 0, max_bytes) + 1]
+    return data, consumed, complete
+
+
+def _memory(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+def _estimate_text(path: str, fmt: DatasetFormat, size: int, columns: Optional[List[str]]):
+    prefix, consumed, complete = _text_prefix(path, fmt, settings.ADMISSION_SAMPLE_BYTES)
+    try:
+        sample = read_dataset(prefix, DatasetFormat(fmt.format), columns=columns)
+        sample_lines = len(sample)
+    except Exception:
+        if complete or fmt.format != "csv":
+            raise
+        # The cut fell inside a quoted field: let the parser find row ends
+        sample = pd.read_csv(path, compression=fmt.compression, usecols=columns,
+                             nrows=settings.ADMISSION_SAMPLE_ROWS)
+        sample_lines = max(prefix.count(b"\n") - 1, 1)
+    if complete:
+        return sample, len(prefix), len(sample)
+
+    if fmt.compression:
+        uncompressed = int(size * len(prefix) / max(consumed, 1))
+    else:
+        uncompressed = size
+    header = prefix.find(b"\n") + 1 if fmt.format == "csv" else 0
+    bytes_per_row = (len(prefix) - header) / max(sample_lines, 1)
+    return sample, uncompressed, int(uncompressed / max(bytes_per_row, 1))
+
+
+def _estimate_columnar(path: str, fmt: DatasetFormat, size: int, columns: Optional[List[str]]):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    limit = settings.ADMISSION_SAMPLE_ROWS
+    if fmt.format == "parquet":
+        pf = pq.ParquetFile(path)
+        rows = pf.metadata.num_rows
+        batch = next(pf.iter_batches(batch_size=max(1, min(rows, limit)), columns=columns), None)
+        table = pa.Table.from_batches([batch]) if batch is not None else pf.schema_arrow.empty_table()
+    elif fmt.format == "arrow":
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        batches = [reader.get_batch(i) for i in range(reader.num_record_batches)]
+        rows = sum(b.num_rows for b in batches)
+        table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, limit)
+    else:
+        reader = pa.ipc.open_stream(pa.memory_map(path))
+        table = pa.Table.from_batches([reader.read_next_batch()], schema=reader.schema)
+        rows = int(size / max(table.nbytes / max(table.num_rows, 1), 1))
+        table = table.slice(0, limit)
+    if columns and fmt.format != "parquet":
+        table = table.select(columns)
+    return table.to_pandas(), size, rows
+
+
+def estimate_memory(path: str, fmt: DatasetFormat, columns: Optional[List[str]] = None,
+                    budget: Optional[int] = None) -> MemoryEstimate:
+    """Estimate the in-memory size of a local dataset file and pick a load strategy"""
+    size = os.path.getsize(path)
+    if fmt.is_columnar:
+        sample, uncompressed, rows = _estimate_columnar(path, fmt, size, columns)
+    else:
+        sample, uncompressed, rows = _estimate_text(path, fmt, size, columns)
+
+    per_row = _memory(sample) / max(len(sample), 1)
+    estimate = MemoryEstimate(
+        source_bytes=size,
+        uncompressed_bytes=int(uncompressed),
+        estimated_rows=int(rows),
+        estimated_bytes=int(per_row * rows),
+        budget_bytes=int(budget if budget is not None else memory_budget()),
+        sample_rows=len(sample),
+    )
+
+    fits = estimate.estimated_bytes * settings.ADMISSION_OVERHEAD <= estimate.budget_bytes
+    estimate.strategy = "eager" if fits else "reject"
+    return estimate
+
+
+def load_admitted(spooled, columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, MemoryEstimate]:
+    """
+    Load a SpooledFile according to the admission decision.
+
+    Raises:
+        MemoryBudgetExceeded: If the dataset does not fit the budget
+    """
+    estimate = estimate_memory(spooled.path, spooled.format, columns)
+    logger.info(
+        f"Admission for {spooled.filename}: ~{estimate.estimated_rows} rows, "
+        f"~{estimate.estimated_bytes / 2**20:.1f} MiB in memory "
+        f"(budget {estimate.budget_bytes / 2**20:.0f} MiB) -> {estimate.strategy}"
+    )
+    if estimate.strategy == "reject":
+        raise MemoryBudgetExceeded(estimate)
+    return spooled.read(columns=columns), estimate
@@ -2,6 +2,25 @@
 import pandas as pd
 from typing import Dict, List, Optional
 
+from app.core.config import settings
+
+# Free-text heuristic: a string column is text rather than a category when
+# its values are long multi-word strings. Automatic pipelines hash text
+# with vectorize_text only when AUTO_VECTORIZE_TEXT is enabled
+TEXT_MIN_WORDS = 4
+TEXT_MIN_LENGTH = 20
+TEXT_SAMPLE_ROWS = 1000
+
+
+def _looks_like_text(series: pd.Series) -> bool:
+    """Median word count >= TEXT_MIN_WORDS and mean length >= TEXT_MIN_LENGTH on a sample"""
+    values = series.dropna()
+    if values.empty:
+        return False
+    values = values.head(TEXT_SAMPLE_ROWS).astype(str)
+    words = values.str.split().str.len()
+    return words.median() >= TEXT_MIN_WORDS and values.str.len().mean() >= TEXT_MIN_LENGTH
+
 
 def detect_metadata(df: pd.DataFrame) -> Dict[str, List[str]]:
     """
@@ -12,13 +31,15 @@ def detect_metadata(df: pd.DataFrame) -> Dict[str, List[str]]:
     - date_columns: Columns with date/datetime types
     - numeric_columns: Numeric columns
     - categorical_columns: Categorical/string columns
+    - text_columns: Free-text string columns (see _looks_like_text)
     """
 
     metadata = {
         "id_columns": [],
         "date_columns": [],
         "numeric_columns": [],
-        "categorical_columns": []
+        "categorical_columns": [],
+        "text_columns": []
     }
 
     for col in df.columns:
@@ -37,6 +58,9 @@ def detect_metadata(df: pd.DataFrame) -> Dict[str, List[str]]:
         # Check for numeric columns
         elif pd.api.types.is_numeric_dtype(df[col]):
             metadata["numeric_columns"].append(col)
+        # Check for free-text columns (before categorical: they are mostly unique)
+        elif pd.api.types.is_object_dtype(df[col]) and _looks_like_text(df[col]):
+            metadata["text_columns"].append(col)
         # Check for categorical columns
         elif pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_categorical_dtype(df[col]):
             metadata["categorical_columns"].append(col)
@@ -48,7 +72,7 @@ def detect_metadata(df: pd.DataFrame) -> Dict[str, List[str]]:
     try:
         n_rows = len(df)
         for col in df.columns:
-            if col in metadata["id_columns"]:
+            if col in metadata["id_columns"] or col in metadata["text_columns"]:
                 continue
             try:
                 unique_count = df[col].nunique(dropna=True)
@@ -67,7 +91,11 @@ def detect_metadata(df: pd.DataFrame) -> Dict[str, List[str]]:
     return metadata
 
 
-def metadata_to_pipeline_config(meta: Dict[str, List[str]], target_column: Optional[str] = None) -> Dict:
+def metadata_to_pipeline_config(
+    meta: Dict[str, List[str]],
+    target_column: Optional[str] = None,
+    vectorize_text: Optional[bool] = None,
+) -> Dict:
     """
     Convert detected metadata into a pipeline configuration
 
@@ -77,12 +105,23 @@ def metadata_to_pipeline_config(meta: Dict[str, List[str]], target_column: Optio
     3. Handle missing values
     4. Encode categorical columns (EXCEPT target)
     5. Scale numeric columns (EXCEPT target)
+    6. Hash text columns into sparse features (EXCEPT target), when
+       vectorize_text; otherwise text columns are imputed and encoded
+       like categorical ones
     
     Args:
         target_column: Column to exclude from transformations
+        vectorize_text: Hash text columns (defaults to AUTO_VECTORIZE_TEXT)
     """
 
     steps = []
+    if vectorize_text is None:
+        vectorize_text = settings.AUTO_VECTORIZE_TEXT
+    text_columns = meta.get("text_columns", [])
+    categorical_columns = meta.get("categorical_columns", [])
+    if not vectorize_text:
+        categorical_columns = categorical_columns + text_columns
+        text_columns = []
 
     # Step 1: Drop ID columns
     if meta.get("id_columns"):
@@ -114,7 +153,7 @@ def metadata_to_pipeline_config(meta: Dict[str, List[str]], target_column: Optio
         })
 
     categorical_for_imputation = [
-        col for col in meta.get("categorical_columns", [])
+        col for col in categorical_columns
         if col != target_column  # Exclude target
     ]
     if categorical_for_imputation:
@@ -126,7 +165,7 @@ def metadata_to_pipeline_config(meta: Dict[str, List[str]], target_column: Optio
 
     # Step 4: Encode categorical columns (EXCEPT target)
     categorical_to_encode = [
-        col for col in meta.get("categorical_columns", [])
+        col for col in categorical_columns
         if col != target_column  # Exclude target from encoding
     ]
     if categorical_to_encode:
@@ -150,4 +189,15 @@ def metadata_to_pipeline_config(meta: Dict[str, List[str]], target_column: Optio
             "columns": numeric_to_scale
         })
 
+    # Step 6: Hash free-text columns into fixed-width sparse features
+    text_to_vectorize = [
+        col for col in text_columns
+        if col != target_column
+    ]
+    if text_to_vectorize:
+        steps.append({
+            "type": "vectorize_text",
+            "columns": text_to_vectorize
+        })
+
     return {"steps": steps}
\ No newline at end of file
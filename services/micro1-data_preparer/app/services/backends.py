@@ -0,0 +1,217 @@
+# app/services/backends.py
+# --------------------------------------------------------------------
+# Execution backends for the YAML step vocabulary.
+#
+#  - PandasBackend: the reference engine (eager, see pipeline.py).
+#  - PolarsBackend: translates steps into a single Polars LazyFrame so
+#    the query optimizer can push projections down, fuse consecutive
+#    column expressions and run them multithreaded. Steps without a
+#    native translation fall back to the pandas handler for that step.
+#
+# Documented differences of the Polars backend (see tests/test_backends.py):
+#  - The returned frame has a fresh RangeIndex (pandas keeps row labels
+#    after 'drop' of missing rows).
+#  - Integer widths may differ (label codes are int64 instead of the
+#    smallest int pandas picks; scaled integer columns become float64).
+#  - fill_median / robust scaling use exact quantiles; pandas uses the
+#    quantile sketch, so results agree exactly up to QUANTILE_SKETCH_K
+#    values per column and within the sketch's rank error beyond that.
+#  - parse_dates infers one format per column; rows in other formats
+#    become null where pandas may still parse them (and vice versa).
+# --------------------------------------------------------------------
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from app.core.logger import logger
+from app.services.pipeline import STEP_HANDLERS, execute_steps
+
+try:
+    import polars as pl
+except ImportError:  # optional dependency
+    pl = None
+
+
+class PipelineBackend(ABC):
+    """Interface: run a list of steps against a pandas DataFrame"""
+
+    name = "base"
+
+    @abstractmethod
+    def execute(self, df: pd.DataFrame, steps: List[Dict], report: Optional[List[Dict]] = None) -> pd.DataFrame:
+        """Run steps; per-step row counts are appended to report where known"""
+
+
+class PandasBackend(PipelineBackend):
+    name = "pandas"
+
+    def execute(self, df: pd.DataFrame, steps: List[Dict], report: Optional[List[Dict]] = None) -> pd.DataFrame:
+        return execute_steps(df, steps, report=report)
+
+
+class PolarsBackend(PipelineBackend):
+    name = "polars"
+
+    def __init__(self):
+        if pl is None:
+            raise ValueError("The 'polars' backend requires the polars package to be installed")
+        self._translators: Dict[str, Callable] = {
+            'drop_columns': _pl_drop_columns,
+            'handle_missing': _pl_handle_missing,
+            'encode_categorical': _pl_encode_categorical,
+            'scale_numeric': _pl_scale_numeric,
+            'parse_dates': _pl_parse_dates,
+        }
+
+    def execute(self, df: pd.DataFrame, steps: List[Dict], report: Optional[List[Dict]] = None) -> pd.DataFrame:
+        # Row counts are only reported for steps run through the pandas
+        # fallback; lazy steps are not materialized individually.
+        try:
+            lf = pl.from_pandas(df).lazy()
+        except Exception as exc:
+            logger.warning(f"Frame cannot be represented in Polars ({exc}), running on pandas")
+            return execute_steps(df, steps, report=report)
+
+        for i, step in enumerate(steps):
+            step_type = step.get('type')
+            translate = self._translators.get(step_type)
+
+            if translate is not None:
+                logger.info(f"Planning step {i + 1}: {step_type}")
+                try:
+                    lf = translate(lf, step)
+                except Exception as e:
+                    logger.error(f"Error in step {i + 1} ({step_type}): {e}")
+                    raise ValueError(f"Pipeline step {i + 1} failed: {str(e)}") from e
+            elif step_type in STEP_HANDLERS:
+                # No lazy translation: materialize, run the pandas step, continue lazily
+                logger.info(f"Step {i + 1} ({step_type}) has no Polars translation, using pandas")
+                frame = execute_steps(_collect(lf, i), [step], offset=i, report=report)
+                lf = pl.from_pandas(frame).lazy()
+            else:
+                logger.warning(f"Unknown step type: {step_type}, skipping")
+
+        return _collect(lf, len(steps) - 1)
+
+
+def get_backend(name: str) -> PipelineBackend:
+    """Return the backend registered under name"""
+    backends = {"pandas": PandasBackend, "polars": PolarsBackend}
+    if name not in backends:
+        raise ValueError(f"Unknown pipeline backend '{name}', expected one of {sorted(backends)}")
+    return backends[name]()
+
+
+# --------------------------------------------------------------------
+# Polars translations. Each takes and returns a LazyFrame; the pandas
+# handler with the same step type in pipeline.py is the reference.
+# --------------------------------------------------------------------
+
+def _collect(lf, step_index: int) -> pd.DataFrame:
+    try:
+        return lf.collect().to_pandas()
+    except Exception as e:
+        raise ValueError(f"Pipeline step {step_index + 1} failed: {str(e)}") from e
+
+
+def _existing(lf, columns) -> List[str]:
+    names = lf.collect_schema().names()
+    existing = [col for col in (columns or []) if col in names]
+    missing = [col for col in (columns or []) if col not in names]
+    if missing:
+        logger.warning(f"Columns not found (skipping): {missing}")
+    return existing
+
+
+def _numeric(lf, columns: List[str]) -> List[str]:
+    schema = lf.collect_schema()
+    return [col for col in columns if schema[col].is_numeric()]
+
+
+def _pl_drop_columns(lf, step: Dict):
+    existing = _existing(lf, step.get('columns', []))
+    return lf.drop(existing) if existing else lf
+
+
+def _pl_handle_missing(lf, step: Dict):
+    method = step.get('method', 'drop')
+    columns = step.get('columns')
+    target_cols = lf.collect_schema().names() if columns is None else _existing(lf, columns)
+    if not target_cols:
+        return lf
+
+    if method == 'drop':
+        return lf.drop_nulls(subset=target_cols)
+    if method == 'fill_mean':
+        return lf.with_columns([pl.col(c).fill_null(pl.col(c).mean()) for c in _numeric(lf, target_cols)])
+    if method == 'fill_median':
+        return lf.with_columns([pl.col(c).fill_null(pl.col(c).median()) for c in _numeric(lf, target_cols)])
+    if method == 'fill_mode':
+        # pandas picks the smallest of the most frequent values
+        return lf.with_columns([
+            pl.col(c).fill_null(pl.col(c).drop_nulls().mode().sort().first()) for c in target_cols
+        ])
+
+    logger.warning(f"Unknown missing value method: {method}")
+    return lf
+
+
+def _pl_encode_categorical(lf, step: Dict):
+    method = step.get('method', 'label')
+    existing = _existing(lf, step.get('columns', []))
+    if not existing:
+        return lf
+
+    if method == 'label':
+        # Codes follow sorted category order; nulls get -1 like pd.Categorical
+        return lf.with_columns([
+            (pl.col(c).rank('dense').cast(pl.Int64) - 1).fill_null(-1) for c in existing
+        ])
+    if method == 'onehot':
+        # Dummy column names depend on the data, so the plan is materialized here
+        frame = lf.collect()
+        others = [c for c in frame.columns if c not in existing]
+        dummies = []
+        for c in existing:
+            for value in frame.get_column(c).drop_nulls().unique().sort().to_list():
+                dummies.append((pl.col(c) == value).fill_null(False).alias(f"{c}_{value}"))
+        return frame.lazy().select([pl.col(c) for c in others] + dummies)
+
+    logger.warning(f"Unknown encoding method: {method}")
+    return lf
+
+
+def _pl_scale_numeric(lf, step: Dict):
+    method = step.get('method', 'standard')
+    cols = _numeric(lf, _existing(lf, step.get('columns', [])))
+    if not cols:
+        return lf
+
+    exprs = []
+    for c in cols:
+        x = pl.col(c)
+        if method == 'standard':
+            exprs.append(pl.when(x.std() > 0).then((x - x.mean()) / x.std()).otherwise(x).alias(c))
+        elif method == 'minmax':
+            span = x.max() - x.min()
+            exprs.append(pl.when(span > 0).then((x - x.min()) / span).otherwise(x).alias(c))
+        elif method == 'robust':
+            iqr = x.quantile(0.75, "linear") - x.quantile(0.25, "linear")
+            exprs.append(pl.when(iqr > 0).then((x - x.median()) / iqr).otherwise(x).alias(c))
+        else:
+            logger.warning(f"Unknown scaling method: {method}")
+            return lf
+    return lf.with_columns(exprs)
+
+
+def _pl_parse_dates(lf, step: Dict):
+    existing = _existing(lf, step.get('columns', []))
+    schema = lf.collect_schema()
+    exprs = []
+    for c in existing:
+        if schema[c] == pl.String:
+            exprs.append(pl.col(c).str.to_datetime(time_unit="ns", strict=False))
+        elif schema[c].is_numeric():
+            exprs.append(pl.col(c).cast(pl.Datetime("ns")))
+    return lf.with_columns(exprs) if exprs else lf
@@ -0,0 +1,104 @@
+# app/services/column_parallel.py
+# --------------------------------------------------------------------
+# Column-parallel execution helpers for pipeline steps.
+#
+# Most per-column pandas/NumPy work (reductions, fillna, arithmetic,
+# datetime parsing of numeric data) releases the GIL, so a thread pool
+# scales it across cores. Object (string) columns are GIL-bound; with
+# executor="process" (or "auto": object columns only) they go to a process
+# pool instead. Processes are opt-in: they are forked from the
+# multithreaded server and every task pickles its whole column.
+#
+# There is one pool per executor kind, sized PREPARE_WORKERS. A step's
+# 'workers' key is capped at PREPARE_WORKERS and limits how many of its
+# columns are in flight, so per-request values never create new pools.
+#
+# Results are always returned in the order of the requested columns so
+# the assembled frame is deterministic regardless of completion order.
+# --------------------------------------------------------------------
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from app.core.config import settings
+
+_EXECUTOR_KINDS = ("thread", "process", "auto")
+
+_pools: Dict[str, Executor] = {}
+_pools_lock = threading.Lock()
+
+
+def resolve_workers(step: Optional[Dict] = None) -> int:
+    """Worker count for a step: step 'workers' key (at most PREPARE_WORKERS), else PREPARE_WORKERS"""
+    limit = max(1, settings.PREPARE_WORKERS)
+    workers = (step or {}).get("workers") or limit
+    return max(1, min(int(workers), limit))
+
+
+def _get_pool(kind: str) -> Executor:
+    with _pools_lock:
+        pool = _pools.get(kind)
+        if pool is None:
+            workers = max(1, settings.PREPARE_WORKERS)
+            if kind == "process":
+                pool = ProcessPoolExecutor(max_workers=workers)
+            else:
+                pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prepare-col")
+            _pools[kind] = pool
+        return pool
+
+
+def shutdown_pools():
+    """Shut down cached pools (called on application shutdown)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+def map_columns(
+    func: Callable[..., pd.Series],
+    df: pd.DataFrame,
+    columns: List[str],
+    step: Optional[Dict] = None,
+    *args,
+) -> Dict[str, pd.Series]:
+    """
+    Apply func(series, *args) to each column, in parallel when worthwhile.
+
+    Args:
+        func: Top-level (picklable) function taking a Series and returning a Series
+        df: Input DataFrame (not modified)
+        columns: Columns to process
+        step: Pipeline step; may carry 'workers' and 'executor' overrides
+
+    Returns:
+        Dict of column -> result Series, ordered like `columns`
+    """
+    step = step or {}
+    workers = min(resolve_workers(step), len(columns))
+    kind = step.get("executor", settings.PREPARE_EXECUTOR)
+    if kind not in _EXECUTOR_KINDS:
+        raise ValueError(f"Unknown executor '{kind}', expected one of {_EXECUTOR_KINDS}")
+
+    if workers <= 1 or len(df) < settings.PARALLEL_MIN_ROWS:
+        return {col: func(df[col], *args) for col in columns}
+
+    futures = {}
+    for col in columns:
+        running = [f for f in futures.values() if not f.done()]
+        if len(running) >= workers:
+            wait(running, return_when=FIRST_COMPLETED)
+        use_process = kind == "process" or (kind == "auto" and pd.api.types.is_object_dtype(df[col]))
+        futures[col] = _get_pool("process" if use_process else "thread").submit(func, df[col], *args)
+
+    return {col: futures[col].result() for col in columns}
+
+
+def assign_columns(df: pd.DataFrame, results: Dict[str, pd.Series]) -> pd.DataFrame:
+    """Write mapped results back into df in a fixed column order"""
+    for col, values in results.items():
+        df[col] = values
+    return df
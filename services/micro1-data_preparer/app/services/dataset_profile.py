@@ -0,0 +1,125 @@
+# app/services/dataset_profile.py
+# --------------------------------------------------------------------
+# Dataset profile sidecar for the model selector.
+#
+# The selector's DatasetAnalyzer only needs per-column summaries:
+# dtype, null count, distinct count, numeric mean / std / min / max and,
+# for low-cardinality columns (possible targets), the value counts.
+# /prepare computes them once from the processed frame and stores
+#   processed/<name>_processed_<timestamp>_profile.json
+# next to the CSV, so selection reads a few KB instead of the dataset.
+#
+# dtypes are reported as pandas would infer them when reading the
+# stored CSV back (float32 -> float64, category / datetime -> object,
+# ...), so an analysis of the profile matches an analysis of the CSV.
+#
+# Layout (PROFILE_VERSION 1):
+#   {"version": 1, "n_rows": N,
+#    "columns": {name: {"dtype", "nulls", "unique",
+#                       "mean", "std", "min", "max",      # numeric only
+#                       "value_counts": [[value, count], ...]}}}  # unique <= PROFILE_MAX_VALUES
+# --------------------------------------------------------------------
+import json
+import os
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.storage.minio_client import upload_bytes
+
+PROFILE_VERSION = 1
+PROFILE_SUFFIX = "_profile.json"
+
+
+def profile_object_name(object_name: str) -> str:
+    """Sidecar of a stored dataset: same name, extension replaced by _profile.json"""
+    return os.path.splitext(object_name)[0] + PROFILE_SUFFIX
+
+
+def stored_dtype(series: pd.Series) -> str:
+    """dtype of the column once written to CSV and parsed again by pandas"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.SparseDtype):
+        dtype = dtype.subtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype
+    has_nulls = bool(series.isna().any())
+    if pd.api.types.is_bool_dtype(dtype):
+        return "object" if has_nulls else "bool"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "float64" if has_nulls else "int64"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float64"
+    return "object"
+
+
+def _stored_series(series: pd.Series, dtype: str) -> pd.Series:
+    if isinstance(series.dtype, pd.SparseDtype):
+        series = series.sparse.to_dense()
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories.dtype
+        series = series.astype(object if pd.api.types.is_object_dtype(categories) or dtype != "object" else categories)
+    if dtype != "object":
+        return series.astype(dtype, copy=False)
+    if pd.api.types.is_object_dtype(series.dtype):
+        return series
+    if pd.api.types.is_datetime64_any_dtype(series.dtype) or pd.api.types.is_timedelta64_dtype(series.dtype) \
+            or isinstance(series.dtype, pd.PeriodDtype):
+        # Formatted like to_csv writes them; read back they are strings
+        return series.astype(str).where(series.notna(), np.nan).astype(object)
+    return series.astype(object).where(series.notna(), np.nan)
+
+
+def stored_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    df with the dtypes it has once written to CSV and parsed again (see
+    stored_dtype), for consumers served the frame instead of the CSV.
+    Columns already in that dtype are not copied.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        dtype = stored_dtype(series)
+        columns[col] = series if series.dtype == dtype else _stored_series(series, dtype)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _json_value(value):
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return str(value)
+    return value.item() if hasattr(value, "item") else value
+
+
+def _float(value):
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def build_profile(df: pd.DataFrame) -> Dict:
+    """Per-column summary of df (see the module header for the layout)"""
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.SparseDtype):
+            series = series.sparse.to_dense()
+        dtype = stored_dtype(series)
+        counts = series.value_counts()
+        entry = {"dtype": dtype, "nulls": int(series.isna().sum()), "unique": int(len(counts))}
+        if dtype in ("int64", "float64"):
+            values = series.astype(np.float64)
+            entry.update(mean=_float(values.mean()), std=_float(values.std()),
+                         min=_float(values.min()), max=_float(values.max()))
+        if len(counts) <= settings.PROFILE_MAX_VALUES:
+            entry["value_counts"] = [[_json_value(v), int(c)] for v, c in counts.items()]
+        columns[str(col)] = entry
+    return {"version": PROFILE_VERSION, "n_rows": len(df), "columns": columns}
+
+
+def store_profile(df: pd.DataFrame, object_name: str) -> str:
+    """Profile df and store it as the sidecar of object_name; returns the sidecar name"""
+    name = profile_object_name(object_name)
+    upload_bytes(name, json.dumps(build_profile(df)).encode("utf-8"), content_type="application/json")
+    logger.info(f"Stored dataset profile: {name}")
+    return name
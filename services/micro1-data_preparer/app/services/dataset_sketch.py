@@ -0,0 +1,158 @@
+# app/services/dataset_sketch.py
+# --------------------------------------------------------------------
+# Compact per-column sketches of a dataset version.
+#
+#  - numeric / datetime columns: KLL quantile sketch (QuantileSketch)
+#    plus min / max / mean
+#  - other columns: frequency sketch = counts of the SKETCH_TOP_K most
+#    frequent values and the count of all remaining values ("other")
+#  - every column: row count and null count
+#
+# Sketches are a few KB per column regardless of row count. /detect and
+# /prepare store one per dataset version under
+#   sketches/<dataset>/<timestamp>_<sha256 prefix>.json
+# so the drift endpoint (drift.py) can compare versions without reading
+# the data again. Sketches of the same column merge (merge_sketches).
+# --------------------------------------------------------------------
+import json
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.quantile_sketch import QuantileSketch
+from app.storage.minio_client import upload_bytes
+
+SKETCH_VERSION = 1
+
+
+def _is_numeric(series: pd.Series) -> bool:
+    return (pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)) \
+        or pd.api.types.is_datetime64_any_dtype(series)
+
+
+def _numeric_values(series: pd.Series) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        # Epoch seconds keep datetime quantiles comparable across versions
+        values = series.dropna().astype("int64").to_numpy() / 1e9
+    else:
+        values = series.dropna().to_numpy(dtype=np.float64)
+    return values[np.isfinite(values)]
+
+
+def sketch_column(series: pd.Series, top_k: Optional[int] = None) -> Dict:
+    """Sketch one column"""
+    nulls = int(series.isna().sum())
+    entry = {"count": int(len(series)), "nulls": nulls}
+
+    if _is_numeric(series):
+        values = _numeric_values(series)
+        sketch = QuantileSketch(settings.QUANTILE_SKETCH_K).update(values)
+        entry.update({
+            "kind": "numeric",
+            "datetime": bool(pd.api.types.is_datetime64_any_dtype(series)),
+            "min": float(values.min()) if len(values) else None,
+            "max": float(values.max()) if len(values) else None,
+            "mean": float(values.mean()) if len(values) else None,
+            "quantiles": sketch.to_dict(),
+        })
+        return entry
+
+    counts = series.dropna().astype(str).value_counts()
+    top = counts.iloc[:top_k or settings.SKETCH_TOP_K]
+    entry.update({
+        "kind": "categorical",
+        "distinct": int(len(counts)),
+        "frequencies": {str(k): int(v) for k, v in top.items()},
+        "other": int(counts.iloc[len(top):].sum()),
+    })
+    return entry
+
+
+def build_sketch(df: pd.DataFrame, source: Optional[str] = None, sha256: Optional[str] = None) -> Dict:
+    """Sketch every column of a DataFrame"""
+    return {
+        "version": SKETCH_VERSION,
+        "source": source,
+        "sha256": sha256,
+        "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "rows": int(len(df)),
+        "columns": {str(col): sketch_column(df[col]) for col in df.columns},
+    }
+
+
+def merge_column_sketches(a: Dict, b: Dict, top_k: Optional[int] = None) -> Dict:
+    """Merge two sketches of the same column (e.g. two partitions)"""
+    if a["kind"] != b["kind"]:
+        raise ValueError(f"Cannot merge {a['kind']} and {b['kind']} column sketches")
+
+    merged = {"count": a["count"] + b["count"], "nulls": a["nulls"] + b["nulls"], "kind": a["kind"]}
+    if a["kind"] == "numeric":
+        qa, qb = QuantileSketch.from_dict(a["quantiles"]), QuantileSketch.from_dict(b["quantiles"])
+        present = [s for s in (a, b) if s["min"] is not None]
+        na, nb = qa.n, qb.n
+        merged.update({
+            "datetime": a.get("datetime", False),
+            "min": min((s["min"] for s in present), default=None),
+            "max": max((s["max"] for s in present), default=None),
+            "mean": (a["mean"] * na + b["mean"] * nb) / (na + nb) if na + nb else None,
+            "quantiles": qa.merge(qb).to_dict(),
+        })
+        return merged
+
+    counts = dict(a["frequencies"])
+    for value, count in b["frequencies"].items():
+        counts[value] = counts.get(value, 0) + count
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    keep = top_k or settings.SKETCH_TOP_K
+    merged.update({
+        # distinct is a lower bound once values overlap between the inputs
+        "distinct": max(a["distinct"], b["distinct"], len(counts)),
+        "frequencies": dict(ranked[:keep]),
+        "other": a["other"] + b["other"] + sum(c for _, c in ranked[keep:]),
+    })
+    return merged
+
+
+def merge_sketches(a: Dict, b: Dict) -> Dict:
+    """Merge two dataset sketches column by column (columns in only one are kept as-is)"""
+    columns = dict(a["columns"])
+    for col, sketch in b["columns"].items():
+        columns[col] = merge_column_sketches(columns[col], sketch) if col in columns else sketch
+    return {
+        "version": SKETCH_VERSION,
+        "source": a.get("source"),
+        "sha256": None,
+        "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "rows": a["rows"] + b["rows"],
+        "columns": columns,
+    }
+
+
+def sketch_object_name(dataset: str, sha256: Optional[str] = None) -> str:
+    """sketches/<dataset>/<timestamp>[_<sha prefix>].json (names sort by time)"""
+    timestamp = pd.Timestamp.now(tz="UTC").strftime("%Y%m%dT%H%M%S%f")
+    suffix = f"_{sha256[:16]}" if sha256 else ""
+    return f"sketches/{dataset}/{timestamp}{suffix}.json"
+
+
+def sketch_to_bytes(sketch: Dict) -> bytes:
+    return json.dumps(sketch, separators=(",", ":")).encode("utf-8")
+
+
+def sketch_from_bytes(data: bytes) -> Dict:
+    sketch = json.loads(data)
+    if not isinstance(sketch, dict) or "columns" not in sketch:
+        raise ValueError("Not a dataset sketch")
+    return sketch
+
+
+def store_sketch(df: pd.DataFrame, dataset: str, sha256: Optional[str] = None) -> str:
+    """Sketch df and store it as a new version of dataset; returns the object name"""
+    sketch = build_sketch(df, source=dataset, sha256=sha256)
+    object_name = sketch_object_name(dataset, sha256)
+    upload_bytes(object_name, sketch_to_bytes(sketch), content_type="application/json")
+    logger.info(f"Stored column sketches: {object_name}")
+    return object_name
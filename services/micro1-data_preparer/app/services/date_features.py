@@ -0,0 +1,164 @@
+# app/services/date_features.py
+# --------------------------------------------------------------------
+# 'date_features' step: numeric features derived from date columns.
+#
+# Each column is parsed once (skipped if it is already datetime64) and
+# every feature is computed with integer arithmetic on its int64
+# nanosecond array: calendar fields use the days-to-civil conversion
+# from H. Hinnant's date algorithms, so no per-row Timestamp objects or
+# repeated .dt accessors are needed. All features of all columns are
+# written into one preallocated float64 block (NaT -> NaN) and joined
+# to the frame with a single concat.
+#
+# Timezone-aware columns use their local wall-clock time. A column that
+# cannot be parsed (e.g. mixed UTC offsets) is skipped with a warning and
+# kept unchanged.
+#
+# Step config:
+#   - type: date_features
+#     columns: [created_at]
+#     features: [year, month, weekday, hour, is_weekend, epoch,
+#                month_sin, month_cos]   # default DEFAULT_FEATURES
+#     format: "%Y-%m-%d"               # optional, passed to pd.to_datetime
+#     drop: true                       # drop the original columns
+#
+# Output columns are named "<column>_<feature>".
+# --------------------------------------------------------------------
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from app.core.logger import logger
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+# feature -> cycle length for the "<feature>_sin" / "<feature>_cos" encodings
+# (dayofyear uses 366 in leap years)
+CYCLES = {"month": 12, "weekday": 7, "hour": 24, "dayofyear": 365}
+
+FEATURES = (
+    "year", "month", "day", "weekday", "hour", "dayofyear", "is_weekend", "epoch",
+    *(f"{name}_{fn}" for name in CYCLES for fn in ("sin", "cos")),
+)
+
+DEFAULT_FEATURES = (
+    "year", "month", "day", "weekday", "hour", "is_weekend", "epoch",
+    "month_sin", "month_cos", "weekday_sin", "weekday_cos", "hour_sin", "hour_cos",
+)
+
+
+def _to_nanoseconds(series: pd.Series, fmt=None) -> np.ndarray:
+    """Parse once and return the int64 nanoseconds (NaT as the int64 minimum)"""
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        series = pd.to_datetime(series, errors="coerce", format=fmt)
+    if getattr(series.dt, "tz", None) is not None:
+        series = series.dt.tz_localize(None)
+    return series.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def _civil_from_days(days: np.ndarray):
+    """(year, month, day) of days since 1970-01-01, proleptic Gregorian"""
+    z = days + 719_468
+    era = np.floor_divide(z, 146_097)
+    doe = z - era * 146_097
+    yoe = (doe - doe // 1_460 + doe // 36_524 - doe // 146_096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def _days_from_civil_jan1(year: np.ndarray) -> np.ndarray:
+    """Days since 1970-01-01 of January 1st of year"""
+    y = year - 1
+    era = np.floor_divide(y, 400)
+    yoe = y - era * 400
+    doe = 365 * yoe + yoe // 4 - yoe // 100 + 306
+    return era * 146_097 + doe - 719_468
+
+
+def compute_features(ns: np.ndarray, features: List[str], out: np.ndarray) -> None:
+    """Write features of an int64 nanosecond array into the columns of out"""
+    valid = ns != np.iinfo(np.int64).min
+    ns = np.where(valid, ns, 0)
+    days = np.floor_divide(ns, NS_PER_DAY)
+    day_ns = ns - days * NS_PER_DAY
+
+    cache: Dict[str, np.ndarray] = {}
+
+    def base(name: str) -> np.ndarray:
+        if name not in cache:
+            if name in ("year", "month", "day", "dayofyear"):
+                year, month, day = _civil_from_days(days)
+                cache.update(year=year, month=month, day=day)
+                cache["dayofyear"] = days - _days_from_civil_jan1(year) + 1
+            elif name == "weekday":
+                cache[name] = (days + 3) % 7  # 1970-01-01 was a Thursday; Monday=0
+            elif name == "hour":
+                cache[name] = day_ns // (3_600 * NS_PER_SECOND)
+            elif name == "is_weekend":
+                cache[name] = base("weekday") >= 5
+            elif name == "epoch":
+                cache[name] = ns / NS_PER_SECOND
+        return cache[name]
+
+    for j, feature in enumerate(features):
+        name, _, fn = feature.rpartition("_")
+        if fn in ("sin", "cos") and name in CYCLES:
+            if name == "hour":
+                position = day_ns / (3_600 * NS_PER_SECOND)  # fractional hour of day
+                period = 24.0
+            elif name == "dayofyear":
+                year = base("year")
+                leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+                position, period = base("dayofyear") - 1, np.where(leap, 366.0, 365.0)
+            else:
+                position = base(name) - (1 if name == "month" else 0)
+                period = float(CYCLES[name])
+            angle = 2 * np.pi * position / period
+            out[:, j] = np.sin(angle) if fn == "sin" else np.cos(angle)
+        else:
+            out[:, j] = base(feature)
+    out[~valid] = np.nan
+
+
+def date_features(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
+    """Replace date columns with numeric calendar / cyclical / epoch features"""
+    columns = [col for col in step.get("columns", []) if col in df.columns]
+    missing = [col for col in step.get("columns", []) if col not in df.columns]
+    if missing:
+        logger.warning(f"Date columns not found (skipping): {missing}")
+    if not columns:
+        logger.info("No date columns to extract features from")
+        return df
+
+    features = list(step.get("features") or DEFAULT_FEATURES)
+    unknown = [f for f in features if f not in FEATURES]
+    if unknown:
+        raise ValueError(f"Unknown date features: {unknown} (known: {list(FEATURES)})")
+
+    # A column that cannot be parsed is left as it is; the others still get features
+    parsed = {}
+    for col in columns:
+        try:
+            parsed[col] = _to_nanoseconds(df[col], step.get("format"))
+        except Exception as exc:
+            logger.warning(f"Cannot parse date column {col} (skipping): {exc}")
+    columns = list(parsed)
+    if not columns:
+        return df
+
+    k = len(features)
+    block = np.empty((len(df), k * len(columns)), dtype=np.float64)
+    for i, col in enumerate(columns):
+        compute_features(parsed.pop(col), features, block[:, i * k:(i + 1) * k])
+
+    names = [f"{col}_{feature}" for col in columns for feature in features]
+    logger.info(f"Extracted {k} date features from {len(columns)} columns")
+    extracted = pd.DataFrame(block, index=df.index, columns=names)
+    base = df.drop(columns=columns) if step.get("drop", True) else df
+    return pd.concat([base, extracted], axis=1)
@@ -0,0 +1,56 @@
+# app/services/dedup.py
+# --------------------------------------------------------------------
+# Hash-based row deduplication.
+#
+# Rows are reduced to one 64-bit hash each (pd.util.hash_pandas_object,
+# vectorized per column and combined), so duplicates are found with one
+# duplicated() pass over a uint64 array instead of DataFrame.drop_duplicates
+# hashing and materializing tuples of every column. The frame itself is
+# in memory; the extra memory is 8 bytes per row.
+#
+# Two different rows collide with probability ~n^2 / 2^65 (about 3e-8
+# for 10^6 unique rows); a collision drops one of the rows.
+# --------------------------------------------------------------------
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.logger import logger
+
+
+def hash_rows(df: pd.DataFrame, columns: Optional[List[str]] = None) -> np.ndarray:
+    """Return one uint64 hash per row over the given columns (all by default)"""
+    frame = df if columns is None else df[columns]
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+
+def deduplicate(df: pd.DataFrame, step: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Drop duplicate rows according to a 'deduplicate' step.
+
+    Step keys:
+        columns: Columns that define a duplicate (default: all)
+        keep: 'first', 'last' or 'none' (drop every copy)
+    """
+    step = step or {}
+    columns = step.get('columns')
+    if columns is not None:
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            logger.warning(f"Deduplication columns not found (skipping): {missing}")
+        columns = [col for col in columns if col in df.columns]
+        if not columns:
+            logger.info("No columns to deduplicate on")
+            return df
+
+    keep = step.get('keep', 'first')
+    if keep not in ('first', 'last', 'none'):
+        raise ValueError(f"Unknown keep option for deduplicate: {keep}")
+
+    hashes = pd.Series(hash_rows(df, columns))
+    mask = ~hashes.duplicated(keep=False if keep == 'none' else keep).to_numpy()
+
+    removed = len(df) - int(mask.sum())
+    logger.info(f"Deduplication removed {removed} of {len(df)} rows")
+    return df[mask]
@@ -0,0 +1,130 @@
+# app/services/drift.py
+# --------------------------------------------------------------------
+# Drift statistics between two dataset versions, computed from their
+# sketches only (see dataset_sketch.py).
+#
+#  - PSI (population stability index) for every column. Numeric columns
+#    are binned at the baseline deciles; categorical columns use the
+#    tracked values plus an "other" bin. Nulls form an extra bin, so a
+#    change in null rate also moves PSI.
+#  - KS statistic for numeric columns: the largest CDF gap, evaluated at
+#    the percentiles of both sketches.
+#
+# Rule of thumb: PSI < 0.1 stable, 0.1-0.2 moderate, > 0.2 major shift.
+# A column is flagged when PSI exceeds DRIFT_PSI_THRESHOLD or KS
+# exceeds DRIFT_KS_THRESHOLD. Values outside the tracked top-k of a
+# categorical baseline count as 0 there, which slightly overstates PSI
+# for very high-cardinality columns.
+# --------------------------------------------------------------------
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.quantile_sketch import QuantileSketch
+
+# Proportion used in place of empty bins (avoids log(0))
+_EPSILON = 1e-4
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population stability index of two bin-proportion vectors"""
+    p = np.clip(np.asarray(expected, dtype=float), _EPSILON, None)
+    q = np.clip(np.asarray(actual, dtype=float), _EPSILON, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def _null_rate(sketch: Dict) -> float:
+    return sketch["nulls"] / sketch["count"] if sketch["count"] else 0.0
+
+
+def _numeric_bins(sketch: QuantileSketch, edges: np.ndarray, null_rate: float) -> np.ndarray:
+    cdf = np.concatenate(([0.0], sketch.cdf(edges), [1.0]))
+    return np.append(np.diff(cdf) * (1.0 - null_rate), null_rate)
+
+
+def compare_numeric(base: Dict, cur: Dict, bins: int = 10) -> Dict:
+    qb = QuantileSketch.from_dict(base["quantiles"])
+    qc = QuantileSketch.from_dict(cur["quantiles"])
+    result = {"kind": "numeric", "null_rate": [_null_rate(base), _null_rate(cur)]}
+
+    if qb.n == 0 or qc.n == 0:
+        empty = [b for b, q in (("baseline", qb), ("current", qc)) if q.n == 0]
+        result.update({"psi": None, "ks": None, "note": f"no values in {' and '.join(empty)}"})
+        return result
+
+    edges = np.unique(qb.quantiles(np.linspace(0, 1, bins + 1)[1:-1]))
+    result["psi"] = psi(
+        _numeric_bins(qb, edges, _null_rate(base)),
+        _numeric_bins(qc, edges, _null_rate(cur)),
+    )
+
+    grid = np.unique(np.concatenate([qb.quantiles(np.linspace(0.01, 0.99, 99)), qc.quantiles(np.linspace(0.01, 0.99, 99))]))
+    result["ks"] = float(np.max(np.abs(qb.cdf(grid) - qc.cdf(grid))))
+    result["mean"] = [base.get("mean"), cur.get("mean")]
+    result["median"] = [float(qb.quantile(0.5)), float(qc.quantile(0.5))]
+    return result
+
+
+def _categorical_bins(sketch: Dict, values: List[str]) -> np.ndarray:
+    total = sketch["count"] or 1
+    counts = [sketch["frequencies"].get(v, 0) for v in values]
+    return np.array(counts + [sketch["other"], sketch["nulls"]], dtype=float) / total
+
+
+def compare_categorical(base: Dict, cur: Dict) -> Dict:
+    values = sorted(set(base["frequencies"]) | set(cur["frequencies"]))
+    new_values = [v for v in cur["frequencies"] if v not in base["frequencies"]]
+    return {
+        "kind": "categorical",
+        "null_rate": [_null_rate(base), _null_rate(cur)],
+        "psi": psi(_categorical_bins(base, values), _categorical_bins(cur, values)),
+        "ks": None,
+        "distinct": [base["distinct"], cur["distinct"]],
+        "new_values": new_values[:20],
+    }
+
+
+def compare_sketches(baseline: Dict, current: Dict, bins: int = 10,
+                     psi_threshold: Optional[float] = None, ks_threshold: Optional[float] = None) -> Dict:
+    """
+    Compare two dataset sketches column by column.
+
+    Returns:
+        dict with per-column statistics, drifted columns, schema changes and
+        a retrain recommendation
+    """
+    psi_threshold = settings.DRIFT_PSI_THRESHOLD if psi_threshold is None else psi_threshold
+    ks_threshold = settings.DRIFT_KS_THRESHOLD if ks_threshold is None else ks_threshold
+
+    base_cols, cur_cols = baseline["columns"], current["columns"]
+    columns, drifted = {}, []
+    for col in base_cols:
+        if col not in cur_cols:
+            continue
+        base, cur = base_cols[col], cur_cols[col]
+        if base["kind"] != cur["kind"]:
+            columns[col] = {"kind": f"{base['kind']} -> {cur['kind']}", "psi": None, "ks": None, "drifted": True}
+            drifted.append(col)
+            continue
+
+        stats = compare_numeric(base, cur, bins) if base["kind"] == "numeric" else compare_categorical(base, cur)
+        stats["drifted"] = bool(
+            (stats["psi"] is not None and stats["psi"] > psi_threshold)
+            or (stats["ks"] is not None and stats["ks"] > ks_threshold)
+        )
+        if stats["drifted"]:
+            drifted.append(col)
+        columns[col] = stats
+
+    added = [c for c in cur_cols if c not in base_cols]
+    removed = [c for c in base_cols if c not in cur_cols]
+    return {
+        "rows": [baseline["rows"], current["rows"]],
+        "thresholds": {"psi": psi_threshold, "ks": ks_threshold},
+        "columns": columns,
+        "drifted_columns": drifted,
+        "added_columns": added,
+        "removed_columns": removed,
+        "retrain_recommended": bool(drifted or added or removed),
+    }
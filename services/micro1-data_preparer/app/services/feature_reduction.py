@@ -0,0 +1,230 @@
+# app/services/feature_reduction.py
+# --------------------------------------------------------------------
+# 'reduce_features' step: drop columns that carry no extra information.
+#
+#   - constant columns (one distinct value, NaN included) and numeric
+#     columns whose variance is <= variance_threshold
+#   - near-zero variance columns (caret's rule): most common / second
+#     most common value > freq_ratio and distinct / rows < unique_ratio,
+#     evaluated on a row sample
+#   - exact duplicate columns: every column is reduced to a 64-bit digest
+#     of its row hashes, equal digests are confirmed with Series.equals
+#   - highly correlated numeric columns: Pearson correlation on a seeded
+#     row sample, computed block by block (block_size columns at a time)
+#     so the full correlation matrix is never materialised
+#
+# Columns are visited in frame order and the first of a duplicate or
+# correlated group is kept. Decisions are returned with their reason so
+# they can be reported and stored in the fitted pipeline.
+#
+# Step config:
+#   - type: reduce_features
+#     exclude: [target]        # never dropped
+#     columns: [...]           # candidates (default: all columns)
+#     variance_threshold: 0.0
+#     near_zero: true
+#     freq_ratio: 19           # 95/5
+#     unique_ratio: 0.1
+#     duplicates: true
+#     correlation: 0.95        # |r| above which a column is dropped; null disables
+#     sample_rows: 20000       # default REDUCE_SAMPLE_ROWS
+#     block_size: 512
+# --------------------------------------------------------------------
+import hashlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+
+REASONS = ("constant", "near_zero_variance", "duplicate", "correlated")
+
+
+def _candidates(df: pd.DataFrame, step: Dict) -> List[str]:
+    columns = step.get("columns")
+    exclude = set(step.get("exclude") or [])
+    if columns is None:
+        columns = df.columns.tolist()
+    return [col for col in columns if col in df.columns and col not in exclude]
+
+
+def _sample(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
+    sample_rows = int(step.get("sample_rows") or settings.REDUCE_SAMPLE_ROWS)
+    if len(df) <= sample_rows:
+        return df
+    rng = np.random.default_rng(step.get("seed", settings.SAMPLE_SEED))
+    return df.iloc[np.sort(rng.choice(len(df), sample_rows, replace=False))]
+
+
+def _first_value(series: pd.Series):
+    """JSON-friendly first value of a column (NaN -> None)"""
+    if series.empty or pd.isna(series.iloc[0]):
+        return None
+    value = series.iloc[0]
+    return value.item() if hasattr(value, "item") else value
+
+
+def constant_columns(df: pd.DataFrame, columns: List[str], variance_threshold: float = 0.0) -> Dict[str, Dict]:
+    """Columns with a single value (NaN counts as a value) or variance <= variance_threshold"""
+    dropped = {}
+    numeric = [c for c in columns if pd.api.types.is_numeric_dtype(df[c])]
+    if numeric:
+        block = df[numeric]
+        nulls = block.isna().sum()
+        lows, highs = block.min(), block.max()
+        variances = block.astype(np.float64).var() if variance_threshold > 0 else None
+        for col in numeric:
+            if nulls[col] == len(df) or (nulls[col] == 0 and lows[col] == highs[col]):
+                dropped[col] = {"reason": "constant", "value": _first_value(df[col])}
+            elif variances is not None and variances[col] <= variance_threshold:
+                dropped[col] = {"reason": "constant", "variance": float(variances[col])}
+    for col in columns:
+        if col not in dropped and col not in numeric and df[col].nunique(dropna=False) <= 1:
+            dropped[col] = {"reason": "constant", "value": _first_value(df[col])}
+    return dropped
+
+
+def near_zero_columns(sample: pd.DataFrame, columns: List[str], freq_ratio: float = 19.0,
+                      unique_ratio: float = 0.1) -> Dict[str, Dict]:
+    """Columns dominated by one value and with few distinct values (on a sample)"""
+    dropped = {}
+    rows = max(len(sample), 1)
+    for col in columns:
+        counts = sample[col].value_counts(dropna=False)
+        if len(counts) < 2:
+            continue
+        ratio = counts.iloc[0] / counts.iloc[1]
+        if ratio > freq_ratio and len(counts) / rows < unique_ratio:
+            dropped[col] = {"reason": "near_zero_variance", "freq_ratio": round(float(ratio), 2)}
+    return dropped
+
+
+def column_digest(series: pd.Series) -> str:
+    """64-bit digest of a column's values (independent of its name and index)"""
+    hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    return hashlib.blake2b(hashes.tobytes(), digest_size=8).hexdigest()
+
+
+def duplicate_columns(df: pd.DataFrame, columns: List[str]) -> Dict[str, Dict]:
+    """Columns equal to an earlier column; the first of each group is kept"""
+    dropped = {}
+    first_by_digest: Dict[Tuple[str, str], List[str]] = {}
+    for col in columns:
+        key = (str(df[col].dtype), column_digest(df[col]))
+        kept = first_by_digest.setdefault(key, [])
+        match = next((k for k in kept if df[k].equals(df[col])), None)
+        if match is None:
+            kept.append(col)
+        else:
+            dropped[col] = {"reason": "duplicate", "of": match}
+    return dropped
+
+
+def correlated_columns(sample: pd.DataFrame, columns: List[str], threshold: float = 0.95,
+                       block_size: int = 512) -> Dict[str, Dict]:
+    """
+    Numeric columns with |r| > threshold to an earlier kept column.
+
+    The sample is standardised once (float32, NaN -> column mean) and the
+    correlation matrix is computed in block_size x block_size tiles.
+    """
+    numeric = [c for c in columns if pd.api.types.is_numeric_dtype(sample[c])]
+    if len(numeric) < 2 or len(sample) < 3:
+        return {}
+
+    values = sample[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+    means = np.nanmean(values, axis=0)
+    stds = np.nanstd(values, axis=0)
+    usable = np.isfinite(stds) & (stds > 0)
+    numeric = [c for c, ok in zip(numeric, usable) if ok]
+    z = np.nan_to_num((values[:, usable] - means[usable]) / stds[usable]).astype(np.float32)
+    n, p = z.shape
+    if p < 2:
+        return {}
+
+    # Candidate pairs (i < j) above the threshold, found tile by tile
+    partners: Dict[int, List[Tuple[int, float]]] = {}
+    for start_i in range(0, p, block_size):
+        block_i = z[:, start_i:start_i + block_size]
+        for start_j in range(start_i, p, block_size):
+            tile = block_i.T @ z[:, start_j:start_j + block_size] / n
+            rows, cols = np.nonzero(np.abs(tile) > threshold)
+            for r, c in zip(rows, cols):
+                i, j = start_i + r, start_j + c
+                if i < j:
+                    partners.setdefault(j, []).append((i, float(tile[r, c])))
+
+    dropped = {}
+    for j in sorted(partners):
+        kept = [(i, r) for i, r in partners[j] if numeric[i] not in dropped]
+        if kept:
+            i, r = max(kept, key=lambda pair: abs(pair[1]))
+            dropped[numeric[j]] = {"reason": "correlated", "of": numeric[i], "r": round(r, 4)}
+    return dropped
+
+
+def analyse_features(df: pd.DataFrame, step: Dict) -> Dict:
+    """
+    Decide which columns a reduce_features step drops.
+
+    Returns:
+        {"rows", "sampled_rows", "dropped": {column: {"reason", ...}}}
+    """
+    remaining = _candidates(df, step)
+    sample = _sample(df, step)
+    dropped: Dict[str, Dict] = {}
+
+    def take(found: Dict[str, Dict]):
+        dropped.update(found)
+        remaining[:] = [c for c in remaining if c not in found]
+
+    take(constant_columns(df, remaining, float(step.get("variance_threshold", 0.0))))
+    if step.get("near_zero", True):
+        take(near_zero_columns(sample, remaining, float(step.get("freq_ratio", 19.0)),
+                               float(step.get("unique_ratio", 0.1))))
+    if step.get("duplicates", True):
+        take(duplicate_columns(df, remaining))
+    if step.get("correlation", 0.95) is not None:
+        take(correlated_columns(sample, remaining, float(step.get("correlation", 0.95)),
+                                int(step.get("block_size", 512))))
+
+    return {"rows": len(df), "sampled_rows": len(sample), "dropped": dropped}
+
+
+def merge_decisions(a: Dict, b: Dict) -> Dict:
+    """
+    Combine decisions taken on two pieces of one dataset.
+
+    A column is only dropped if both pieces drop it for the same reason
+    (and, for constants, with the same value; for duplicates /
+    correlations, in favour of the same column).
+    """
+    dropped = {}
+    for col, da in a["dropped"].items():
+        db = b["dropped"].get(col)
+        if db is None or any(db.get(key) != da.get(key) for key in ("reason", "value", "of")):
+            continue
+        decision = dict(da)
+        if "r" in da:
+            decision["r"] = da["r"] if abs(da["r"]) <= abs(db["r"]) else db["r"]
+        dropped[col] = decision
+    return {
+        "rows": a["rows"] + b["rows"],
+        "sampled_rows": a["sampled_rows"] + b["sampled_rows"],
+        "dropped": dropped,
+    }
+
+
+def reduce_features(df: pd.DataFrame, step: Dict) -> Tuple[pd.DataFrame, Dict]:
+    """Drop constant, near-zero variance, duplicate and correlated columns"""
+    decisions = analyse_features(df, step)
+    dropped = decisions["dropped"]
+    if dropped:
+        by_reason = {reason: sum(d["reason"] == reason for d in dropped.values()) for reason in REASONS}
+        logger.info(f"Dropping {len(dropped)} of {len(df.columns)} columns: {by_reason}")
+        df = df.drop(columns=list(dropped))
+    else:
+        logger.info("No columns to drop")
+    return df, decisions
@@ -0,0 +1,448 @@
+# app/services/fitted_pipeline.py
+# --------------------------------------------------------------------
+# Fit / transform split of a pipeline, for data that is processed in
+# pieces (partitions of one dataset, later appends).
+#
+# Stateful steps (imputation, encoding, scaling) take their parameters
+# from global statistics. Every piece contributes a mergeable partial:
+#
+#   fill_mean, standard scaling  -> count / mean / M2 (Chan's merge)
+#   fill_median, robust scaling  -> KLL quantile sketch
+#   minmax scaling               -> min / max
+#   fill_mode                    -> value counts
+#   label / one-hot encoding     -> category set
+#   reduce_features              -> drop decisions (kept if all pieces agree)
+#
+# Partials are merged and finalised into frozen parameters, so each piece
+# is transformed exactly as it would be in one run over the concatenated
+# data (medians and IQRs up to the sketch rank error) and every piece
+# gets the same output columns and category codes.
+#
+# Stateless steps (drop_columns, parse_dates, handle_missing=drop,
+# deduplicate, sample, validate) run per piece via STEP_HANDLERS.
+#
+# A FittedPipeline serialises to JSON (state + params per step) and can
+# be re-applied to new data, or refitted by merging new partials into the
+# stored state. Refitting never changes the columns reduce_features drops
+# or the categories of one-hot encoding, so later pieces keep the schema
+# of the earlier ones (label encoding appends unseen categories instead).
+# --------------------------------------------------------------------
+import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.core.logger import logger
+from app.services.feature_reduction import analyse_features, merge_decisions
+from app.services.quantile_sketch import QuantileSketch, sketch_series
+
+FITTED_VERSION = 1
+
+# Sentinel for "every column" in step footprints
+_ALL = None
+
+
+def _kind(step: Dict) -> Optional[str]:
+    """Kind of partial statistics a step needs, None for stateless steps"""
+    step_type = step.get("type")
+    method = step.get("method")
+    if step_type == "handle_missing":
+        return {"fill_mean": "moments", "fill_median": "sketch", "fill_mode": "counts"}.get(method or "drop")
+    if step_type == "encode_categorical":
+        return "categories" if (method or "label") in ("label", "onehot") else None
+    if step_type == "scale_numeric":
+        return {"standard": "moments", "minmax": "range", "robust": "sketch"}.get(method or "standard")
+    if step_type == "reduce_features":
+        return "reduction"
+    return None
+
+
+def is_stateful(step: Dict) -> bool:
+    return _kind(step) is not None
+
+
+def _step_columns(df: pd.DataFrame, step: Dict) -> List[str]:
+    """Columns a stateful step applies to in df (same rules as pipeline.py)"""
+    columns = step.get("columns")
+    if columns is None:
+        columns = df.columns.tolist() if step.get("type") == "handle_missing" else []
+    columns = [col for col in columns if col in df.columns]
+    if _kind(step) in ("moments", "sketch", "range"):
+        columns = [col for col in columns if pd.api.types.is_numeric_dtype(df[col])]
+    return columns
+
+
+def _scalar(value):
+    """Python scalar for JSON (NaN -> None)"""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _ordered(values: Sequence) -> List:
+    """Distinct values in the order pd.Categorical would give them"""
+    return pd.Categorical(pd.Series(list(values), dtype=object).dropna().unique()).categories.tolist()
+
+
+# --------------------------------------------------------------------
+# Partial statistics: per column, JSON-serialisable, mergeable
+# --------------------------------------------------------------------
+
+def _partial_column(series: pd.Series, kind: str, step: Dict) -> Dict:
+    if kind == "moments":
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return {"n": 0, "mean": 0.0, "m2": 0.0}
+        mean = float(values.mean())
+        return {"n": int(values.size), "mean": mean, "m2": float(((values - mean) ** 2).sum())}
+    if kind == "range":
+        values = pd.to_numeric(series, errors="coerce")
+        return {"min": _scalar(values.min()), "max": _scalar(values.max())}
+    if kind == "sketch":
+        return sketch_series(series, step).to_dict()
+    if kind == "counts":
+        counts = series.value_counts(dropna=True)
+        return {"values": [_scalar(v) for v in counts.index], "counts": counts.astype(int).tolist()}
+    return {"categories": _ordered(series.dropna().unique())}
+
+
+def _merge_column(a: Dict, b: Dict, kind: str, step: Dict, keep_order: bool = False) -> Dict:
+    if kind == "moments":
+        n = a["n"] + b["n"]
+        if n == 0:
+            return dict(a)
+        delta = b["mean"] - a["mean"]
+        return {
+            "n": n,
+            "mean": a["mean"] + delta * b["n"] / n,
+            "m2": a["m2"] + b["m2"] + delta * delta * a["n"] * b["n"] / n,
+        }
+    if kind == "range":
+        lows = [v for v in (a["min"], b["min"]) if v is not None]
+        highs = [v for v in (a["max"], b["max"]) if v is not None]
+        return {"min": min(lows) if lows else None, "max": max(highs) if highs else None}
+    if kind == "sketch":
+        merged = QuantileSketch.from_dict(a).merge(QuantileSketch.from_dict(b))
+        return merged.to_dict()
+    if kind == "counts":
+        total = pd.Series(a["counts"], index=pd.Index(a["values"], dtype=object), dtype="int64").add(
+            pd.Series(b["counts"], index=pd.Index(b["values"], dtype=object), dtype="int64"), fill_value=0
+        )
+        return {"values": total.index.tolist(), "counts": total.astype(int).tolist()}
+    if keep_order:
+        # Existing codes stay valid; new categories are appended
+        known = set(a["categories"])
+        return {"categories": list(a["categories"]) + _ordered([c for c in b["categories"] if c not in known])}
+    return {"categories": _ordered(list(a["categories"]) + list(b["categories"]))}
+
+
+def partial_state(df: pd.DataFrame, step: Dict) -> Dict:
+    """Partial statistics of a stateful step over one piece of data"""
+    kind = _kind(step)
+    if kind == "reduction":
+        return {"kind": kind, "decisions": analyse_features(df, step)}
+    return {
+        "kind": kind,
+        "columns": {col: _partial_column(df[col], kind, step) for col in _step_columns(df, step)},
+    }
+
+
+def merge_states(a: Dict, b: Dict, step: Dict, keep_order: bool = False) -> Dict:
+    """
+    Merge two partial states of the same step (columns missing on one side are taken as-is).
+
+    keep_order keeps a's category order and appends b's new categories,
+    instead of sorting them like a single run would. One-hot categories
+    are kept as they are, since new ones would add dummy columns.
+    """
+    kind = a["kind"]
+    if kind == "reduction":
+        return a if keep_order else {"kind": kind, "decisions": merge_decisions(a["decisions"], b["decisions"])}
+    if keep_order and kind == "categories" and step.get("method") == "onehot":
+        return a
+    columns = dict(a["columns"])
+    for col, partial in b["columns"].items():
+        columns[col] = _merge_column(columns[col], partial, kind, step, keep_order) if col in columns else partial
+    return {"kind": kind, "columns": columns}
+
+
+def finalize_state(state: Dict, step: Dict) -> Dict:
+    """Frozen transform parameters from merged statistics"""
+    kind = state["kind"]
+    if kind == "reduction":
+        return {"drop": list(state["decisions"]["dropped"])}
+    columns = state["columns"]
+    step_type = step.get("type")
+
+    if kind == "categories":
+        return {"categories": {col: p["categories"] for col, p in columns.items()}}
+
+    if step_type == "handle_missing":
+        values = {}
+        for col, p in columns.items():
+            if kind == "moments":
+                values[col] = p["mean"] if p["n"] else None
+            elif kind == "sketch":
+                values[col] = _scalar(QuantileSketch.from_dict(p).quantile(0.5))
+            else:
+                values[col] = _mode(p["values"], p["counts"])
+        return {"values": values}
+
+    # scale_numeric: x -> (x - shift) / scale, columns with scale None are left alone
+    scaling = {}
+    for col, p in columns.items():
+        if kind == "moments":
+            std = math.sqrt(p["m2"] / (p["n"] - 1)) if p["n"] > 1 else 0.0
+            shift, scale = p["mean"], std
+        elif kind == "range":
+            shift = p["min"]
+            scale = p["max"] - p["min"] if p["min"] is not None and p["max"] is not None else 0.0
+        else:
+            q25, median, q75 = QuantileSketch.from_dict(p).quantiles([0.25, 0.5, 0.75])
+            shift, scale = _scalar(median), _scalar(q75 - q25)
+        scaling[col] = {"shift": shift, "scale": scale if scale and scale > 0 else None}
+    return {"scaling": scaling}
+
+
+def _mode(values: List, counts: List[int]):
+    """Most frequent value; ties go to the smallest value, like Series.mode()[0]"""
+    if not counts:
+        return None
+    top = max(counts)
+    candidates = [v for v, c in zip(values, counts) if c == top]
+    try:
+        return sorted(candidates)[0]
+    except TypeError:
+        return candidates[0]
+
+
+# --------------------------------------------------------------------
+# Applying frozen parameters
+# --------------------------------------------------------------------
+
+def _fill(series: pd.Series, value) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+def apply_params(df: pd.DataFrame, step: Dict, params: Dict) -> pd.DataFrame:
+    """Transform df with a stateful step's frozen parameters"""
+    if "drop" in params:
+        return df.drop(columns=[col for col in params["drop"] if col in df.columns])
+
+    df = df.copy()
+
+    if "values" in params:
+        for col, value in params["values"].items():
+            if col in df.columns and value is not None:
+                df[col] = _fill(df[col], value)
+        return df
+
+    if "scaling" in params:
+        for col, p in params["scaling"].items():
+            if col in df.columns and p["scale"] is not None:
+                df[col] = (pd.to_numeric(df[col], errors="coerce") - p["shift"]) / p["scale"]
+        return df
+
+    categories = {col: cats for col, cats in params["categories"].items() if col in df.columns}
+    if not categories:
+        return df
+    for col, cats in categories.items():
+        df[col] = pd.Categorical(df[col], categories=cats)
+    if step.get("method", "label") == "onehot":
+        # Frozen categories give every piece the same dummy columns
+        return pd.get_dummies(df, columns=list(categories), prefix=list(categories))
+    for col in categories:
+        df[col] = df[col].cat.codes
+    return df
+
+
+# --------------------------------------------------------------------
+# Fitted pipeline
+# --------------------------------------------------------------------
+
+class FittedPipeline:
+    """
+    A pipeline whose stateful steps carry frozen parameters.
+
+    fitted[i] is None for stateless steps, otherwise
+    {"state": merged partial statistics, "params": frozen parameters}.
+    """
+
+    def __init__(self, steps: List[Dict], fitted: Optional[List[Optional[Dict]]] = None):
+        self.steps = list(steps)
+        self.fitted = list(fitted) if fitted is not None else [None] * len(self.steps)
+
+    @property
+    def is_fitted(self) -> bool:
+        return all(f is not None for s, f in zip(self.steps, self.fitted) if is_stateful(s))
+
+    def transform(self, df: pd.DataFrame, skip: Sequence[int] = (), report: Optional[List[Dict]] = None) -> pd.DataFrame:
+        """
+        Run all steps on df, stateful ones with their frozen parameters.
+
+        Args:
+            skip: Indices of stateful steps to leave out (used while fitting)
+            report: Optional list receiving per-step row counts (see execute_steps)
+        """
+        from app.services.pipeline import execute_steps
+
+        processed = df
+        pending: List[Dict] = []
+        pending_start = 0
+        for i, step in enumerate(self.steps):
+            if not is_stateful(step):
+                if not pending:
+                    pending_start = i
+                pending.append(step)
+                continue
+            if pending:
+                processed = execute_steps(processed, pending, offset=pending_start, report=report)
+                pending = []
+            if i in skip:
+                continue
+            if self.fitted[i] is None:
+                raise ValueError(f"Pipeline step {i + 1} ({step.get('type')}) has not been fitted")
+            processed = apply_params(processed, step, self.fitted[i]["params"])
+            if report is not None:
+                report.append({"step": i + 1, "type": step.get("type"), "rows_in": len(processed),
+                               "rows_out": len(processed), "rows_removed": 0})
+        if pending:
+            processed = execute_steps(processed, pending, offset=pending_start, report=report)
+        return processed
+
+    def partial_states(self, df: pd.DataFrame, indices: Sequence[int], skip: Sequence[int] = ()) -> Dict[int, Dict]:
+        """Partial statistics of the given stateful steps over one piece of raw data"""
+        states = {}
+        processed = df
+        start = 0
+        # Run the pipeline up to each requested step, continuing from the previous one
+        for i in sorted(indices):
+            segment = FittedPipeline(self.steps[start:i], self.fitted[start:i])
+            processed = segment.transform(processed, skip=[j - start for j in skip if start <= j < i])
+            states[i] = partial_state(processed, self.steps[i])
+            start = i
+        return states
+
+    def refit(self, states: Dict[int, Dict]) -> "FittedPipeline":
+        """
+        Merge new partial statistics into the stored state and re-finalise (in place).
+
+        Categories already fitted keep their codes; unseen ones are appended
+        for label encoding and ignored (all-zero dummies) for one-hot.
+        """
+        for i, state in states.items():
+            step = self.steps[i]
+            current = self.fitted[i]
+            merged = merge_states(current["state"], state, step, keep_order=True) if current else state
+            self.fitted[i] = {"state": merged, "params": finalize_state(merged, step)}
+        return self
+
+    def to_dict(self) -> Dict:
+        return {"version": FITTED_VERSION, "steps": self.steps, "fitted": self.fitted}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FittedPipeline":
+        if data.get("version") != FITTED_VERSION:
+            raise ValueError(f"Unsupported fitted pipeline version: {data.get('version')}")
+        return cls(data["steps"], data["fitted"])
+
+
+def _footprint(step: Dict):
+    """(columns read, columns written) by a step; _ALL means every column"""
+    columns = step.get("columns")
+    cols = set(columns) if columns is not None else _ALL
+    step_type = step.get("type")
+    if is_stateful(step):
+        writes = _ALL if step_type == "encode_categorical" and step.get("method") == "onehot" else cols
+        return cols, writes
+    if step_type in ("drop_columns", "parse_dates"):
+        return set(columns or []), set(columns or [])
+    if step_type in ("vectorize_text", "date_features"):
+        # Adds derived "<column>_..." features next to whatever else is in the frame
+        return set(columns or []), _ALL
+    if step_type == "handle_missing":
+        return cols, set()
+    if step_type == "sample":
+        return ({step["stratify"]} if step.get("stratify") else set()), set()
+    if step_type == "deduplicate":
+        return cols, set()
+    if step_type in ("validate",):
+        return _ALL, set()
+    return set(), set()
+
+
+def _overlaps(reads, writes) -> bool:
+    if writes is _ALL:
+        return True
+    if not writes:
+        return False
+    return reads is _ALL or bool(reads & writes)
+
+
+def fit_waves(steps: List[Dict]) -> List[List[int]]:
+    """
+    Group stateful steps into waves that can be fitted in the same pass.
+
+    A stateful step joins the current wave unless it, or any step between
+    it and the wave, reads columns written by a step of the wave.
+    """
+    waves: List[List[int]] = []
+    current: List[int] = []
+    written = set()
+    for i, step in enumerate(steps):
+        reads, writes = _footprint(step)
+        if current and _overlaps(reads, written):
+            waves.append(current)
+            current, written = [], set()
+        if is_stateful(step):
+            current.append(i)
+            written = _ALL if writes is _ALL or written is _ALL else written | writes
+    if current:
+        waves.append(current)
+    return waves
+
+
+def fit_pipeline(
+    steps: List[Dict],
+    pieces: Sequence,
+    load: Callable[[object], pd.DataFrame],
+    workers: int = 1,
+) -> FittedPipeline:
+    """
+    Fit a pipeline over data split into pieces.
+
+    Each wave of independent stateful steps costs one parallel pass over
+    the pieces: every piece is loaded, run through the already fitted
+    prefix, and reduced to partial statistics, which are then merged.
+
+    Args:
+        steps: Pipeline steps
+        pieces: Piece identifiers (e.g. object names)
+        load: Returns the raw DataFrame of a piece (may be called once per wave)
+        workers: Pieces processed concurrently
+    """
+    fitted = FittedPipeline(steps)
+    waves = fit_waves(steps)
+    logger.info(f"Fitting {sum(len(w) for w in waves)} stateful steps over {len(pieces)} pieces in {len(waves)} passes")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prepare-fit") as pool:
+        for wave in waves:
+            unfitted = [i for i, f in enumerate(fitted.fitted) if f is None and is_stateful(steps[i])]
+
+            def piece_states(piece):
+                return fitted.partial_states(load(piece), wave, skip=unfitted)
+
+            per_piece = list(pool.map(piece_states, pieces))
+            fitted.refit({
+                i: reduce(lambda a, b: merge_states(a, b, steps[i]), [states[i] for states in per_piece])
+                for i in wave
+            })
+    return fitted
@@ -0,0 +1,224 @@
+# app/services/flight_service.py
+# --------------------------------------------------------------------
+# Arrow Flight endpoint serving prepared datasets to other services.
+#
+# A dataset is addressed by its MinIO object name; only prepared datasets
+# under processed/ are served (raw uploads are not). Clients describe
+# what they want with a JSON command descriptor:
+#
+#   {"object": "processed/x_processed_20250101_120000.csv",
+#    "columns": ["a", "target"],      # optional projection
+#    "offset": 0, "length": 100000}   # optional row range
+#
+# get_flight_info answers with one endpoint per FLIGHT_ENDPOINT_ROWS
+# rows of the requested range; each endpoint's ticket is the same JSON
+# narrowed to its rows, so clients fetch the endpoints in parallel and
+# concatenate the record batches. Projection and slicing are zero-copy
+# on the served Arrow table.
+#
+# Tables come from, in order:
+#   1. an in-memory LRU (FLIGHT_CACHE_BYTES), filled by /prepare
+#      (register_frame) and by earlier requests
+#   2. the local handoff file (memory-mapped, see local_handoff.py)
+#   3. the MinIO object, spooled and parsed like /prepare inputs
+# Entries loaded from MinIO remember the object's ETag and are reloaded
+# when it changes. Frames are served with the dtypes of the stored CSV
+# (datetime / category -> object, ...), whichever source they come from.
+#
+# The server runs in a background thread when FLIGHT_PORT is set.
+# --------------------------------------------------------------------
+import json
+import os
+import posixpath
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.admission import load_admitted
+from app.services.dataset_profile import stored_frame
+from app.services.local_handoff import link_path
+from app.services.spool import spool_chunks
+from app.storage.minio_client import get_object_etag, iter_object_chunks
+
+try:
+    import pyarrow as pa
+    from pyarrow import flight
+except ImportError:  # optional dependency
+    pa = None
+    flight = None
+
+
+# Object name prefix of the datasets the server may read
+SERVED_PREFIX = "processed/"
+
+
+def parse_request(raw: bytes) -> Dict:
+    """Validated request dict from a descriptor command or ticket"""
+    try:
+        request = json.loads(raw)
+    except ValueError as exc:
+        raise ValueError(f"Flight request must be JSON: {exc}") from exc
+    if not isinstance(request, dict) or not request.get("object"):
+        raise ValueError("Flight request needs an 'object'")
+    name = request["object"]
+    if not isinstance(name, str) or not name.startswith(SERVED_PREFIX) or posixpath.normpath(name) != name:
+        raise ValueError(f"Only {SERVED_PREFIX} objects are served: {name}")
+    offset = int(request.get("offset") or 0)
+    length = request.get("length")
+    if offset < 0 or (length is not None and int(length) < 0):
+        raise ValueError("'offset' and 'length' must be non-negative")
+    return {
+        "object": request["object"],
+        "columns": request.get("columns") or None,
+        "offset": offset,
+        "length": None if length is None else int(length),
+    }
+
+
+class TableCache:
+    """LRU of Arrow tables by object name, bounded by their total size"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[pa.Table, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+            return entry
+
+    def put(self, name: str, table, etag: Optional[str] = None):
+        with self._lock:
+            self._entries[name] = (table, etag)
+            self._entries.move_to_end(name)
+            total = sum(t.nbytes for t, _ in self._entries.values())
+            while total > self.max_bytes and len(self._entries) > 1:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                total -= evicted.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+table_cache = TableCache(settings.FLIGHT_CACHE_BYTES)
+
+
+def _table_from_frame(df: pd.DataFrame):
+    # Same dtypes as a read of the stored CSV (see dataset_profile.stored_frame)
+    return pa.Table.from_pandas(stored_frame(df), preserve_index=False)
+
+
+def register_frame(object_name: str, df: pd.DataFrame) -> None:
+    """Serve a just-processed frame without reloading it (no-op unless the server is enabled)"""
+    if not settings.FLIGHT_PORT or pa is None:
+        return
+    try:
+        table_cache.put(object_name, _table_from_frame(df))
+    except Exception as exc:
+        logger.warning(f"Cannot register {object_name} for Flight: {exc}")
+
+
+def load_table(object_name: str):
+    """Arrow table of a stored dataset (cache, local handoff, then MinIO)"""
+    cached = table_cache.get(object_name)
+    if cached is not None:
+        table, etag = cached
+        if etag is None or etag == get_object_etag(object_name):
+            return table
+
+    if settings.LOCAL_HANDOFF_DIR:
+        link = link_path(settings.LOCAL_HANDOFF_DIR, object_name)
+        if os.path.exists(link):
+            table = pa.ipc.open_file(pa.memory_map(os.path.realpath(link), "r")).read_all()
+            table_cache.put(object_name, table)
+            return table
+
+    etag = get_object_etag(object_name)
+    if etag is None:
+        raise FileNotFoundError(f"Object not found: {object_name}")
+    with spool_chunks(iter_object_chunks(object_name, settings.SPOOL_CHUNK_SIZE), object_name) as spooled:
+        df, _ = load_admitted(spooled)
+    table = _table_from_frame(df)
+    table_cache.put(object_name, table, etag)
+    logger.info(f"Flight loaded {object_name} from MinIO ({table.num_rows} rows)")
+    return table
+
+
+def select(table, request: Dict):
+    """Projection and row range of a request (zero-copy)"""
+    if request["columns"]:
+        missing = [c for c in request["columns"] if c not in table.column_names]
+        if missing:
+            raise KeyError(f"Unknown columns: {missing}")
+        table = table.select(request["columns"])
+    return table.slice(request["offset"], request["length"])
+
+
+if flight is not None:
+
+    class DatasetFlightServer(flight.FlightServerBase):
+        """Serves stored datasets as Arrow record batch streams"""
+
+        def __init__(self, location: str, endpoint_rows: int):
+            super().__init__(location)
+            self.endpoint_rows = max(1, endpoint_rows)
+
+        def _resolve(self, raw: bytes):
+            try:
+                request = parse_request(raw)
+                return request, select(load_table(request["object"]), request)
+            except (ValueError, KeyError) as exc:
+                raise flight.FlightServerError(str(exc))
+            except FileNotFoundError as exc:
+                raise flight.FlightServerError(f"Dataset not found: {exc}")
+
+        def get_flight_info(self, context, descriptor):
+            request, table = self._resolve(descriptor.command)
+            endpoints = []
+            for start in range(0, max(table.num_rows, 1), self.endpoint_rows):
+                ticket = dict(request, offset=request["offset"] + start,
+                              length=min(self.endpoint_rows, table.num_rows - start))
+                endpoints.append(flight.FlightEndpoint(json.dumps(ticket).encode(), []))
+            return flight.FlightInfo(table.schema, descriptor, endpoints, table.num_rows, table.nbytes)
+
+        def get_schema(self, context, descriptor):
+            _, table = self._resolve(descriptor.command)
+            return flight.SchemaResult(table.schema)
+
+        def do_get(self, context, ticket):
+            _, table = self._resolve(ticket.ticket)
+            return flight.RecordBatchStream(table)
+
+
+_server = None
+
+
+def start_flight_server():
+    """Start the Flight server in a background thread if FLIGHT_PORT is set"""
+    global _server
+    if not settings.FLIGHT_PORT:
+        return None
+    if flight is None:
+        logger.warning("FLIGHT_PORT is set but pyarrow.flight is not available; Flight disabled")
+        return None
+    location = f"grpc://{settings.FLIGHT_HOST}:{settings.FLIGHT_PORT}"
+    _server = DatasetFlightServer(location, settings.FLIGHT_ENDPOINT_ROWS)
+    threading.Thread(target=_server.serve, name="flight-server", daemon=True).start()
+    logger.info(f"Arrow Flight dataset server listening on {location}")
+    return _server
+
+
+def stop_flight_server():
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server = None
+        table_cache.clear()
@@ -0,0 +1,180 @@
+# app/services/ingest.py
+# --------------------------------------------------------------------
+# Format sniffing and native readers for uploaded / stored datasets.
+#
+# Supported inputs:
+#  - CSV, optionally gzip or zstd compressed (.csv, .csv.gz, .csv.zst)
+#  - Parquet (.parquet, .pq)
+#  - Arrow IPC file / Feather v2 (.arrow, .feather, .ipc) and IPC stream
+#  - JSON Lines (.jsonl, .ndjson), optionally compressed
+#
+# The format is detected from the leading magic bytes first and from the
+# file name second. Columnar formats are read natively (no text parse)
+# with optional column projection and keep their stored dtypes.
+# Parquet/Arrow support requires pyarrow.
+# --------------------------------------------------------------------
+import io
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+import pandas as pd
+
+_MAGIC_PARQUET = b"PAR1"
+_MAGIC_ARROW_FILE = b"ARROW1"
+_MAGIC_ARROW_STREAM = b"\xff\xff\xff\xff"
+_MAGIC_GZIP = b"\x1f\x8b"
+_MAGIC_ZSTD = b"\x28\xb5\x2f\xfd"
+
+# Bytes needed by sniff_format
+SNIFF_BYTES = 8
+
+_COMPRESSION_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+_FORMAT_SUFFIXES = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+    ".arrows": "arrow_stream",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+SUPPORTED_FORMATS_HELP = (
+    "CSV (optionally .gz/.zst compressed), Parquet, Arrow IPC/Feather and JSON Lines"
+)
+
+
+class UnsupportedFormatError(ValueError):
+    """Raised when an input is not one of the supported dataset formats"""
+
+
+@dataclass
+class DatasetFormat:
+    format: str                       # csv | parquet | arrow | arrow_stream | jsonl
+    compression: Optional[str] = None  # gzip | zstd (text formats only)
+
+    @property
+    def is_columnar(self) -> bool:
+        return self.format in ("parquet", "arrow", "arrow_stream")
+
+
+def _split_suffixes(filename: str):
+    """Return (format suffix, compression suffix) from a file name"""
+    name = (filename or "").lower()
+    compression = None
+    for suffix, kind in _COMPRESSION_SUFFIXES.items():
+        if name.endswith(suffix):
+            compression = kind
+            name = name[: -len(suffix)]
+            break
+    fmt = None
+    for suffix, kind in _FORMAT_SUFFIXES.items():
+        if name.endswith(suffix):
+            fmt = kind
+            break
+    return fmt, compression
+
+
+def strip_extension(filename: str) -> str:
+    """Base name without dataset/compression extensions ('a.csv.gz' -> 'a')"""
+    lowered = filename.lower()
+    for suffix in _COMPRESSION_SUFFIXES:
+        if lowered.endswith(suffix):
+            filename, lowered = filename[: -len(suffix)], lowered[: -len(suffix)]
+            break
+    for suffix in _FORMAT_SUFFIXES:
+        if lowered.endswith(suffix):
+            return filename[: -len(suffix)]
+    return filename.rsplit('.', 1)[0]
+
+
+def sniff_format(head: bytes, filename: str) -> DatasetFormat:
+    """
+    Detect the dataset format from leading bytes and the file name.
+
+    Args:
+        head: First bytes of the content (at least SNIFF_BYTES when available)
+        filename: Original file or object name
+
+    Raises:
+        UnsupportedFormatError: If the input is not a supported format
+    """
+    name_format, name_compression = _split_suffixes(filename)
+
+    if head.startswith(_MAGIC_PARQUET):
+        return DatasetFormat("parquet")
+    if head.startswith(_MAGIC_ARROW_FILE):
+        return DatasetFormat("arrow")
+    if head.startswith(_MAGIC_ARROW_STREAM) and name_format in ("arrow", "arrow_stream"):
+        return DatasetFormat("arrow_stream")
+    if head.startswith(_MAGIC_GZIP) or head.startswith(_MAGIC_ZSTD):
+        compression = "gzip" if head.startswith(_MAGIC_GZIP) else "zstd"
+        if name_format in (None, "csv", "jsonl"):
+            return DatasetFormat(name_format or "csv", compression)
+        raise UnsupportedFormatError(f"Compressed {name_format} input is not supported")
+
+    if name_format in ("csv", "jsonl") and name_compression is None:
+        return DatasetFormat(name_format)
+
+    raise UnsupportedFormatError(
+        f"Unsupported file format for '{filename}'. Supported: {SUPPORTED_FORMATS_HELP}"
+    )
+
+
+def read_dataset(
+    source: Union[bytes, str],
+    fmt: DatasetFormat,
+    columns: Optional[List[str]] = None,
+    memory_map: bool = False,
+) -> pd.DataFrame:
+    """
+    Read a dataset natively according to its format.
+
+    Args:
+        source: Raw bytes or a local file path
+        fmt: Result of sniff_format
+        columns: Optional column projection (only these columns are read)
+        memory_map: Memory-map local files instead of buffering them
+
+    Returns:
+        pd.DataFrame
+    """
+    is_path = not isinstance(source, (bytes, bytearray))
+    memory_map = memory_map and is_path
+    src = source if is_path else io.BytesIO(source)
+
+    if fmt.format == "csv":
+        return pd.read_csv(
+            src, compression=fmt.compression, usecols=columns,
+            memory_map=memory_map and fmt.compression is None
+        )
+
+    if fmt.format == "jsonl":
+        df = pd.read_json(src, lines=True, compression=fmt.compression, convert_dates=False)
+        return df[columns] if columns else df
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # optional dependency
+        raise UnsupportedFormatError(f"Reading {fmt.format} requires the pyarrow package") from exc
+
+    if fmt.format == "parquet":
+        table = pq.read_table(src, columns=columns, memory_map=memory_map)
+    else:
+        if memory_map:
+            src = pa.memory_map(src)
+        reader = pa.ipc.open_file(src) if fmt.format == "arrow" else pa.ipc.open_stream(src)
+        table = reader.read_all()
+        table = table.select(columns) if columns else table
+    return table.to_pandas()
+
+
+def parse_columns(columns: Optional[str]) -> Optional[List[str]]:
+    """Turn a comma-separated form value into a column list"""
+    if not columns:
+        return None
+    parsed = [c.strip() for c in columns.split(",") if c.strip()]
+    return parsed or None
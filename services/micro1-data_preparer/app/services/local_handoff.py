@@ -0,0 +1,147 @@
+# app/services/local_handoff.py
+# --------------------------------------------------------------------
+# Local fast path for handing processed datasets to colocated services.
+#
+# Besides the CSV uploaded to MinIO, /prepare writes the processed
+# frame as an uncompressed Arrow IPC file into LOCAL_HANDOFF_DIR (a
+# tmpfs such as /dev/shm, or any directory shared by the containers).
+# The frame is published with the dtypes a read of the CSV gives
+# (dataset_profile.stored_frame: datetime / category -> object, nullable
+# int -> float64, ...), so consumers get the same frame either way:
+#
+#   <dir>/<sha256>.arrow              content-addressed (sha256 of the
+#                                     CSV object uploaded to MinIO)
+#   <dir>/by-name/<quoted object>     symlink -> ../<sha256>.arrow
+#
+# A selector or trainer on the same host resolves the MinIO object name
+# through by-name/ and memory-maps the Arrow file (zero-copy); when the
+# link is missing (other node, evicted, feature disabled) it downloads
+# from MinIO as before. Files are written to a temporary name and
+# renamed, links are replaced atomically, so readers never see partial
+# data. Beyond LOCAL_HANDOFF_MAX_BYTES the oldest files are evicted;
+# readers that already mapped them keep their mapping.
+#
+# Publishing is best effort: failures are logged, never raised.
+# --------------------------------------------------------------------
+import hashlib
+import os
+import threading
+from typing import Dict, Optional
+from urllib.parse import quote
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.dataset_profile import stored_frame
+
+HANDOFF_SUFFIX = ".arrow"
+LINKS_DIR = "by-name"
+
+
+def _tmp_name(path: str) -> str:
+    return f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+
+def link_path(root: str, object_name: str) -> str:
+    """Path of the by-name link of a MinIO object"""
+    return os.path.join(root, LINKS_DIR, quote(object_name, safe=""))
+
+
+def _write_arrow(df: pd.DataFrame, path: str) -> None:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(stored_frame(df), preserve_index=False)
+    tmp = _tmp_name(path)
+    try:
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _link(root: str, object_name: str, path: str) -> None:
+    link = link_path(root, object_name)
+    tmp = _tmp_name(link)
+    os.symlink(os.path.join("..", os.path.basename(path)), tmp)
+    os.replace(tmp, link)
+
+
+def evict(root: str, max_bytes: int, keep: Optional[str] = None) -> int:
+    """Remove the oldest handoff files beyond max_bytes, then dangling links; returns files removed"""
+    files = []
+    for entry in os.scandir(root):
+        if entry.is_file() and entry.name.endswith(HANDOFF_SUFFIX):
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    links = os.path.join(root, LINKS_DIR)
+    if removed and os.path.isdir(links):
+        for entry in os.scandir(links):
+            if entry.is_symlink() and not os.path.exists(entry.path):
+                os.remove(entry.path)
+    return removed
+
+
+def publish_frame(df: pd.DataFrame, object_name: str, data: bytes) -> Optional[Dict]:
+    """
+    Write df as <sha256 of data>.arrow and link it under object_name.
+
+    data is the object uploaded to MinIO for df, so the same content is
+    published under the same file whatever the object is called.
+
+    Returns:
+        {"content_hash", "path", "bytes"} or None if disabled / failed
+    """
+    root = settings.LOCAL_HANDOFF_DIR
+    if not root:
+        return None
+    try:
+        content_hash = hashlib.sha256(data).hexdigest()
+        os.makedirs(os.path.join(root, LINKS_DIR), exist_ok=True)
+        path = os.path.join(root, content_hash + HANDOFF_SUFFIX)
+        if os.path.exists(path):
+            os.utime(path)  # same content already published: refresh for eviction
+        else:
+            _write_arrow(df, path)
+        _link(root, object_name, path)
+        size = os.path.getsize(path)
+        evict(root, settings.LOCAL_HANDOFF_MAX_BYTES, keep=path)
+        logger.info(f"Published local handoff for {object_name}: {path} ({size} bytes)")
+        return {"content_hash": content_hash, "path": path, "bytes": size}
+    except Exception as exc:
+        logger.warning(f"Local handoff for {object_name} failed: {exc}")
+        return None
+
+
+def read_frame(object_name: str) -> Optional[pd.DataFrame]:
+    """Memory-mapped frame published for object_name on this host, or None"""
+    root = settings.LOCAL_HANDOFF_DIR
+    if not root:
+        return None
+    link = link_path(root, object_name)
+    if not os.path.exists(link):
+        return None
+    try:
+        import pyarrow as pa
+
+        table = pa.ipc.open_file(pa.memory_map(os.path.realpath(link), "r")).read_all()
+        return table.to_pandas(split_blocks=True)
+    except Exception as exc:
+        logger.warning(f"Cannot read local handoff for {object_name}: {exc}")
+        return None
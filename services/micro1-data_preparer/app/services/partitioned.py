@@ -0,0 +1,379 @@
+# app/services/partitioned.py
+# --------------------------------------------------------------------
+# Prepare a dataset stored as many raw partitions (e.g. daily CSVs
+# under one prefix) without concatenating them.
+#
+#   1. list the objects under the prefix matching an optional glob
+#   2. fit the pipeline over all partitions in parallel, merging
+#      per-partition statistics into global parameters (fitted_pipeline)
+#   3. transform every partition in parallel with the frozen parameters
+#      and write it as its own Parquet object
+#
+# Output layout under processed/<output>/:
+#
+#   part-<source>.parquet   one per raw partition
+#   _fitted.json            the fitted pipeline (steps, statistics, params)
+#   _manifest.json          sources, ETags, output objects, row counts
+#
+# The manifest is rewritten after every finished partition. A re-run with
+# resume reuses _fitted.json and skips partitions whose source ETag
+# matches a finished entry, so an interrupted job only redoes the
+# partitions it had not completed.
+#
+# append_partition adds one new raw object as a further partition,
+# transformed with the stored parameters, so a daily refresh costs time
+# proportional to the new rows. With refit the new rows' statistics are
+# first merged into the stored state; the previous parameters are kept as
+# _fitted-r<N>.json and each manifest entry records the revision it used.
+# --------------------------------------------------------------------
+import fnmatch
+import io
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.admission import load_admitted
+from app.services.fitted_pipeline import FittedPipeline, fit_pipeline, is_stateful
+from app.services.spool import spool_chunks
+from app.services.text_vectorizer import densify_sparse
+from app.storage.minio_client import (
+    download_bytes, get_object_etag, iter_object_chunks, list_object_infos, object_exists, upload_bytes
+)
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "_manifest.json"
+FITTED_NAME = "_fitted.json"
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+
+
+def output_prefix(output: str) -> str:
+    return f"processed/{output.strip('/')}/"
+
+
+def list_partitions(prefix: str, pattern: Optional[str] = None) -> List[Dict]:
+    """Raw objects under prefix (name, etag, size), filtered by a glob on the path below it"""
+    partitions = []
+    for info in list_object_infos(prefix):
+        relative = info["name"][len(prefix):].lstrip("/")
+        if not relative or os.path.basename(relative).startswith((".", "_")):
+            continue
+        if pattern and not fnmatch.fnmatch(relative, pattern):
+            continue
+        partitions.append(info)
+    return sorted(partitions, key=lambda p: p["name"])
+
+
+def part_object_name(out_prefix: str, source: str, prefix: str) -> str:
+    """Deterministic output object for a raw partition"""
+    from app.services.ingest import strip_extension
+
+    relative = source[len(prefix):].lstrip("/") if source.startswith(prefix) else os.path.basename(source)
+    stem = strip_extension(relative).replace("/", "__") or "part"
+    return f"{out_prefix}part-{stem}.parquet"
+
+
+def archived_fitted_name(out_prefix: str, revision: int) -> str:
+    return f"{out_prefix}_fitted-r{revision}.json"
+
+
+def load_json(object_name: str) -> Optional[Dict]:
+    """A stored JSON document, or None if it does not exist"""
+    if not object_exists(object_name):
+        return None
+    return json.loads(download_bytes(object_name).decode("utf-8"))
+
+
+def store_json(object_name: str, document: Dict):
+    upload_bytes(object_name, json.dumps(document, indent=2, default=str).encode("utf-8"), "application/json")
+
+
+def frame_to_parquet(df: pd.DataFrame) -> bytes:
+    # Parquet has no sparse type: hashed text features are stored dense
+    # (zeros compress well) and come back as plain float32 columns
+    df = densify_sparse(df)
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+class PartitionLoader:
+    """
+    Loads raw partitions from MinIO, admitted against the memory budget.
+
+    Fitting reads every partition once per pass, so the first load of a
+    partition also keeps a local pickled copy; later passes read that
+    instead of downloading and parsing the raw object again.
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None, cache: bool = True):
+        self.columns = columns
+        self._dir = None
+        if cache:
+            os.makedirs(settings.SPOOL_DIR, exist_ok=True)
+            self._dir = tempfile.mkdtemp(dir=settings.SPOOL_DIR, prefix="partitions-")
+        self._paths: Dict[str, str] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def load(self, name: str, release: bool = False) -> pd.DataFrame:
+        """Load a partition; release drops its cached copy (last read)"""
+        with self._lock:
+            path = self._paths.pop(name, None) if release else self._paths.get(name)
+        if path is not None:
+            with open(path, "rb") as f:
+                df = pickle.load(f)
+            if release:
+                os.unlink(path)
+            return df
+
+        with spool_chunks(iter_object_chunks(name, settings.SPOOL_CHUNK_SIZE), name) as spooled:
+            df, _ = load_admitted(spooled, columns=self.columns)
+
+        if self._dir is not None and not release:
+            with self._lock:
+                self._count += 1
+                path = os.path.join(self._dir, f"{self._count:06d}.pkl")
+                self._paths[name] = path
+            with open(path, "wb") as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return df
+
+    def close(self):
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ManifestWriter:
+    """Thread-safe manifest updates, persisted after every change"""
+
+    def __init__(self, object_name: str, manifest: Dict):
+        self.object_name = object_name
+        self.manifest = manifest
+        self._lock = threading.Lock()
+
+    def record(self, entry: Dict):
+        with self._lock:
+            entry.setdefault("fitted_revision", self.manifest.get("fitted_revision", 1))
+            columns = entry.pop("columns", None)
+            if columns is not None:
+                if not self.manifest.get("columns"):
+                    self.manifest["columns"] = columns
+                elif columns != self.manifest["columns"]:
+                    entry["columns"] = columns  # schema differs from the dataset's
+            entries = [e for e in self.manifest["partitions"] if e["source"] != entry["source"]]
+            entries.append(entry)
+            self.manifest["partitions"] = sorted(entries, key=lambda e: e["source"])
+            self.flush()
+
+    def flush(self):
+        done = [e for e in self.manifest["partitions"] if e["status"] == "done"]
+        self.manifest["rows"] = sum(e["rows"] for e in done)
+        self.manifest["complete"] = len(done) == len(self.manifest["partitions"])
+        self.manifest["updated_at"] = pd.Timestamp.now(tz="UTC").isoformat()
+        store_json(self.object_name, self.manifest)
+
+
+def transform_partition(fitted: FittedPipeline, df: pd.DataFrame, source: Dict, object_name: str) -> Dict:
+    """Transform one partition with frozen parameters, store it and return its manifest entry"""
+    processed = fitted.transform(df)
+    upload_bytes(object_name, frame_to_parquet(processed), PARQUET_CONTENT_TYPE)
+    return {
+        "source": source["name"],
+        "etag": source.get("etag"),
+        "object": object_name,
+        "rows_in": len(df),
+        "rows": len(processed),
+        "columns": [str(c) for c in processed.columns],
+        "status": "done",
+        "completed_at": pd.Timestamp.now(tz="UTC").isoformat(),
+    }
+
+
+def prepare_partitioned(
+    prefix: str,
+    output: str,
+    pipeline_conf: Optional[Dict],
+    pattern: Optional[str] = None,
+    target_column: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    resume: bool = True,
+    workers: Optional[int] = None,
+) -> Dict:
+    """
+    Fit and transform all partitions under prefix into processed/<output>/.
+
+    Args:
+        prefix: Raw object prefix (e.g. "raw/events/")
+        output: Output dataset name
+        pipeline_conf: Pipeline config; None auto-generates one from the first partition
+        pattern: Glob on object paths relative to prefix (e.g. "2024-*.csv")
+        target_column: Column excluded from auto-generated transformations
+        columns: Input column projection
+        resume: Reuse the stored fitted pipeline and skip finished partitions
+        workers: Partitions processed concurrently (default PARTITION_WORKERS)
+
+    Returns:
+        The manifest, plus the processed / skipped / failed partitions of this run
+    """
+    workers = max(1, int(workers or settings.PARTITION_WORKERS))
+    out_prefix = output_prefix(output)
+    manifest_name = out_prefix + MANIFEST_NAME
+    fitted_name = out_prefix + FITTED_NAME
+
+    sources = list_partitions(prefix, pattern)
+    if not sources:
+        raise FileNotFoundError(f"No objects under '{prefix}'" + (f" matching '{pattern}'" if pattern else ""))
+
+    manifest = load_json(manifest_name) if resume else None
+    stored_fitted = load_json(fitted_name) if manifest is not None else None
+
+    with PartitionLoader(columns) as loader:
+        if stored_fitted is not None:
+            fitted = FittedPipeline.from_dict(stored_fitted)
+            if pipeline_conf is not None and pipeline_conf.get("steps", []) != fitted.steps:
+                raise ValueError(f"Pipeline differs from the one {output} was fitted with; re-run with resume disabled")
+            logger.info(f"Resuming {out_prefix} with stored fitted pipeline")
+        else:
+            if pipeline_conf is None:
+                from app.services.pipeline import _auto_generate_pipeline
+
+                pipeline_conf = _auto_generate_pipeline(loader.load(sources[0]["name"]), target_column=target_column)
+            fitted = fit_pipeline(pipeline_conf.get("steps", []), [s["name"] for s in sources], loader.load, workers)
+            store_json(fitted_name, fitted.to_dict())
+            manifest = None
+
+        if manifest is None:
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "output": out_prefix,
+                "format": "parquet",
+                "source": {"prefix": prefix, "pattern": pattern},
+                "fitted": fitted_name,
+                "fitted_revision": 1,
+                "target_column": target_column,
+                "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+                "columns": None,
+                "partitions": [],
+            }
+
+        finished = {
+            e["source"]: e for e in manifest["partitions"] if e["status"] == "done"
+        }
+        pending = [s for s in sources if finished.get(s["name"], {}).get("etag") != s["etag"]]
+        skipped = [s["name"] for s in sources if s not in pending]
+        writer = ManifestWriter(manifest_name, manifest)
+
+        def run(source: Dict) -> Dict:
+            object_name = part_object_name(out_prefix, source["name"], prefix)
+            try:
+                entry = transform_partition(fitted, loader.load(source["name"], release=True), source, object_name)
+                logger.info(f"Partition {source['name']} -> {object_name} ({entry['rows']} rows)")
+            except Exception as exc:
+                logger.error(f"Partition {source['name']} failed: {exc}")
+                entry = {"source": source["name"], "etag": source["etag"], "object": object_name,
+                         "status": "failed", "error": str(exc)}
+            writer.record(entry)
+            return entry
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prepare-part") as pool:
+            entries = list(pool.map(run, pending))
+        writer.flush()
+
+    logger.info(
+        f"Partitioned prepare {out_prefix}: {len(pending)} processed, {len(skipped)} skipped, "
+        f"{sum(e['status'] == 'failed' for e in entries)} failed"
+    )
+    return {
+        "manifest": writer.manifest,
+        "manifest_object": manifest_name,
+        "processed": [e["source"] for e in entries if e["status"] == "done"],
+        "skipped": skipped,
+        "failed": [{"source": e["source"], "error": e["error"]} for e in entries if e["status"] == "failed"],
+    }
+
+
+def append_partition(
+    raw_object: str,
+    output: str,
+    refit: bool = False,
+    columns: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Append one raw object to a prepared dataset as a new partition.
+
+    Only the new rows are read. They are transformed with the stored
+    fitted parameters, or, with refit, with parameters refitted by merging
+    the new rows' partial statistics into the stored ones (earlier
+    partitions are left as they are).
+
+    Args:
+        raw_object: New raw object in MinIO
+        output: Name of the prepared dataset (processed/<output>/)
+        refit: Update the fitted statistics with the new rows first
+        columns: Input column projection
+
+    Returns:
+        The manifest, the new manifest entry, and whether anything was appended / refitted
+
+    Raises:
+        FileNotFoundError: If the dataset or the raw object does not exist
+    """
+    out_prefix = output_prefix(output)
+    manifest_name = out_prefix + MANIFEST_NAME
+    manifest = load_json(manifest_name)
+    stored = load_json(manifest["fitted"]) if manifest is not None else None
+    if stored is None:
+        raise FileNotFoundError(f"No prepared dataset at {out_prefix}")
+
+    etag = get_object_etag(raw_object)
+    if etag is None:
+        raise FileNotFoundError(f"Object not found in MinIO: {raw_object}")
+    source = {"name": raw_object, "etag": etag}
+
+    for entry in manifest["partitions"]:
+        if entry["source"] == raw_object and entry["status"] == "done" and entry.get("etag") == etag:
+            logger.info(f"{raw_object} is already part of {out_prefix}")
+            return {"manifest": manifest, "manifest_object": manifest_name, "entry": entry,
+                    "appended": False, "refitted": False}
+
+    object_name = part_object_name(out_prefix, raw_object, (manifest.get("source") or {}).get("prefix") or "")
+    if any(e["object"] == object_name and e["source"] != raw_object for e in manifest["partitions"]):
+        object_name = object_name[: -len(".parquet")] + f"-{etag[:8]}.parquet"
+
+    fitted = FittedPipeline.from_dict(stored)
+    with PartitionLoader(columns, cache=False) as loader:
+        df = loader.load(raw_object)
+
+    stateful = [i for i, step in enumerate(fitted.steps) if is_stateful(step)]
+    refitted = bool(refit and stateful)
+    if refitted:
+        revision = manifest.get("fitted_revision", 1)
+        store_json(archived_fitted_name(out_prefix, revision), stored)
+        fitted.refit(fitted.partial_states(df, stateful))
+        store_json(manifest["fitted"], fitted.to_dict())
+        manifest["fitted_revision"] = revision + 1
+        logger.info(f"Refitted {out_prefix} with {len(df)} new rows (revision {revision + 1})")
+
+    entry = transform_partition(fitted, df, source, object_name)
+    entry["appended"] = True
+    writer = ManifestWriter(manifest_name, manifest)
+    writer.record(entry)
+    logger.info(f"Appended {raw_object} -> {object_name} ({entry['rows']} rows)")
+    return {"manifest": writer.manifest, "manifest_object": manifest_name, "entry": entry,
+            "appended": True, "refitted": refitted}
@@ -2,9 +2,24 @@
 import pandas as pd
 from typing import Dict, List, Optional
 from app.core.logger import logger
-
-
-def run_pipeline(df: pd.DataFrame, pipeline_conf: Optional[Dict] = None, target_column: Optional[str] = None) -> pd.DataFrame:
+from app.core.config import settings
+from app.services.quantile_sketch import sketch_series
+from app.services.column_parallel import map_columns, assign_columns
+from app.services.date_features import date_features
+from app.services.dedup import deduplicate
+from app.services.feature_reduction import reduce_features
+from app.services.sampling import sample_step
+from app.services.text_vectorizer import vectorize_text
+from app.services.validator import DataValidationError, validate_step
+
+
+def run_pipeline(
+    df: pd.DataFrame,
+    pipeline_conf: Optional[Dict] = None,
+    target_column: Optional[str] = None,
+    backend: Optional[str] = None,
+    report: Optional[List[Dict]] = None,
+) -> pd.DataFrame:
     """
     Execute data preparation pipeline on DataFrame
 
@@ -13,10 +28,15 @@ def run_pipeline(df: pd.DataFrame, pipeline_conf: Optional[Dict] = None, target_
         pipeline_conf: Pipeline configuration dict with 'steps' key.
                       If None, auto-generates a basic pipeline.
         target_column: Name of target column to exclude from transformations
+        backend: Execution backend ('pandas' or 'polars'). Falls back to the
+                 config's 'backend' key, then to PIPELINE_BACKEND.
+        report: Optional list that receives one entry per executed step with
+                rows_in / rows_out / rows_removed (e.g. duplicates dropped)
 
     Returns:
         Processed DataFrame
     """
+    from app.services.backends import get_backend
 
     if df.empty:
         raise ValueError("Input DataFrame is empty")
@@ -32,29 +52,62 @@ def run_pipeline(df: pd.DataFrame, pipeline_conf: Optional[Dict] = None, target_
     if not isinstance(pipeline_conf, dict) or 'steps' not in pipeline_conf:
         raise ValueError("Pipeline config must be a dict with 'steps' key")
 
-    # Execute each step
+    engine = get_backend(backend or pipeline_conf.get('backend') or settings.PIPELINE_BACKEND)
+    processed = engine.execute(df, pipeline_conf.get('steps', []), report=report)
+
+    logger.info(f"Pipeline complete ({engine.name}): {len(processed)} rows, {len(processed.columns)} columns")
+    return processed
+
+
+def execute_steps(
+    df: pd.DataFrame,
+    steps: List[Dict],
+    offset: int = 0,
+    report: Optional[List[Dict]] = None,
+) -> pd.DataFrame:
+    """
+    Run steps eagerly on pandas (the reference engine).
+
+    Args:
+        df: Input DataFrame (copied, never modified)
+        steps: Step dicts from the pipeline config
+        offset: Index of the first step within the full pipeline (for logging)
+        report: Optional list to append per-step row counts to. Handlers
+                may return (frame, details); details are added to the entry.
+    """
     processed = df.copy()
 
-    for i, step in enumerate(pipeline_conf.get('steps', [])):
+    for i, step in enumerate(steps, start=offset):
         step_type = step.get('type')
         logger.info(f"Executing step {i + 1}: {step_type}")
 
         try:
-            if step_type == 'drop_columns':
-                processed = _drop_columns(processed, step)
-            elif step_type == 'handle_missing':
-                processed = _handle_missing(processed, step)
-            elif step_type == 'encode_categorical':
-                processed = _encode_categorical(processed, step)
-            elif step_type == 'scale_numeric':
-                processed = _scale_numeric(processed, step)
-            elif step_type == 'parse_dates':
-                processed = _parse_dates(processed, step)
-            else:
+            handler = STEP_HANDLERS.get(step_type)
+            if handler is None:
                 logger.warning(f"Unknown step type: {step_type}, skipping")
+            else:
+                rows_in = len(processed)
+                processed = handler(processed, step)
+                details = None
+                if isinstance(processed, tuple):
+                    processed, details = processed
+                if report is not None:
+                    entry = {
+                        "step": i + 1,
+                        "type": step_type,
+                        "rows_in": rows_in,
+                        "rows_out": len(processed),
+                        "rows_removed": rows_in - len(processed),
+                    }
+                    if details is not None:
+                        entry["details"] = details
+                    report.append(entry)
 
             logger.info(f"After step {i + 1}: {len(processed)} rows, {len(processed.columns)} columns")
 
+        except DataValidationError:
+            # Carries the validation report; stop before later steps run
+            raise
         except KeyError as e:
             # Column not found - check if it was already dropped
             missing_col = str(e).strip("'")
@@ -67,7 +120,6 @@ def run_pipeline(df: pd.DataFrame, pipeline_conf: Optional[Dict] = None, target_
             logger.error(f"Error in step {i + 1} ({step_type}): {e}")
             raise ValueError(f"Pipeline step {i + 1} failed: {str(e)}") from e
 
-    logger.info(f"Pipeline complete: {len(processed)} rows, {len(processed.columns)} columns")
     return processed
 
 
@@ -122,19 +174,15 @@ def _handle_missing(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
         df = df.dropna(subset=target_cols)
     elif method == 'fill_mean':
         logger.info(f"Filling missing values with mean")
-        for col in target_cols:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                df[col] = df[col].fillna(df[col].mean())
+        numeric_cols = [col for col in target_cols if pd.api.types.is_numeric_dtype(df[col])]
+        df = assign_columns(df, map_columns(_fill_mean, df, numeric_cols, step))
     elif method == 'fill_median':
-        logger.info(f"Filling missing values with median")
-        for col in target_cols:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                df[col] = df[col].fillna(df[col].median())
+        logger.info(f"Filling missing values with median (quantile sketch)")
+        numeric_cols = [col for col in target_cols if pd.api.types.is_numeric_dtype(df[col])]
+        df = assign_columns(df, map_columns(_fill_median, df, numeric_cols, step, step))
     elif method == 'fill_mode':
         logger.info(f"Filling missing values with mode")
-        for col in target_cols:
-            if not df[col].mode().empty:
-                df[col] = df[col].fillna(df[col].mode()[0])
+        df = assign_columns(df, map_columns(_fill_mode, df, target_cols, step))
     else:
         logger.warning(f"Unknown missing value method: {method}")
 
@@ -159,8 +207,7 @@ def _encode_categorical(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
 
     if method == 'label':
         logger.info(f"Label encoding {len(existing_cols)} columns")
-        for col in existing_cols:
-            df[col] = pd.Categorical(df[col]).codes
+        df = assign_columns(df, map_columns(_label_codes, df, existing_cols, step))
     elif method == 'onehot':
         logger.info(f"One-hot encoding {len(existing_cols)} columns")
         df = pd.get_dummies(df, columns=existing_cols, prefix=existing_cols)
@@ -186,32 +233,17 @@ def _scale_numeric(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
         logger.info("No numeric columns to scale")
         return df
 
+    numeric_cols = [col for col in existing_cols if pd.api.types.is_numeric_dtype(df[col])]
+
     if method == 'standard':
         logger.info(f"Standard scaling {len(existing_cols)} columns")
-        for col in existing_cols:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                mean = df[col].mean()
-                std = df[col].std()
-                if std > 0:
-                    df[col] = (df[col] - mean) / std
+        df = assign_columns(df, map_columns(_standard_scale, df, numeric_cols, step))
     elif method == 'minmax':
         logger.info(f"MinMax scaling {len(existing_cols)} columns")
-        for col in existing_cols:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                min_val = df[col].min()
-                max_val = df[col].max()
-                if max_val > min_val:
-                    df[col] = (df[col] - min_val) / (max_val - min_val)
+        df = assign_columns(df, map_columns(_minmax_scale, df, numeric_cols, step))
     elif method == 'robust':
-        logger.info(f"Robust scaling {len(existing_cols)} columns")
-        for col in existing_cols:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                median = df[col].median()
-                q75 = df[col].quantile(0.75)
-                q25 = df[col].quantile(0.25)
-                iqr = q75 - q25
-                if iqr > 0:
-                    df[col] = (df[col] - median) / iqr
+        logger.info(f"Robust scaling {len(existing_cols)} columns (quantile sketch)")
+        df = assign_columns(df, map_columns(_robust_scale, df, numeric_cols, step, step))
     else:
         logger.warning(f"Unknown scaling method: {method}")
 
@@ -234,10 +266,109 @@ def _parse_dates(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
         return df
 
     logger.info(f"Parsing {len(existing_cols)} date columns")
-    for col in existing_cols:
-        try:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
-        except Exception as e:
-            logger.warning(f"Failed to parse date column {col}: {e}")
+    df = assign_columns(df, map_columns(_to_datetime, df, existing_cols, step))
+
+    return df
+
+
+def _date_features(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
+    """Derive calendar, cyclical and epoch features from date columns (see date_features.py)"""
+    return date_features(df, step)
+
+
+def _deduplicate(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
+    """Drop duplicate rows using 64-bit row hashes (see dedup.py)"""
+    return deduplicate(df, step)
+
+
+def _sample(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
+    """Down-sample rows, optionally stratified (see sampling.py)"""
+    return sample_step(df, step)
+
+
+def _validate(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
+    """Run data-quality checks; fails the pipeline early (see validator.py)"""
+    return validate_step(df, step)
+
+
+def _reduce_features(df: pd.DataFrame, step: Dict):
+    """Drop constant, duplicate and correlated columns (see feature_reduction.py)"""
+    return reduce_features(df, step)
+
+
+def _vectorize_text(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
+    """Hash text columns into fixed-width sparse features (see text_vectorizer.py)"""
+    return vectorize_text(df, step)
+
+
+# Step type -> pandas implementation. Backends without a native
+# translation for a step fall back to these handlers.
+STEP_HANDLERS = {
+    'drop_columns': _drop_columns,
+    'handle_missing': _handle_missing,
+    'encode_categorical': _encode_categorical,
+    'scale_numeric': _scale_numeric,
+    'parse_dates': _parse_dates,
+    'date_features': _date_features,
+    'deduplicate': _deduplicate,
+    'sample': _sample,
+    'validate': _validate,
+    'reduce_features': _reduce_features,
+    'vectorize_text': _vectorize_text,
+}
+
+
+# --------------------------------------------------------------------
+# Per-column transforms. These are top-level functions so that
+# map_columns can ship them to a process pool.
+# --------------------------------------------------------------------
+
+def _fill_mean(series: pd.Series) -> pd.Series:
+    return series.fillna(series.mean())
+
+
+def _fill_median(series: pd.Series, step: Dict) -> pd.Series:
+    return series.fillna(sketch_series(series, step).quantile(0.5))
+
+
+def _fill_mode(series: pd.Series) -> pd.Series:
+    mode = series.mode()
+    if mode.empty:
+        return series
+    return series.fillna(mode[0])
+
+
+def _label_codes(series: pd.Series) -> pd.Series:
+    return pd.Series(pd.Categorical(series).codes, index=series.index, name=series.name)
+
+
+def _standard_scale(series: pd.Series) -> pd.Series:
+    mean = series.mean()
+    std = series.std()
+    if std > 0:
+        return (series - mean) / std
+    return series
+
+
+def _minmax_scale(series: pd.Series) -> pd.Series:
+    min_val = series.min()
+    max_val = series.max()
+    if max_val > min_val:
+        return (series - min_val) / (max_val - min_val)
+    return series
+
+
+def _robust_scale(series: pd.Series, step: Dict) -> pd.Series:
+    q25, median, q75 = sketch_series(series, step).quantiles([0.25, 0.5, 0.75])
+    iqr = q75 - q25
+    if iqr > 0:
+        return (series - median) / iqr
+    return series
+
 
-    return df
\ No newline at end of file
+def _to_datetime(series: pd.Series) -> pd.Series:
+    try:
+        return pd.to_datetime(series, errors='coerce')
+    except Exception as e:
+        logger.warning(f"Failed to parse date column {series.name}: {e}")
+        return series
\ No newline at end of file
@@ -5,7 +5,7 @@
 # Logic:
 #  - Drop identifier-like columns (UUIDs / very high uniqueness).
 #  - Convert detected date columns into numeric features (year, month, weekday).
-#  - Impute numerical columns with median, categorical with most frequent.
+#  - Impute numerical columns with (sketched) median, categorical with most frequent.
 #  - Scale numeric columns (StandardScaler) when requested or by default if numeric present.
 #  - One-hot encode categorical columns with limited cardinality (<= 50 unique values).
 #
@@ -17,6 +17,10 @@ from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler
 from typing import Dict, List
 from app.core.logger import logger
+from app.services.date_features import date_features
+from app.services.quantile_sketch import sketch_series
+
+AUTO_DATE_FEATURES = ["year", "month", "day", "weekday"]
 
 def _safe_get(cols_list, df):
     return [c for c in (cols_list or []) if c in df.columns]
@@ -30,6 +34,7 @@ def run_pipeline_auto(df: pd.DataFrame, pipeline_cfg: Dict) -> pd.DataFrame:
         - numeric_columns: list[str]
         - categorical_columns: list[str]
         - impute (bool) optional
+        - sketch (dict) optional: 'sketch_k' or 'quantile_error' for median sketches
         - scaling (str) optional: 'standard' or None
         - onehot (bool) optional
     """
@@ -45,20 +50,13 @@ def run_pipeline_auto(df: pd.DataFrame, pipeline_cfg: Dict) -> pd.DataFrame:
     logger.info(f"PipelineAuto: drop ids {id_cols}")
     df = df.drop(columns=id_cols, errors="ignore")
 
-    # 1. Date extraction
-    for col in date_cols:
-        if col not in df.columns:
-            continue
+    # 1. Date extraction: all columns parsed once and their features
+    # joined in one concat (original columns are dropped)
+    if date_cols:
         try:
-            parsed = pd.to_datetime(df[col], errors="coerce", utc=False)
-            df[f"{col}_year"] = parsed.dt.year
-            df[f"{col}_month"] = parsed.dt.month
-            df[f"{col}_day"] = parsed.dt.day
-            df[f"{col}_weekday"] = parsed.dt.weekday
-            # After extracting features we drop original column
-            df = df.drop(columns=[col])
+            df = date_features(df, {"columns": date_cols, "features": AUTO_DATE_FEATURES})
         except Exception as exc:
-            logger.warning(f"Date parse failed for {col}: {exc}")
+            logger.warning(f"Date feature extraction failed for {date_cols}: {exc}")
 
     # Refresh numeric/categorical columns after date extraction/drop
     numeric_cols = [c for c in numeric_cols if c in df.columns]
@@ -66,11 +64,12 @@ def run_pipeline_auto(df: pd.DataFrame, pipeline_cfg: Dict) -> pd.DataFrame:
 
     # 2. Imputation
     if pipeline_cfg.get("impute", True):
-        # Numeric imputation: median
+        # Numeric imputation: median from a mergeable quantile sketch
         if numeric_cols:
             try:
-                num_imputer = SimpleImputer(strategy="median")
-                df[numeric_cols] = num_imputer.fit_transform(df[numeric_cols])
+                sketch_cfg = pipeline_cfg.get("sketch", {})
+                medians = {c: sketch_series(df[c], sketch_cfg).quantile(0.5) for c in numeric_cols}
+                df[numeric_cols] = df[numeric_cols].fillna(medians)
             except Exception as exc:
                 logger.warning(f"Numeric imputation warning: {exc}")
 
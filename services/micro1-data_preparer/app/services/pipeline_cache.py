@@ -0,0 +1,123 @@
+# app/services/pipeline_cache.py
+# --------------------------------------------------------------------
+# In-process cache of parsed, validated pipeline YAML configs.
+#
+# Entries are keyed by object path and carry the ETag they were parsed
+# from. Within PIPELINE_CACHE_TTL an entry is served without touching
+# MinIO; after that a cheap stat (HEAD) revalidates the ETag and the
+# YAML is only downloaded and parsed again when it changed.
+#
+# Missing objects (e.g. the guessed pipelines/<name>.yml) are cached as
+# negative entries for PIPELINE_CACHE_NEGATIVE_TTL so repeated guesses
+# do not pay an error round trip. /detect writes through the cache with
+# put(), which also replaces any negative entry.
+# --------------------------------------------------------------------
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import yaml
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.validator import validate_pipeline_steps
+from app.storage.minio_client import download_bytes, get_object_etag
+
+
+@dataclass
+class _Entry:
+    config: Optional[Dict]  # None marks a negative (missing object) entry
+    etag: Optional[str]
+    checked_at: float
+
+
+class PipelineConfigCache:
+    """LRU cache of pipeline configs validated against object ETags"""
+
+    def __init__(self, ttl: float, negative_ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, required: bool = True) -> Optional[Dict]:
+        """
+        Return the parsed config stored at path.
+
+        Args:
+            path: Object path of the pipeline YAML in MinIO
+            required: Raise FileNotFoundError when missing (otherwise return None)
+
+        Raises:
+            FileNotFoundError: If the object does not exist and required=True
+            ValueError: If the YAML is not a valid step-based pipeline
+        """
+        now = time.monotonic()
+        entry = self._lookup(path)
+
+        if entry is not None:
+            ttl = self.ttl if entry.config is not None else self.negative_ttl
+            if now - entry.checked_at < ttl:
+                return self._result(path, entry.config, required)
+
+        etag = get_object_etag(path)
+        if etag is None:
+            self._store(path, _Entry(config=None, etag=None, checked_at=now))
+            return self._result(path, None, required)
+
+        if entry is not None and entry.config is not None and entry.etag == etag:
+            entry.checked_at = now
+            return self._result(path, entry.config, required)
+
+        config = validate_pipeline_steps(yaml.safe_load(download_bytes(path)))
+        self._store(path, _Entry(config=config, etag=etag, checked_at=now))
+        logger.info(f"Cached pipeline config {path} (etag {etag})")
+        return self._result(path, config, required)
+
+    def put(self, path: str, config: Dict, etag: Optional[str] = None):
+        """Record a config that was just written (write-through from /detect)"""
+        entry = _Entry(config=validate_pipeline_steps(copy.deepcopy(config)), etag=etag, checked_at=time.monotonic())
+        if etag is None:
+            # Unknown ETag: force revalidation on next read
+            entry.checked_at = float("-inf")
+        self._store(path, entry)
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop one entry, or the whole cache when path is None"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def _lookup(self, path: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                self._entries.move_to_end(path)
+            return entry
+
+    def _store(self, path: str, entry: _Entry):
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _result(path: str, config: Optional[Dict], required: bool) -> Optional[Dict]:
+        if config is None:
+            if required:
+                raise FileNotFoundError(f"Object not found in MinIO: {path}")
+            return None
+        return copy.deepcopy(config)
+
+
+pipeline_cache = PipelineConfigCache(
+    ttl=settings.PIPELINE_CACHE_TTL,
+    negative_ttl=settings.PIPELINE_CACHE_NEGATIVE_TTL,
+)
@@ -0,0 +1,199 @@
+# app/services/quantile_sketch.py
+# --------------------------------------------------------------------
+# Mergeable KLL-style quantile sketch used for median imputation and
+# robust scaling. A sketch summarises a numeric column in O(k log n)
+# memory, can be fed chunk by chunk and merged across workers, and
+# answers quantile queries with a configurable rank error.
+#
+# While a column holds no more than k values nothing is compacted, so
+# small columns get exactly the same answer as pandas' quantile().
+# --------------------------------------------------------------------
+import math
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+# Empirical constants for the single-sided normalized rank error of a
+# KLL sketch (same fit as Apache DataSketches): eps ~= 2.296 / k^0.9723
+_ERROR_SCALE = 2.296
+_ERROR_EXPONENT = 0.9723
+_CAPACITY_DECAY = 2.0 / 3.0
+_MIN_K = 8
+_DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class QuantileSketch:
+    """
+    KLL quantile sketch over float values.
+
+    Each level h holds items of weight 2^h. When a level exceeds its
+    capacity it is sorted and every other item (random offset) is
+    promoted to the next level; with an odd count, the lowest or highest
+    item (at random) stays behind. NaN values are ignored.
+    """
+
+    def __init__(self, k: Optional[int] = None, seed: Optional[int] = 0):
+        self.k = max(_MIN_K, int(k or settings.QUANTILE_SKETCH_K))
+        self.n = 0
+        self.min = math.nan
+        self.max = math.nan
+        self._levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_error(cls, rank_error: float, seed: Optional[int] = 0) -> "QuantileSketch":
+        """Create a sketch sized for the requested normalized rank error (e.g. 0.01)"""
+        if not 0 < rank_error < 1:
+            raise ValueError("rank_error must be between 0 and 1")
+        k = math.ceil((_ERROR_SCALE / rank_error) ** (1.0 / _ERROR_EXPONENT))
+        return cls(k=k, seed=seed)
+
+    @property
+    def rank_error(self) -> float:
+        """Normalized rank error bound; 0.0 while the sketch is still exact"""
+        if self.is_exact:
+            return 0.0
+        return _ERROR_SCALE / (self.k ** _ERROR_EXPONENT)
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self._levels) == 1
+
+    def update(self, values: Iterable[float], chunk_size: int = _DEFAULT_CHUNK_SIZE) -> "QuantileSketch":
+        """Add values to the sketch, compacting every chunk_size items"""
+        arr = np.asarray(values, dtype=np.float64).ravel()
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return self
+
+        self.n += int(arr.size)
+        self.min = float(np.nanmin([self.min, arr.min()]))
+        self.max = float(np.nanmax([self.max, arr.max()]))
+
+        for start in range(0, arr.size, chunk_size):
+            chunk = arr[start:start + chunk_size]
+            self._levels[0] = np.concatenate([self._levels[0], chunk])
+            self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Merge another sketch into this one (in place) and return self"""
+        if other.n == 0:
+            return self
+        self.k = min(self.k, other.k)
+        self.n += other.n
+        self.min = float(np.nanmin([self.min, other.min]))
+        self.max = float(np.nanmax([self.max, other.max]))
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0, dtype=np.float64))
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Return the approximate q-quantile (0 <= q <= 1), NaN when empty"""
+        return float(self.quantiles([q])[0])
+
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        """Vectorized quantile query using linear interpolation between ranks"""
+        qs = np.clip(np.asarray(list(qs), dtype=np.float64), 0.0, 1.0)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+
+        if self.is_exact:
+            # Same definition as pandas/numpy 'linear' interpolation
+            return np.quantile(self._levels[0], qs)
+
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([
+            np.full(level.size, 2.0 ** h) for h, level in enumerate(self._levels)
+        ])
+        order = np.argsort(items, kind="mergesort")
+        items = items[order]
+        # Rank of each retained item at the centre of the weight it represents
+        cum = np.cumsum(weights[order])
+        centres = (cum - weights[order] / 2.0) / cum[-1]
+        result = np.interp(qs, centres, items)
+        result[qs == 0.0] = self.min
+        result[qs == 1.0] = self.max
+        return result
+
+    def cdf(self, values: Iterable[float]) -> np.ndarray:
+        """Approximate fraction of items <= each of the given values"""
+        values = np.asarray(list(values), dtype=np.float64)
+        if self.n == 0:
+            return np.full(values.shape, np.nan)
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([
+            np.full(level.size, 2.0 ** h) for h, level in enumerate(self._levels)
+        ])
+        order = np.argsort(items, kind="mergesort")
+        cum = np.cumsum(weights[order])
+        idx = np.searchsorted(items[order], values, side="right")
+        return np.where(idx > 0, cum[np.maximum(idx - 1, 0)], 0.0) / cum[-1]
+
+    def to_dict(self) -> Dict:
+        """JSON-serialisable representation of the sketch"""
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": None if math.isnan(self.min) else self.min,
+            "max": None if math.isnan(self.max) else self.max,
+            "levels": [level.tolist() for level in self._levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, seed: Optional[int] = 0) -> "QuantileSketch":
+        sketch = cls(k=data["k"], seed=seed)
+        sketch.n = int(data["n"])
+        sketch.min = math.nan if data.get("min") is None else float(data["min"])
+        sketch.max = math.nan if data.get("max") is None else float(data["max"])
+        sketch._levels = [np.asarray(level, dtype=np.float64) for level in data["levels"]] or [
+            np.empty(0, dtype=np.float64)
+        ]
+        return sketch
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * _CAPACITY_DECAY ** depth)))
+
+    def _compress(self):
+        while True:
+            over = [h for h in range(len(self._levels)) if self._levels[h].size > self._capacity(h)]
+            if not over:
+                return
+            self._compact(over[0])
+
+    def _compact(self, level: int):
+        if level + 1 == len(self._levels):
+            self._levels.append(np.empty(0, dtype=np.float64))
+
+        items = np.sort(self._levels[level])
+        # An odd item out stays behind so total weight is preserved exactly;
+        # it is taken from a random end so neither tail is kept more often
+        keep = items[:0]
+        if items.size % 2:
+            if self._rng.integers(2):
+                keep, items = items[-1:], items[:-1]
+            else:
+                keep, items = items[:1], items[1:]
+        offset = int(self._rng.integers(2))
+
+        self._levels[level] = keep
+        self._levels[level + 1] = np.concatenate([self._levels[level + 1], items[offset::2]])
+
+
+def sketch_from_step(step: Dict) -> QuantileSketch:
+    """Build an empty sketch from a pipeline step's 'sketch_k' / 'quantile_error' keys"""
+    if step.get("quantile_error") is not None:
+        return QuantileSketch.from_error(float(step["quantile_error"]))
+    return QuantileSketch(k=step.get("sketch_k"))
+
+
+def sketch_series(series: pd.Series, step: Optional[Dict] = None) -> QuantileSketch:
+    """Summarise a numeric Series into a new sketch"""
+    sketch = sketch_from_step(step or {})
+    return sketch.update(pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan))
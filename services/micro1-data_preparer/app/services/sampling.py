@@ -0,0 +1,169 @@
+# app/services/sampling.py
+# --------------------------------------------------------------------
+# Deterministic (stratified) down-sampling.
+#
+# Used by the 'sample' pipeline step and by /prepare to materialize
+# samples of the processed dataset next to the full output, so model
+# selection and early trials can work on 1% / 10% / N rows.
+#
+# Stratified sampling allocates rows to strata proportionally (largest
+# remainder rounding, at least one row per stratum when the sample is
+# large enough) and picks rows with one vectorized lexsort instead of a
+# groupby().sample() per stratum. Numeric targets with many distinct
+# values are stratified by quantile bins. Row order is preserved.
+# --------------------------------------------------------------------
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+
+SampleSpec = Union[float, int]
+
+
+def parse_sample_specs(value: Optional[str]) -> List[SampleSpec]:
+    """
+    Parse a comma-separated list of sample sizes.
+
+    Values below 1 are fractions ("0.01" = 1%), integers are row counts.
+
+    Raises:
+        ValueError: If a value is not a positive fraction or row count
+    """
+    if not value:
+        return []
+    specs = []
+    for raw in value.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            number = float(raw)
+        except ValueError:
+            raise ValueError(f"Invalid sample size '{raw}'")
+        if 0 < number < 1:
+            specs.append(number)
+        elif number >= 1 and number.is_integer():
+            specs.append(int(number))
+        else:
+            raise ValueError(f"Invalid sample size '{raw}': use a fraction in (0, 1) or a row count")
+    return specs
+
+
+def sample_label(spec: SampleSpec) -> str:
+    """Short name for a sample size, used in object names ('1pct', '5000rows')"""
+    if isinstance(spec, int):
+        return f"{spec}rows"
+    return f"{spec * 100:g}pct".replace(".", "_")
+
+
+def strata_codes(series: pd.Series, bins: int = 10) -> np.ndarray:
+    """Integer stratum per row; numeric columns with many values are binned by quantile"""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series) \
+            and series.nunique(dropna=True) > bins:
+        binned = pd.qcut(series.rank(method="first"), bins, labels=False)
+        return binned.fillna(-1).to_numpy(dtype=np.int64) + 1
+    return pd.factorize(series, use_na_sentinel=False)[0].astype(np.int64)
+
+
+def _allocate(counts: np.ndarray, k: int) -> np.ndarray:
+    """Split k rows across strata proportionally to counts (largest remainder)"""
+    alloc = np.zeros(len(counts), dtype=np.int64)
+    present = counts > 0
+    weights = counts.astype(float)
+
+    if k >= present.sum():
+        # Every stratum gets one row, the rest is split proportionally
+        alloc[present] = 1
+        k -= int(present.sum())
+        weights = np.maximum(counts - 1, 0).astype(float)
+
+    if k > 0 and weights.sum() > 0:
+        exact = weights * k / weights.sum()
+        base = np.floor(exact).astype(np.int64)
+        remainder = k - int(base.sum())
+        if remainder > 0:
+            base[np.argsort(-(exact - base), kind="stable")[:remainder]] += 1
+        alloc += base
+    return np.minimum(alloc, counts)
+
+
+def stratified_sample(
+    df: pd.DataFrame,
+    fraction: Optional[float] = None,
+    n: Optional[int] = None,
+    stratify: Optional[str] = None,
+    seed: Optional[int] = None,
+    bins: int = 10,
+) -> pd.DataFrame:
+    """
+    Sample rows, optionally stratified by a column.
+
+    Args:
+        df: Input DataFrame
+        fraction: Fraction of rows to keep (exclusive with n)
+        n: Number of rows to keep (exclusive with fraction)
+        stratify: Column whose distribution the sample preserves
+        seed: Random seed (default SAMPLE_SEED); same inputs give the same rows
+        bins: Quantile bins used to stratify numeric columns with many values
+
+    Returns:
+        Sampled DataFrame in the original row order
+    """
+    if (fraction is None) == (n is None):
+        raise ValueError("Provide exactly one of 'fraction' or 'n' for sampling")
+    if fraction is not None and not 0 < fraction <= 1:
+        raise ValueError(f"Sample fraction must be in (0, 1], got {fraction}")
+    if n is not None and n < 1:
+        raise ValueError(f"Sample size must be positive, got {n}")
+
+    total = len(df)
+    k = int(round(fraction * total)) if fraction is not None else int(n)
+    if k >= total:
+        return df
+
+    rng = np.random.default_rng(settings.SAMPLE_SEED if seed is None else seed)
+    keys = rng.random(total)
+
+    if stratify is None:
+        positions = np.sort(np.argpartition(keys, k)[:k]) if k > 0 else np.empty(0, dtype=np.int64)
+        return df.iloc[positions]
+
+    if stratify not in df.columns:
+        raise ValueError(f"Stratification column '{stratify}' not found")
+
+    codes = strata_codes(df[stratify], bins)
+    counts = np.bincount(codes)
+    alloc = _allocate(counts, k)
+
+    # Group rows by stratum in random order, keep the first alloc[s] of each
+    order = np.lexsort((keys, codes))
+    group_start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    sorted_codes = codes[order]
+    rank = np.arange(total) - group_start[sorted_codes]
+    positions = np.sort(order[rank < alloc[sorted_codes]])
+
+    logger.info(f"Stratified sample on '{stratify}': {len(positions)} of {total} rows from {int((counts > 0).sum())} strata")
+    return df.iloc[positions]
+
+
+def sample_step(df: pd.DataFrame, step: dict) -> pd.DataFrame:
+    """
+    'sample' pipeline step.
+
+    Step keys: fraction or n, stratify (column), seed, bins
+    """
+    stratify = step.get('stratify')
+    if stratify is not None and stratify not in df.columns:
+        logger.warning(f"Stratification column not found (sampling unstratified): {stratify}")
+        stratify = None
+    return stratified_sample(
+        df,
+        fraction=step.get('fraction'),
+        n=step.get('n'),
+        stratify=stratify,
+        seed=step.get('seed'),
+        bins=int(step.get('bins', 10)),
+    )
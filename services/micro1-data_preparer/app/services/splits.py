@@ -0,0 +1,151 @@
+# app/services/splits.py
+# --------------------------------------------------------------------
+# Deterministic train / validation / test partitions and k-fold
+# assignments, materialized at prepare time.
+#
+# /prepare stores a split index next to the processed dataset: one row
+# per processed row (same order) with its 'split' label and, when
+# requested, its cross-validation 'fold' (-1 for test rows). Trainer and
+# evaluator read the index instead of re-splitting, so every candidate
+# model is trained and scored on the same rows.
+#
+# Stratification reuses the sampling strata (class labels, or quantile
+# bins for numeric targets); rows are ordered once per stratum with a
+# seeded lexsort and cut by rank, so no frame is shuffled or copied.
+# --------------------------------------------------------------------
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.services.sampling import strata_codes
+
+SPLIT_NAMES = ("train", "val", "test")
+
+
+def parse_split_ratios(value: Optional[str]) -> Optional[List[float]]:
+    """
+    Parse "train,val,test" ratios, e.g. "0.7,0.15,0.15" or "0.8,0.2".
+
+    Two values mean train/test without a validation set. Ratios are
+    normalized to sum to 1.
+
+    Raises:
+        ValueError: If the ratios are malformed
+    """
+    if not value:
+        return None
+    try:
+        ratios = [float(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid split ratios '{value}'")
+    if len(ratios) == 2:
+        ratios = [ratios[0], 0.0, ratios[1]]
+    if len(ratios) != 3 or any(r < 0 for r in ratios) or ratios[0] <= 0 or sum(ratios) <= 0:
+        raise ValueError(f"Invalid split ratios '{value}': expected 'train,val,test' with train > 0")
+    total = sum(ratios)
+    return [r / total for r in ratios]
+
+
+def _ranked_by_stratum(n_rows: int, codes: np.ndarray, seed: int):
+    """Random order of rows grouped by stratum, plus each row's rank and stratum size"""
+    keys = np.random.default_rng(seed).random(n_rows)
+    order = np.lexsort((keys, codes))
+    counts = np.bincount(codes)
+    group_start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    sorted_codes = codes[order]
+    rank = np.arange(n_rows) - group_start[sorted_codes]
+    return order, rank, counts[sorted_codes]
+
+
+def assign_splits(
+    df: pd.DataFrame,
+    ratios: List[float],
+    stratify: Optional[str] = None,
+    seed: Optional[int] = None,
+    bins: int = 10,
+) -> np.ndarray:
+    """
+    Assign each row to train (0), val (1) or test (2).
+
+    Args:
+        df: Processed DataFrame
+        ratios: Normalized [train, val, test] ratios
+        stratify: Column whose distribution every split preserves
+        seed: Random seed (default SPLIT_SEED)
+        bins: Quantile bins used to stratify numeric columns
+
+    Returns:
+        np.ndarray of int8 split codes aligned with df rows
+    """
+    n_rows = len(df)
+    codes = strata_codes(df[stratify], bins) if stratify else np.zeros(n_rows, dtype=np.int64)
+    order, rank, size = _ranked_by_stratum(n_rows, codes, settings.SPLIT_SEED if seed is None else seed)
+
+    # Per stratum: first test_n rows -> test, next val_n -> val, rest -> train
+    test_n = np.round(size * ratios[2]).astype(np.int64)
+    val_n = np.round(size * ratios[1]).astype(np.int64)
+    assigned = np.where(rank < test_n, 2, np.where(rank < test_n + val_n, 1, 0)).astype(np.int8)
+
+    splits = np.empty(n_rows, dtype=np.int8)
+    splits[order] = assigned
+    return splits
+
+
+def assign_folds(
+    df: pd.DataFrame,
+    n_folds: int,
+    splits: Optional[np.ndarray] = None,
+    stratify: Optional[str] = None,
+    seed: Optional[int] = None,
+    bins: int = 10,
+) -> np.ndarray:
+    """
+    Stratified k-fold assignment over the non-test rows (test rows get -1).
+
+    Returns:
+        np.ndarray of int16 fold ids aligned with df rows
+    """
+    if n_folds < 2:
+        raise ValueError(f"Number of folds must be at least 2, got {n_folds}")
+
+    n_rows = len(df)
+    eligible = np.ones(n_rows, dtype=bool) if splits is None else splits != 2
+    codes = strata_codes(df[stratify], bins) if stratify else np.zeros(n_rows, dtype=np.int64)
+    # Test rows form their own group so they do not shift fold balance
+    codes = np.where(eligible, codes + 1, 0)
+    base_seed = settings.SPLIT_SEED if seed is None else seed
+    order, rank, _ = _ranked_by_stratum(n_rows, codes, base_seed + 1)
+
+    folds = np.empty(n_rows, dtype=np.int16)
+    folds[order] = rank % n_folds
+    folds[~eligible] = -1
+    return folds
+
+
+def build_split_index(
+    df: pd.DataFrame,
+    ratios: List[float],
+    n_folds: Optional[int] = None,
+    stratify: Optional[str] = None,
+    seed: Optional[int] = None,
+) -> pd.DataFrame:
+    """Split index frame: 'row', 'split' and (optionally) 'fold' per processed row"""
+    if stratify is not None and stratify not in df.columns:
+        raise ValueError(f"Stratification column '{stratify}' not found")
+
+    splits = assign_splits(df, ratios, stratify=stratify, seed=seed)
+    index = pd.DataFrame({
+        "row": np.arange(len(df), dtype=np.int64),
+        "split": pd.Categorical.from_codes(splits, categories=list(SPLIT_NAMES)),
+    })
+    if n_folds:
+        index["fold"] = assign_folds(df, n_folds, splits, stratify=stratify, seed=seed)
+    return index
+
+
+def split_counts(index: pd.DataFrame) -> Dict[str, int]:
+    """Rows per split"""
+    counts = index["split"].value_counts()
+    return {name: int(counts.get(name, 0)) for name in SPLIT_NAMES}
@@ -0,0 +1,117 @@
+# app/services/spool.py
+# --------------------------------------------------------------------
+# Disk spooling for uploads and stored objects.
+#
+# Instead of holding a whole upload in memory (await file.read()), the
+# content is streamed to a temporary file in SPOOL_CHUNK_SIZE chunks.
+# The SHA-256 digest is computed and the format sniffed while streaming,
+# so an unsupported file is rejected after its first chunk. Parsing then
+# starts from the spooled file (memory-mapped when enabled), keeping
+# peak memory at the parser's working set instead of upload + copy.
+# --------------------------------------------------------------------
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import pandas as pd
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.ingest import SNIFF_BYTES, DatasetFormat, read_dataset, sniff_format
+
+
+@dataclass
+class SpooledFile:
+    """A dataset spooled to local disk; delete it with close()"""
+    path: str
+    filename: str
+    size: int = 0
+    sha256: str = ""
+    format: Optional[DatasetFormat] = None
+    _closed: bool = field(default=False, repr=False)
+
+    def read(self, columns=None) -> pd.DataFrame:
+        """Parse the spooled file according to its sniffed format"""
+        return read_dataset(self.path, self.format, columns=columns, memory_map=settings.SPOOL_MEMORY_MAP)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _SpoolWriter:
+    """Incrementally writes chunks to disk while hashing and sniffing"""
+
+    def __init__(self, filename: str):
+        os.makedirs(settings.SPOOL_DIR, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=settings.SPOOL_DIR, prefix="spool-")
+        self._out = os.fdopen(fd, "wb")
+        self._hasher = hashlib.sha256()
+        self._head = b""
+        self.spooled = SpooledFile(path=path, filename=filename)
+
+    def write(self, chunk: bytes):
+        if self.spooled.format is None and len(self._head) < SNIFF_BYTES:
+            self._head += chunk[:SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= SNIFF_BYTES:
+                self.spooled.format = sniff_format(self._head, self.spooled.filename)
+        self._hasher.update(chunk)
+        self._out.write(chunk)
+        self.spooled.size += len(chunk)
+
+    def finish(self) -> SpooledFile:
+        self._out.close()
+        if self.spooled.format is None and self.spooled.size > 0:
+            self.spooled.format = sniff_format(self._head, self.spooled.filename)
+        self.spooled.sha256 = self._hasher.hexdigest()
+        logger.info(f"Spooled {self.spooled.filename} to {self.spooled.path} ({self.spooled.size} bytes)")
+        return self.spooled
+
+    def abort(self):
+        self._out.close()
+        self.spooled.close()
+
+
+async def spool_upload(file: UploadFile, chunk_size: Optional[int] = None) -> SpooledFile:
+    """
+    Stream an UploadFile to disk.
+
+    Raises:
+        UnsupportedFormatError: As soon as the leading bytes are known to be unsupported
+    """
+    writer = _SpoolWriter(file.filename)
+    try:
+        while True:
+            chunk = await file.read(chunk_size or settings.SPOOL_CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def spool_chunks(chunks: Iterable[bytes], filename: str) -> SpooledFile:
+    """Stream an iterable of byte chunks (e.g. a MinIO object) to disk"""
+    writer = _SpoolWriter(filename)
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
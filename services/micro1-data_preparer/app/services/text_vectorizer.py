@@ -0,0 +1,207 @@
+# app/services/text_vectorizer.py
+# --------------------------------------------------------------------
+# 'vectorize_text' step: hashing vectorizer for free-text columns.
+#
+# Text is tokenized (regex, optional lowercasing and word n-grams) and
+# every token is hashed straight to one of n_features columns, so no
+# vocabulary is built and the output width is fixed whatever the data.
+# Rows are processed in chunks of chunk_rows; only the non-zero
+# (row, column, value) triplets are kept, so memory grows with the
+# number of tokens, not with the number of distinct strings.
+#
+# Hashes come from pd.util.hash_array with its fixed key, so the same
+# token maps to the same column in every process, partition and run.
+# With alternate_sign a second hash bit picks the sign (collisions then
+# cancel out on average, as in scikit-learn's HashingVectorizer).
+#
+# The features are returned as pandas sparse columns
+# (Sparse[float32, 0]) named "<column>__h<index>"; df.sparse.to_coo()
+# turns them into a scipy matrix for model training.
+#
+# Step config:
+#   - type: vectorize_text
+#     columns: [description]
+#     n_features: 1024          # default TEXT_HASH_FEATURES
+#     ngram_range: [1, 2]       # default [1, 1]
+#     lowercase: true
+#     token_pattern: "(?u)\\b\\w\\w+\\b"
+#     alternate_sign: true
+#     binary: false             # 1.0 for present tokens instead of counts
+#     norm: l2                  # l2 | l1 | null (per row)
+#     drop: true                # drop the original text columns
+#     chunk_rows: 50000         # default TEXT_CHUNK_ROWS
+# --------------------------------------------------------------------
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+_SIGN_SHIFT = np.uint64(63)
+
+
+def tokenize(texts: pd.Series, token_pattern: str = DEFAULT_TOKEN_PATTERN, lowercase: bool = True,
+             ngram_range: Tuple[int, int] = (1, 1)) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tokens of a chunk of texts as flat arrays.
+
+    Returns:
+        (positions, tokens): row position within the chunk and token of every occurrence
+    """
+    texts = texts.astype("string").fillna("")
+    if lowercase:
+        texts = texts.str.lower()
+    words = texts.str.findall(token_pattern)
+
+    lengths = words.str.len().fillna(0).to_numpy(dtype=np.int64)
+    positions = np.repeat(np.arange(len(words), dtype=np.int64), lengths)
+    tokens = np.fromiter((w for row in words for w in row), dtype=object, count=int(lengths.sum()))
+
+    low, high = ngram_range
+    out_positions: List[np.ndarray] = []
+    out_tokens: List[np.ndarray] = []
+    for n in range(max(low, 1), high + 1):
+        count = tokens.size - n + 1
+        if count <= 0:
+            break
+        if n == 1:
+            grams, starts = tokens, positions
+        else:
+            # Consecutive words of one row are contiguous: gram k spans words k..k+n-1
+            same_row = positions[:count] == positions[n - 1:]
+            grams = tokens[:count].copy()
+            for m in range(1, n):
+                grams = grams + " " + tokens[m:m + count]
+            grams, starts = grams[same_row], positions[:count][same_row]
+        out_positions.append(starts)
+        out_tokens.append(grams)
+
+    if not out_tokens:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=object)
+    return np.concatenate(out_positions), np.concatenate(out_tokens)
+
+
+def hash_tokens(tokens: np.ndarray, n_features: int, alternate_sign: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Column index and sign (+1 / -1) of every token"""
+    hashes = pd.util.hash_array(tokens, categorize=False)
+    columns = (hashes % np.uint64(n_features)).astype(np.int32)
+    if alternate_sign:
+        signs = np.where((hashes >> _SIGN_SHIFT) == 1, -1.0, 1.0).astype(np.float32)
+    else:
+        signs = np.ones(tokens.size, dtype=np.float32)
+    return columns, signs
+
+
+def hash_chunk(texts: pd.Series, step: Dict, n_features: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Hashed term counts of a chunk of texts as COO triplets.
+
+    Returns:
+        (rows, columns, values) with one entry per non-zero cell, sorted by row then column
+    """
+    ngram_range = tuple(step.get("ngram_range") or (1, 1))
+    positions, tokens = tokenize(
+        texts,
+        token_pattern=step.get("token_pattern") or DEFAULT_TOKEN_PATTERN,
+        lowercase=step.get("lowercase", True),
+        ngram_range=ngram_range,
+    )
+    if tokens.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+    columns, signs = hash_tokens(tokens, n_features, step.get("alternate_sign", True))
+    cells, inverse = np.unique(positions * n_features + columns, return_inverse=True)
+    values = np.bincount(inverse, weights=signs).astype(np.float32)
+    if step.get("binary", False):
+        values = np.sign(values)
+    rows = cells // n_features
+    cols = (cells % n_features).astype(np.int32)
+
+    norm = step.get("norm", "l2")
+    if norm in ("l1", "l2"):
+        weights = np.abs(values) if norm == "l1" else values * values
+        totals = np.bincount(rows, weights=weights, minlength=len(texts))
+        totals = totals if norm == "l1" else np.sqrt(totals)
+        values = (values / np.where(totals[rows] > 0, totals[rows], 1.0)).astype(np.float32)
+    elif norm is not None:
+        raise ValueError(f"Unknown norm for vectorize_text: {norm}")
+
+    keep = values != 0
+    return rows[keep], cols[keep], values[keep]
+
+
+def _sparse_frame(rows: np.ndarray, cols: np.ndarray, values: np.ndarray, n_rows: int,
+                  names: List[str], index: pd.Index) -> pd.DataFrame:
+    """Frame of Sparse[float32, 0] columns from COO triplets"""
+    try:
+        from scipy import sparse
+    except ImportError:
+        sparse = None
+
+    if sparse is not None:
+        matrix = sparse.csc_matrix((values, (rows, cols)), shape=(n_rows, len(names)), dtype=np.float32)
+        frame = pd.DataFrame.sparse.from_spmatrix(matrix, index=index, columns=names)
+        return frame.astype(pd.SparseDtype(np.float32, 0.0))
+
+    # Without scipy: one dense buffer reused per column, stored sparse
+    order = np.argsort(cols, kind="stable")
+    rows, cols, values = rows[order], cols[order], values[order]
+    bounds = np.searchsorted(cols, np.arange(len(names) + 1))
+    buffer = np.zeros(n_rows, dtype=np.float32)
+    data = {}
+    for j, name in enumerate(names):
+        lo, hi = bounds[j], bounds[j + 1]
+        buffer[rows[lo:hi]] = values[lo:hi]
+        data[name] = pd.arrays.SparseArray(buffer, fill_value=0.0)
+        buffer[rows[lo:hi]] = 0.0
+    return pd.DataFrame(data, index=index)
+
+
+def vectorize_column(series: pd.Series, step: Optional[Dict] = None) -> pd.DataFrame:
+    """Hashed features of one text column as sparse columns "<name>__h<i>\""""
+    step = step or {}
+    n_features = int(step.get("n_features") or settings.TEXT_HASH_FEATURES)
+    chunk_rows = int(step.get("chunk_rows") or settings.TEXT_CHUNK_ROWS)
+    if n_features < 1:
+        raise ValueError("n_features must be at least 1")
+
+    all_rows = [np.empty(0, dtype=np.int64)]
+    all_cols = [np.empty(0, dtype=np.int32)]
+    all_values = [np.empty(0, dtype=np.float32)]
+    for start in range(0, len(series), chunk_rows):
+        rows, cols, values = hash_chunk(series.iloc[start:start + chunk_rows], step, n_features)
+        all_rows.append(rows + start)
+        all_cols.append(cols)
+        all_values.append(values)
+
+    width = len(str(n_features - 1))
+    names = [f"{series.name}__h{i:0{width}d}" for i in range(n_features)]
+    rows, cols, values = np.concatenate(all_rows), np.concatenate(all_cols), np.concatenate(all_values)
+    logger.info(f"Hashed text column {series.name}: {len(series)} rows -> {n_features} features, {values.size} non-zeros")
+    return _sparse_frame(rows, cols, values, len(series), names, series.index)
+
+
+def densify_sparse(df: pd.DataFrame) -> pd.DataFrame:
+    """Sparse columns as plain dense columns (for formats without a sparse type)"""
+    sparse = {col: dtype.subtype for col, dtype in df.dtypes.items() if isinstance(dtype, pd.SparseDtype)}
+    return df.astype(sparse) if sparse else df
+
+
+def vectorize_text(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
+    """Replace text columns with fixed-width hashed sparse features"""
+    columns = [col for col in step.get("columns", []) if col in df.columns]
+    missing = [col for col in step.get("columns", []) if col not in df.columns]
+    if missing:
+        logger.warning(f"Text columns not found (skipping): {missing}")
+    if not columns:
+        logger.info("No text columns to vectorize")
+        return df
+
+    features = [vectorize_column(df[col], step) for col in columns]
+    base = df.drop(columns=columns) if step.get("drop", True) else df
+    # One concatenation for all feature blocks
+    return pd.concat([base, *features], axis=1)
@@ -1,9 +1,210 @@
 # app/services/validator.py
 # --------------------------------------------------------------------
-# Validates PipelineSchema config.
+# Validates PipelineSchema config and step-based pipeline YAML, and
+# runs declarative data-quality checks on DataFrames.
+#
+# Data-quality rules (the 'validate' pipeline step):
+#
+#   - type: validate
+#     row_count: {min: 1000, max: 100000000}
+#     unique: [user_id, ts]              # combined key
+#     columns:
+#       age:     {max_null_ratio: 0.05, min: 0, max: 120}
+#       country: {allowed: [FR, MA, US]}
+#       email:   {regex: '[^@]+@[^@]+', max_null_ratio: 0}
+#       id:      {unique: true}
+#     sample_rows: 1000000               # default VALIDATION_SAMPLE_ROWS
+#     fail_fast: true                    # false = log failures and continue
+#
+# Row counts, null ratios, ranges and uniqueness are exact (cheap vectorized
+# reductions; uniqueness compares 64-bit row hashes). Allowed-set and regex
+# checks, which touch every string, run on a seeded sample when the frame
+# has more than sample_rows rows; their report entries say so.
 # --------------------------------------------------------------------
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.dedup import hash_rows
+
+# Failing values listed per check in the report
+MAX_EXAMPLES = 5
+
+
+class DataValidationError(ValueError):
+    """Raised when a DataFrame fails its data-quality rules"""
+
+    def __init__(self, report: Dict):
+        failed = [c for c in report["checks"] if not c["passed"]]
+        summary = ", ".join(f"{c['column'] or 'table'}.{c['check']}" for c in failed[:MAX_EXAMPLES])
+        super().__init__(f"Data validation failed ({len(failed)} checks): {summary}")
+        self.report = report
+
 
 def validate_pipeline_config(cfg: dict):
     if cfg.get("scaling") not in [None, "standard", "minmax"]:
         raise ValueError("Invalid scaling method")
     return True
+
+
+def validate_pipeline_steps(cfg) -> dict:
+    """Validate a step-based pipeline config (as stored in pipelines/*.yml)"""
+    if not isinstance(cfg, dict) or not isinstance(cfg.get("steps"), list):
+        raise ValueError("Pipeline config must be a dict with a 'steps' list")
+    for i, step in enumerate(cfg["steps"]):
+        if not isinstance(step, dict) or not isinstance(step.get("type"), str):
+            raise ValueError(f"Pipeline step {i + 1} must be a mapping with a 'type'")
+    return cfg
+
+
+def _py(value: Any) -> Any:
+    """Make numpy scalars JSON-serializable"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _check(column: Optional[str], check: str, passed: bool, expected: Any, observed: Any,
+           failing_rows: int = 0, sampled: bool = False, examples: Optional[List] = None) -> Dict:
+    entry = {
+        "column": column,
+        "check": check,
+        "passed": bool(passed),
+        "expected": expected,
+        "observed": _py(observed),
+        "failing_rows": int(failing_rows),
+        "sampled": sampled,
+    }
+    if examples:
+        entry["examples"] = [_py(v) for v in examples[:MAX_EXAMPLES]]
+    return entry
+
+
+def _duplicate_rows(df: pd.DataFrame, columns: List[str]) -> int:
+    hashes = pd.Series(hash_rows(df, columns))
+    return int(hashes.duplicated(keep=False).sum())
+
+
+def _column_checks(full: pd.Series, sample: pd.Series, is_sampled: bool, rule: Dict) -> List[Dict]:
+    name = full.name
+    checks = []
+
+    if "max_null_ratio" in rule:
+        ratio = float(full.isna().mean()) if len(full) else 0.0
+        checks.append(_check(
+            name, "max_null_ratio", ratio <= rule["max_null_ratio"], rule["max_null_ratio"],
+            round(ratio, 6), failing_rows=full.isna().sum()
+        ))
+
+    if "min" in rule or "max" in rule:
+        if not pd.api.types.is_numeric_dtype(full) or pd.api.types.is_bool_dtype(full):
+            checks.append(_check(name, "range", False, "numeric column", str(full.dtype)))
+        else:
+            values = full.to_numpy(dtype=float, na_value=np.nan)
+            bad = np.zeros(len(values), dtype=bool)
+            if "min" in rule:
+                bad |= values < rule["min"]
+            if "max" in rule:
+                bad |= values > rule["max"]
+            observed = [_py(full.min()), _py(full.max())]
+            checks.append(_check(
+                name, "range", not bad.any(), [rule.get("min"), rule.get("max")], observed,
+                failing_rows=bad.sum(), examples=full[bad].unique().tolist()
+            ))
+
+    if "allowed" in rule:
+        values = sample.dropna()
+        bad = ~values.isin(rule["allowed"])
+        checks.append(_check(
+            name, "allowed", not bad.any(), list(rule["allowed"]), int(values.nunique()),
+            failing_rows=bad.sum(), sampled=is_sampled, examples=values[bad].unique().tolist()
+        ))
+
+    if "regex" in rule:
+        values = sample.dropna().astype(str)
+        bad = ~values.str.fullmatch(rule["regex"]).fillna(False).astype(bool)
+        checks.append(_check(
+            name, "regex", not bad.any(), rule["regex"], None,
+            failing_rows=bad.sum(), sampled=is_sampled, examples=values[bad].unique().tolist()
+        ))
+
+    if rule.get("unique"):
+        duplicates = _duplicate_rows(full.to_frame(), [name])
+        checks.append(_check(name, "unique", duplicates == 0, True, duplicates == 0, failing_rows=duplicates))
+
+    return checks
+
+
+def validate_dataframe(df: pd.DataFrame, rules: Dict, sample_rows: Optional[int] = None) -> Dict:
+    """
+    Evaluate data-quality rules against a DataFrame.
+
+    Args:
+        df: Data to check
+        rules: Rule mapping (see module header); a 'validate' step dict works as-is
+        sample_rows: Rows above which allowed/regex checks use a sample
+
+    Returns:
+        dict: {"passed", "rows", "sampled_rows", "failed_checks", "checks": [...]}
+    """
+    n_rows = len(df)
+    sample_rows = int(sample_rows or rules.get("sample_rows") or settings.VALIDATION_SAMPLE_ROWS)
+    is_sampled = n_rows > sample_rows
+    if is_sampled:
+        positions = np.sort(np.random.default_rng(settings.SAMPLE_SEED).choice(n_rows, sample_rows, replace=False))
+        sample = df.iloc[positions]
+    else:
+        sample = df
+
+    checks = []
+
+    row_count = rules.get("row_count") or {}
+    if row_count:
+        passed = row_count.get("min", 0) <= n_rows <= row_count.get("max", float("inf"))
+        checks.append(_check(None, "row_count", passed, [row_count.get("min"), row_count.get("max")], n_rows))
+
+    key = rules.get("unique")
+    if key:
+        key = [key] if isinstance(key, str) else list(key)
+        missing = [col for col in key if col not in df.columns]
+        if missing:
+            checks.append(_check(None, "unique", False, key, f"missing columns {missing}"))
+        else:
+            duplicates = _duplicate_rows(df, key)
+            checks.append(_check(None, "unique", duplicates == 0, key, duplicates == 0, failing_rows=duplicates))
+
+    for column, rule in (rules.get("columns") or {}).items():
+        if column not in df.columns:
+            checks.append(_check(column, "exists", False, True, False))
+            continue
+        checks.extend(_column_checks(df[column], sample[column], is_sampled, rule or {}))
+
+    failed = sum(1 for c in checks if not c["passed"])
+    return {
+        "passed": failed == 0,
+        "rows": n_rows,
+        "sampled_rows": len(sample),
+        "failed_checks": failed,
+        "checks": checks,
+    }
+
+
+def validate_step(df: pd.DataFrame, step: Dict) -> pd.DataFrame:
+    """
+    'validate' pipeline step: check rules and stop the pipeline on failure.
+
+    Raises:
+        DataValidationError: If a check fails and fail_fast is not disabled
+    """
+    report = validate_dataframe(df, step)
+    if report["passed"]:
+        logger.info(f"Data validation passed ({len(report['checks'])} checks)")
+    elif step.get("fail_fast", True):
+        raise DataValidationError(report)
+    else:
+        failed = [c for c in report["checks"] if not c["passed"]]
+        logger.warning(f"Data validation failed (continuing, fail_fast disabled): {failed}")
+    return df
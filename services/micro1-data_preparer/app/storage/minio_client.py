@@ -1,7 +1,9 @@
 # app/storage/minio_client.py
+import hashlib
 from minio import Minio
 from minio.error import S3Error
 from io import BytesIO
+from datetime import timedelta
 from app.core.logger import logger
 from app.core.config import settings
 
@@ -107,6 +109,66 @@ def upload_bytes(object_name: str, data: bytes, content_type: str = "application
         raise
 
 
+def upload_file(object_name: str, file_path: str, content_type: str = "application/octet-stream",
+                metadata: dict = None):
+    """
+    Upload a local file to MinIO, streaming it (multipart for large files)
+
+    Args:
+        object_name: Path/name of object in MinIO
+        file_path: Local file to upload
+        content_type: MIME type of the data
+        metadata: Optional user metadata stored with the object
+
+    Returns:
+        ObjectWriteResult from MinIO
+    """
+    try:
+        ensure_bucket_exists()
+        result = minio_client.fput_object(
+            bucket_name=settings.MINIO_BUCKET,
+            object_name=object_name,
+            file_path=file_path,
+            content_type=content_type,
+            metadata=metadata
+        )
+        logger.info(f"Uploaded {file_path} to MinIO as {object_name}")
+        return result
+
+    except S3Error as e:
+        logger.error(f"S3 error uploading {object_name}: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Error uploading {object_name}: {e}")
+        raise
+
+
+def iter_object_chunks(object_name: str, chunk_size: int = 8 * 1024 * 1024):
+    """
+    Stream an object from MinIO in chunks without buffering it whole
+
+    Raises:
+        FileNotFoundError: If object doesn't exist
+    """
+    try:
+        response = minio_client.get_object(
+            bucket_name=settings.MINIO_BUCKET,
+            object_name=object_name
+        )
+    except S3Error as e:
+        if e.code == "NoSuchKey":
+            logger.error(f"Object not found: {object_name}")
+            raise FileNotFoundError(f"Object not found in MinIO: {object_name}")
+        logger.error(f"S3 error downloading {object_name}: {e}")
+        raise
+
+    try:
+        yield from response.stream(chunk_size)
+    finally:
+        response.close()
+        response.release_conn()
+
+
 def download_bytes(object_name: str) -> bytes:
     """
     Download object from MinIO as bytes
@@ -176,6 +238,35 @@ def list_objects(prefix: str = None) -> list:
         raise
 
 
+def list_object_infos(prefix: str = None) -> list:
+    """
+    List objects in MinIO bucket with their metadata
+
+    Args:
+        prefix: Optional prefix to filter objects (e.g., "raw/")
+
+    Returns:
+        list: Dicts with name, etag (without quotes) and size
+    """
+    try:
+        objects = minio_client.list_objects(
+            bucket_name=settings.MINIO_BUCKET,
+            prefix=prefix,
+            recursive=True
+        )
+        infos = [
+            {"name": obj.object_name, "etag": (obj.etag or "").strip('"'), "size": obj.size}
+            for obj in objects
+            if not obj.is_dir
+        ]
+        logger.info(f"Listed {len(infos)} objects with prefix '{prefix}'")
+        return infos
+
+    except S3Error as e:
+        logger.error(f"Error listing objects: {e}")
+        raise
+
+
 def delete_object(object_name: str):
     """
     Delete object from MinIO
@@ -220,4 +311,178 @@ def object_exists(object_name: str) -> bool:
         raise
     except Exception as e:
         logger.error(f"Error checking existence of {object_name}: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+def get_object_etag(object_name: str):
+    """
+    Return the ETag of an object, or None if it does not exist
+
+    Args:
+        object_name: Path/name of object
+
+    Returns:
+        str or None: ETag without surrounding quotes
+    """
+    try:
+        stat = minio_client.stat_object(
+            bucket_name=settings.MINIO_BUCKET,
+            object_name=object_name
+        )
+        return stat.etag.strip('"') if stat.etag else None
+    except S3Error as e:
+        if e.code in ("NoSuchKey", "NoSuchObject"):
+            return None
+        logger.error(f"S3 error reading metadata of {object_name}: {e}")
+        raise
+
+
+# --------------------------------------------------------------------
+# Multipart uploads (resumable client uploads map 1:1 onto these)
+#
+# minio-py only exposes multipart uploads through private methods of
+# Minio (the ones put_object uses internally). _MultipartApi is the only
+# place that calls them, so an SDK change is fixed in one class. The
+# object name of each upload is stored under UPLOAD_SESSION_PREFIX when
+# the upload is created, so an upload id resolves with a single GET
+# after a restart instead of a listing of all in-progress uploads.
+# --------------------------------------------------------------------
+
+UPLOAD_SESSION_PREFIX = "uploads/"
+
+
+class _MultipartApi:
+    """Adapter over minio-py's private multipart upload calls"""
+
+    def __init__(self, client: Minio):
+        self._client = client
+
+    def create(self, bucket: str, object_name: str, headers: dict) -> str:
+        return self._client._create_multipart_upload(bucket, object_name, headers)
+
+    def upload_part(self, bucket: str, object_name: str, data: bytes, headers: dict,
+                    upload_id: str, part_number: int) -> str:
+        return self._client._upload_part(bucket, object_name, data, headers, upload_id, part_number)
+
+    def list_parts(self, bucket: str, object_name: str, upload_id: str, marker=None):
+        return self._client._list_parts(
+            bucket, object_name, upload_id, max_parts=1000, part_number_marker=marker
+        )
+
+    def complete(self, bucket: str, object_name: str, upload_id: str, parts: list):
+        return self._client._complete_multipart_upload(bucket, object_name, upload_id, parts)
+
+    def abort(self, bucket: str, object_name: str, upload_id: str):
+        self._client._abort_multipart_upload(bucket, object_name, upload_id)
+
+
+_multipart = _MultipartApi(minio_client)
+
+
+def _upload_session_object(upload_id: str) -> str:
+    # Upload ids may contain '/' or '+'; the hash keeps the key flat
+    return f"{UPLOAD_SESSION_PREFIX}{hashlib.sha256(upload_id.encode()).hexdigest()}"
+
+
+def create_multipart_upload(object_name: str, content_type: str = "application/octet-stream") -> str:
+    """Start a multipart upload, record its object name and return its upload id"""
+    ensure_bucket_exists()
+    upload_id = _multipart.create(settings.MINIO_BUCKET, object_name, {"Content-Type": content_type})
+    try:
+        upload_bytes(_upload_session_object(upload_id), object_name.encode("utf-8"), "text/plain")
+    except Exception:
+        _multipart.abort(settings.MINIO_BUCKET, object_name, upload_id)
+        raise
+    logger.info(f"Started multipart upload {upload_id} for {object_name}")
+    return upload_id
+
+
+def upload_part(object_name: str, upload_id: str, part_number: int, data: bytes, content_md5: str) -> str:
+    """
+    Upload one part; MinIO re-verifies the data against content_md5
+
+    Returns:
+        str: ETag of the stored part
+    """
+    return _multipart.upload_part(
+        settings.MINIO_BUCKET, object_name, data, {"Content-MD5": content_md5}, upload_id, part_number
+    )
+
+
+def list_uploaded_parts(object_name: str, upload_id: str) -> list:
+    """Return all parts uploaded so far as minio Part objects"""
+    parts, marker = [], None
+    while True:
+        result = _multipart.list_parts(settings.MINIO_BUCKET, object_name, upload_id, marker)
+        parts.extend(result.parts)
+        if not result.is_truncated:
+            return parts
+        marker = result.next_part_number_marker
+
+
+def find_multipart_upload(upload_id: str):
+    """Return the object name recorded for an upload id, or None"""
+    try:
+        response = minio_client.get_object(
+            bucket_name=settings.MINIO_BUCKET,
+            object_name=_upload_session_object(upload_id)
+        )
+    except S3Error as e:
+        if e.code in ("NoSuchKey", "NoSuchObject"):
+            return None
+        raise
+    try:
+        return response.read().decode("utf-8")
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def _forget_multipart_upload(upload_id: str):
+    try:
+        delete_object(_upload_session_object(upload_id))
+    except Exception as e:
+        # A stale record only resolves to an upload MinIO no longer knows
+        logger.warning(f"Could not remove record of multipart upload {upload_id}: {e}")
+
+
+def complete_multipart_upload(object_name: str, upload_id: str, parts: list):
+    """Assemble the uploaded parts (sorted by part number) into the final object"""
+    result = _multipart.complete(
+        settings.MINIO_BUCKET, object_name, upload_id, sorted(parts, key=lambda p: p.part_number)
+    )
+    _forget_multipart_upload(upload_id)
+    logger.info(f"Completed multipart upload {upload_id} for {object_name} ({len(parts)} parts)")
+    return result
+
+
+def abort_multipart_upload(object_name: str, upload_id: str):
+    """Abort a multipart upload and discard its parts"""
+    _multipart.abort(settings.MINIO_BUCKET, object_name, upload_id)
+    _forget_multipart_upload(upload_id)
+    logger.info(f"Aborted multipart upload {upload_id} for {object_name}")
+
+
+_public_client = None
+
+
+def public_client() -> Minio:
+    """Client for the host external clients use; only used to sign URLs, never to connect"""
+    global _public_client
+    if _public_client is None:
+        _public_client = Minio(
+            settings.MINIO_PUBLIC_ENDPOINT or settings.MINIO_ENDPOINT,
+            access_key=settings.MINIO_ROOT_USER,
+            secret_key=settings.MINIO_ROOT_PASSWORD,
+            secure=settings.MINIO_PUBLIC_SECURE,
+            region=settings.MINIO_REGION
+        )
+    return _public_client
+
+
+def presigned_put_url(object_name: str, expires_seconds: int) -> str:
+    """Return a URL that lets a client PUT object_name directly into the bucket"""
+    ensure_bucket_exists()
+    return public_client().presigned_put_object(
+        settings.MINIO_BUCKET, object_name, expires=timedelta(seconds=expires_seconds)
+    )
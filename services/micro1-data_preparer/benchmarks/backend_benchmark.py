@@ -0,0 +1,65 @@
+# benchmarks/backend_benchmark.py
+# --------------------------------------------------------------------
+# Compare pipeline runtime of the pandas and Polars backends on
+# synthetic tall and wide tables.
+#
+# Usage (from the service root):
+#   python -m benchmarks.backend_benchmark --rows 2000000 --cols 20
+# --------------------------------------------------------------------
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.pipeline import run_pipeline
+
+
+def make_frame(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {f"num_{i}": rng.normal(size=rows) for i in range(cols)}
+    data["cat"] = rng.choice(["a", "b", "c", "d"], size=rows)
+    data["unused"] = rng.integers(0, 1_000, size=rows)
+    df = pd.DataFrame(data)
+    df.loc[rng.random(rows) < 0.05, "num_0"] = np.nan
+    return df
+
+
+def make_pipeline(cols: int) -> dict:
+    numeric = [f"num_{i}" for i in range(cols)]
+    return {
+        "steps": [
+            {"type": "drop_columns", "columns": ["unused"]},
+            {"type": "handle_missing", "method": "fill_mean", "columns": numeric},
+            {"type": "handle_missing", "method": "fill_mode", "columns": ["cat"]},
+            {"type": "encode_categorical", "method": "label", "columns": ["cat"]},
+            {"type": "scale_numeric", "method": "standard", "columns": numeric},
+        ]
+    }
+
+
+def bench(backend: str, df: pd.DataFrame, conf: dict, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_pipeline(df, conf, backend=backend)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.cols)
+    conf = make_pipeline(args.cols)
+    print(f"rows={args.rows} cols={args.cols} (best of {args.repeat})")
+    for backend in ("pandas", "polars"):
+        print(f"  {backend:<7} {bench(backend, df, conf, args.repeat):8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
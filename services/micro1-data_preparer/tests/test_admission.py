@@ -0,0 +1,108 @@
+# tests/test_admission.py
+# --------------------------------------------------------------------
+# Tests for memory-aware admission control.
+# --------------------------------------------------------------------
+import gzip
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services.admission import MemoryBudgetExceeded, estimate_memory, load_admitted
+from app.services.ingest import sniff_format
+from app.services.spool import spool_chunks
+
+
+@pytest.fixture(autouse=True)
+def small_samples(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "ADMISSION_SAMPLE_BYTES", 64 * 1024)
+    monkeypatch.setattr(settings, "ADMISSION_SAMPLE_ROWS", 1000)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 30000
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "qty": rng.integers(0, 100, n),
+        "price": rng.normal(50, 10, n).round(2),
+        "city": rng.choice(["Rabat", "Paris", "Lyon", "Fes"], n),
+        "note": [f"row-{i}" for i in range(n)],
+    })
+
+
+def write(tmp_path, df, name):
+    path = tmp_path / name
+    if name.endswith(".parquet"):
+        df.to_parquet(path)
+    elif name.endswith(".gz"):
+        with gzip.open(path, "wb") as f:
+            f.write(df.to_csv(index=False).encode())
+    else:
+        df.to_csv(path, index=False)
+    head = path.read_bytes()[:8]
+    return str(path), sniff_format(head, name)
+
+
+class TestEstimate:
+    @pytest.mark.parametrize("name", ["data.csv", "data.csv.gz", "data.parquet"])
+    def test_estimate_close_to_actual(self, tmp_path, frame, name):
+        path, fmt = write(tmp_path, frame, name)
+        estimate = estimate_memory(path, fmt, budget=2**40)
+
+        actual = frame.memory_usage(deep=True, index=False).sum()
+        assert estimate.strategy == "eager"
+        assert abs(estimate.estimated_rows - len(frame)) / len(frame) < 0.25
+        assert abs(estimate.estimated_bytes - actual) / actual < 0.3
+
+    def test_projection_lowers_estimate(self, tmp_path, frame):
+        path, fmt = write(tmp_path, frame, "data.csv")
+        full = estimate_memory(path, fmt, budget=2**40)
+        projected = estimate_memory(path, fmt, columns=["qty"], budget=2**40)
+        assert projected.estimated_bytes < full.estimated_bytes / 5
+
+    def test_strategy_thresholds(self, tmp_path, frame):
+        path, fmt = write(tmp_path, frame, "data.csv")
+        estimate = estimate_memory(path, fmt, budget=2**40)
+        needed = estimate.estimated_bytes * settings.ADMISSION_OVERHEAD
+
+        assert estimate_memory(path, fmt, budget=int(needed) + 1).strategy == "eager"
+        assert estimate_memory(path, fmt, budget=int(needed * 0.9)).strategy == "reject"
+        assert estimate_memory(path, fmt, budget=1024).strategy == "reject"
+
+
+class TestLoadAdmitted:
+    @pytest.mark.parametrize("slack", [0.8, 1.2, 1.5, 3.0])
+    def test_admitted_frame_fits_budget(self, frame, monkeypatch, slack):
+        """Whatever is admitted fits the budget with the pipeline overhead"""
+        with spool_chunks(iter([frame.to_csv(index=False).encode()]), "data.csv") as spooled:
+            actual = frame.memory_usage(deep=True, index=False).sum() * settings.ADMISSION_OVERHEAD
+            monkeypatch.setattr(settings, "MEMORY_BUDGET_MB", actual * slack / 2**20)
+            try:
+                loaded, admission = load_admitted(spooled)
+            except MemoryBudgetExceeded as exc:
+                assert exc.estimate.strategy == "reject"
+                assert slack < 1.5
+                return
+
+        budget = admission.budget_bytes
+        assert loaded.memory_usage(deep=True, index=False).sum() * settings.ADMISSION_OVERHEAD <= budget
+        pd.testing.assert_frame_equal(loaded, frame)
+
+
+class TestAdmissionAPI:
+    def test_detect_rejects_over_budget(self, frame, monkeypatch):
+        monkeypatch.setattr(settings, "MEMORY_BUDGET_MB", 0.01)
+        client = TestClient(app)
+        resp = client.post(
+            "/detect",
+            files={"file": ("data.csv", frame.to_csv(index=False), "text/csv")},
+            data={"store_to_minio": "false"},
+        )
+        assert resp.status_code == 413
+        assert resp.json()["detail"]["estimate"]["strategy"] == "reject"
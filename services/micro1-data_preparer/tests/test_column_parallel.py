@@ -0,0 +1,78 @@
+# tests/test_column_parallel.py
+# --------------------------------------------------------------------
+# Tests for column-parallel step execution: parallel runs must produce
+# exactly the same frame as the sequential path.
+# --------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.services.pipeline import run_pipeline
+
+
+def _sample_frame(rows: int = 2_000) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    df = pd.DataFrame({
+        f"num_{i}": rng.normal(size=rows) for i in range(6)
+    })
+    df.loc[rng.choice(rows, rows // 20, replace=False), "num_0"] = np.nan
+    df["cat"] = rng.choice(["a", "b", "c", None], size=rows)
+    df["when"] = pd.date_range("2024-01-01", periods=rows, freq="h").astype(str)
+    return df
+
+
+PIPELINE = {
+    "steps": [
+        {"type": "parse_dates", "columns": ["when"]},
+        {"type": "handle_missing", "method": "fill_median", "columns": [f"num_{i}" for i in range(6)]},
+        {"type": "handle_missing", "method": "fill_mode", "columns": ["cat"]},
+        {"type": "encode_categorical", "method": "label", "columns": ["cat"]},
+        {"type": "scale_numeric", "method": "standard", "columns": [f"num_{i}" for i in range(3)]},
+        {"type": "scale_numeric", "method": "robust", "columns": [f"num_{i}" for i in range(3, 6)]},
+    ]
+}
+
+
+class TestColumnParallel:
+    """Parallel execution is deterministic and matches sequential output"""
+
+    @pytest.mark.parametrize("executor", ["thread", "process", "auto"])
+    def test_parallel_matches_sequential(self, monkeypatch, executor):
+        df = _sample_frame()
+
+        monkeypatch.setattr(settings, "PREPARE_WORKERS", 1)
+        expected = run_pipeline(df, PIPELINE)
+
+        monkeypatch.setattr(settings, "PREPARE_WORKERS", 4)
+        monkeypatch.setattr(settings, "PARALLEL_MIN_ROWS", 0)
+        monkeypatch.setattr(settings, "PREPARE_EXECUTOR", executor)
+        result = run_pipeline(df, PIPELINE)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert list(result.columns) == list(df.columns)
+
+    def test_unknown_executor_raises(self, monkeypatch):
+        monkeypatch.setattr(settings, "PARALLEL_MIN_ROWS", 0)
+        df = _sample_frame(10)
+        config = {"steps": [{"type": "scale_numeric", "method": "minmax", "columns": ["num_1", "num_2"],
+                             "workers": 2, "executor": "gpu"}]}
+
+        with pytest.raises(ValueError, match="executor"):
+            run_pipeline(df, config)
+
+    def test_step_workers_reuse_one_pool(self, monkeypatch):
+        from app.services import column_parallel
+
+        monkeypatch.setattr(settings, "PREPARE_WORKERS", 4)
+        monkeypatch.setattr(settings, "PARALLEL_MIN_ROWS", 0)
+        column_parallel.shutdown_pools()
+        df = _sample_frame(200)
+        for workers in (2, 3, 64):
+            config = {"steps": [{"type": "scale_numeric", "method": "minmax", "workers": workers,
+                                 "executor": "thread", "columns": [f"num_{i}" for i in range(6)]}]}
+            run_pipeline(df, config)
+
+        assert list(column_parallel._pools) == ["thread"]
+        assert column_parallel.resolve_workers({"workers": 64}) == 4
+        column_parallel.shutdown_pools()
@@ -0,0 +1,71 @@
+# tests/test_dataset_profile.py
+# --------------------------------------------------------------------
+# Tests for the dataset profile sidecar used by the model selector.
+# --------------------------------------------------------------------
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import dataset_profile
+from app.services.dataset_profile import build_profile, profile_object_name, store_profile
+from app.services.text_vectorizer import vectorize_column
+
+
+@pytest.fixture
+def processed():
+    rng = np.random.default_rng(9)
+    n = 300
+    df = pd.DataFrame({
+        "f32": rng.normal(size=n).astype(np.float32),
+        "codes": rng.integers(0, 5, n).astype(np.int8),
+        "cat": pd.Categorical(rng.choice(["x", "y"], n)),
+        "when": pd.to_datetime("2024-01-01") + pd.to_timedelta(rng.integers(0, 3, n), unit="D"),
+        "flag": rng.random(n) > 0.5,
+        "nullable": pd.array(np.where(rng.random(n) > 0.9, None, 1), dtype="Int64"),
+        "target": rng.choice([0, 1, 2], n, p=[0.6, 0.3, 0.1]),
+    })
+    return pd.concat([df, vectorize_column(pd.Series(["a b"] * n, name="t"), {"n_features": 2})], axis=1)
+
+
+def test_dtypes_match_csv_round_trip(processed):
+    profile = build_profile(processed)
+    reread = pd.read_csv(io.StringIO(processed.to_csv(index=False)))
+
+    assert profile["n_rows"] == len(reread)
+    assert {c: p["dtype"] for c, p in profile["columns"].items()} == {c: str(d) for c, d in reread.dtypes.items()}
+
+
+def test_column_summaries(processed):
+    columns = build_profile(processed)["columns"]
+
+    target = columns["target"]
+    expected = processed["target"].value_counts()
+    assert target["value_counts"] == [[int(v), int(c)] for v, c in expected.items()]
+    assert target["unique"] == 3 and target["nulls"] == 0
+    assert target["mean"] == pytest.approx(processed["target"].mean())
+    assert target["std"] == pytest.approx(processed["target"].std())
+
+    assert columns["nullable"]["nulls"] == processed["nullable"].isna().sum()
+    assert "mean" not in columns["cat"] and columns["cat"]["unique"] == 2
+    assert columns["when"]["value_counts"][0][0].startswith("2024-01-0")
+    json.dumps(columns)  # JSON-serializable as is
+
+
+def test_high_cardinality_has_no_value_counts(monkeypatch):
+    monkeypatch.setattr(dataset_profile.settings, "PROFILE_MAX_VALUES", 10)
+    columns = build_profile(pd.DataFrame({"id": range(50), "small": [1, 2] * 25}))["columns"]
+    assert "value_counts" not in columns["id"] and columns["id"]["unique"] == 50
+    assert len(columns["small"]["value_counts"]) == 2
+
+
+def test_sidecar_name_and_store(processed, monkeypatch):
+    stored = {}
+    monkeypatch.setattr(dataset_profile, "upload_bytes", lambda name, data, content_type: stored.update({name: data}))
+
+    name = store_profile(processed, "processed/iris_processed_20250101_120000.csv")
+    assert name == profile_object_name("processed/iris_processed_20250101_120000.csv")
+    assert name == "processed/iris_processed_20250101_120000_profile.json"
+    assert json.loads(stored[name])["version"] == 1
@@ -0,0 +1,79 @@
+# tests/test_date_features.py
+# --------------------------------------------------------------------
+# Tests for the 'date_features' step (int64-based date feature
+# extraction).
+# --------------------------------------------------------------------
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.date_features import FEATURES, date_features
+from app.services.pipeline import run_pipeline
+from app.services.pipeline_auto import run_pipeline_auto
+
+
+@pytest.fixture
+def stamps():
+    rng = np.random.default_rng(11)
+    values = pd.Series(pd.to_datetime(rng.integers(-3 * 10**18, 4 * 10**18, 5000)))
+    values[::9] = pd.NaT
+    return values
+
+
+class TestCalendarFields:
+    def test_matches_pandas_accessors(self, stamps):
+        out = date_features(pd.DataFrame({"d": stamps}), {"columns": ["d"], "features": list(FEATURES)})
+        for feature in ("year", "month", "day", "weekday", "hour", "dayofyear"):
+            expected = getattr(stamps.dt, feature).to_numpy(dtype=float)
+            np.testing.assert_array_equal(out[f"d_{feature}"].to_numpy(), expected, err_msg=feature)
+        np.testing.assert_array_equal(out["d_is_weekend"].to_numpy(), (stamps.dt.weekday >= 5).where(stamps.notna()).to_numpy(dtype=float))
+
+    def test_epoch_and_cycles(self):
+        df = pd.DataFrame({"d": ["1970-01-01 00:00:00", "2024-03-10 18:00:00", "not a date"]})
+        out = date_features(df, {"columns": ["d"], "features": ["epoch", "hour_sin", "hour_cos", "month_cos"]})
+        assert out["d_epoch"].iloc[1] == pd.Timestamp("2024-03-10 18:00").timestamp()
+        assert (out["d_hour_sin"].iloc[1], out["d_hour_cos"].iloc[1]) == pytest.approx((-1.0, 0.0), abs=1e-12)
+        assert out["d_month_cos"].iloc[0] == pytest.approx(1.0)
+        assert out.iloc[2].isna().all()
+
+    def test_timezone_uses_wall_clock(self):
+        df = pd.DataFrame({"d": pd.to_datetime(["2024-01-06 23:30"]).tz_localize("Europe/Paris")})
+        out = date_features(df, {"columns": ["d"], "features": ["hour", "is_weekend"]})
+        assert out.iloc[0].tolist() == [23.0, 1.0]
+
+
+class TestStep:
+    def test_pipeline_step(self):
+        df = pd.DataFrame({"a": ["2020-01-01", "2021-06-15"], "b": pd.to_datetime(["2020-01-04", None]), "x": [1, 2]})
+        out = run_pipeline(df, {"steps": [{"type": "date_features", "columns": ["a", "b", "c"], "features": ["year", "weekday"]}]})
+        assert list(out.columns) == ["x", "a_year", "a_weekday", "b_year", "b_weekday"]
+        assert out["a_year"].tolist() == [2020.0, 2021.0] and np.isnan(out["b_weekday"].iloc[1])
+
+        kept = date_features(df, {"columns": ["a"], "features": ["day"], "drop": False})
+        assert "a" in kept.columns and kept["a_day"].tolist() == [1.0, 15.0]
+
+    def test_unknown_feature(self):
+        with pytest.raises(ValueError, match="Unknown date features"):
+            date_features(pd.DataFrame({"d": ["2020-01-01"]}), {"columns": ["d"], "features": ["quarter"]})
+
+    def test_unparseable_column_is_skipped(self):
+        df = pd.DataFrame({
+            "good": ["2020-01-01", "2020-03-03"],
+            "mixed": ["2020-01-01T00:00+01:00", "2020-01-02T00:00+05:00"],
+        })
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)  # mixed offsets
+            out = date_features(df, {"columns": ["good", "mixed"], "features": ["year", "month"]})
+            auto = run_pipeline_auto(df, {"date_columns": ["good", "mixed"]})
+        assert list(out.columns) == ["mixed", "good_year", "good_month"]
+        assert out["good_month"].tolist() == [1.0, 3.0]
+        pd.testing.assert_series_equal(out["mixed"], df["mixed"])
+        assert "good" not in auto.columns and "good_year" in auto.columns
+
+    def test_auto_pipeline_extracts_dates(self):
+        df = pd.DataFrame({"when": ["2020-01-01", None, "2020-03-03"], "v": [1.0, 2.0, 3.0]})
+        out = run_pipeline_auto(df, {"date_columns": ["when"], "numeric_columns": ["v"]})
+        assert [c for c in out.columns if c.startswith("when")] == ["when_year", "when_month", "when_day", "when_weekday"]
+        assert out["when_weekday"].iloc[2] == 1.0
@@ -0,0 +1,66 @@
+# tests/test_dedup.py
+# --------------------------------------------------------------------
+# Tests for hash-based row deduplication.
+# --------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.dedup import deduplicate, hash_rows
+from app.services.pipeline import run_pipeline
+
+
+@pytest.fixture
+def events():
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        "user": rng.integers(0, 50, n),
+        "event": rng.choice(["view", "click", None], n),
+        "value": rng.integers(0, 4, n).astype(float),
+        "ts": rng.integers(0, 1000, n),
+    })
+    df.loc[::7, "value"] = np.nan
+    return df
+
+
+class TestHashRows:
+    def test_equal_rows_equal_hashes(self):
+        df = pd.DataFrame({"a": [1, 1, 2], "b": ["x", "x", "x"]})
+        h = hash_rows(df)
+        assert h.dtype == np.uint64
+        assert h[0] == h[1] != h[2]
+
+    def test_column_subset(self):
+        df = pd.DataFrame({"a": [1, 1], "b": ["x", "y"]})
+        assert hash_rows(df, ["a"])[0] == hash_rows(df, ["a"])[1]
+        assert hash_rows(df)[0] != hash_rows(df)[1]
+
+
+class TestDeduplicate:
+    @pytest.mark.parametrize("keep", ["first", "last"])
+    def test_memory_matches_drop_duplicates(self, events, keep):
+        result = deduplicate(events, {"keep": keep})
+        pd.testing.assert_frame_equal(result, events.drop_duplicates(keep=keep))
+
+    def test_keep_none(self, events):
+        result = deduplicate(events, {"columns": ["user", "ts"], "keep": "none"})
+        pd.testing.assert_frame_equal(result, events.drop_duplicates(subset=["user", "ts"], keep=False))
+
+    def test_column_subset(self, events):
+        result = deduplicate(events, {"columns": ["user", "event", "value"]})
+        pd.testing.assert_frame_equal(result, events.drop_duplicates(subset=["user", "event", "value"]))
+
+    def test_invalid_options(self, events):
+        with pytest.raises(ValueError):
+            deduplicate(events, {"keep": "middle"})
+
+
+class TestDeduplicateStep:
+    def test_pipeline_reports_removed_rows(self):
+        df = pd.DataFrame({"a": [1, 1, 2, 2, 3], "b": ["x", "x", "y", "z", None]})
+        report = []
+        result = run_pipeline(df, {"steps": [{"type": "deduplicate"}]}, report=report)
+
+        assert len(result) == 4
+        assert report == [{"step": 1, "type": "deduplicate", "rows_in": 5, "rows_out": 4, "rows_removed": 1}]
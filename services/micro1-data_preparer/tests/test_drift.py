@@ -0,0 +1,119 @@
+# tests/test_drift.py
+# --------------------------------------------------------------------
+# Tests for column sketches and sketch-based drift detection.
+# --------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import drift_router as drift_module
+from app.main import app
+from app.services.dataset_sketch import (
+    build_sketch, merge_sketches, sketch_from_bytes, sketch_to_bytes
+)
+from app.services.drift import compare_sketches, psi
+
+
+def make_frame(seed, shift=0.0, n=20000, p_red=0.5, null_every=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "amount": rng.normal(100 + shift, 15, n),
+        "color": rng.choice(["red", "blue"], n, p=[p_red, 1 - p_red]),
+        "when": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D"),
+    })
+    if null_every:
+        df.loc[::null_every, "amount"] = np.nan
+    return df
+
+
+class TestDatasetSketch:
+    def test_sketch_contents_and_roundtrip(self):
+        df = make_frame(0, null_every=10)
+        sketch = sketch_from_bytes(sketch_to_bytes(build_sketch(df, source="raw/x.csv")))
+
+        amount, color, when = (sketch["columns"][c] for c in ("amount", "color", "when"))
+        assert sketch["rows"] == 20000
+        assert amount["kind"] == "numeric" and amount["nulls"] == 2000
+        assert color["kind"] == "categorical" and set(color["frequencies"]) == {"red", "blue"}
+        assert when["kind"] == "numeric" and when["datetime"]
+        assert len(sketch_to_bytes(sketch)) < 50000
+
+    def test_merge_matches_whole(self):
+        df = make_frame(1)
+        merged = merge_sketches(build_sketch(df.iloc[:8000]), build_sketch(df.iloc[8000:]))
+        whole = build_sketch(df)
+
+        assert merged["rows"] == whole["rows"]
+        assert merged["columns"]["color"]["frequencies"] == whole["columns"]["color"]["frequencies"]
+        assert merged["columns"]["amount"]["mean"] == pytest.approx(whole["columns"]["amount"]["mean"])
+        assert compare_sketches(whole, merged)["drifted_columns"] == []
+
+
+class TestDrift:
+    def test_psi(self):
+        assert psi([0.5, 0.5], [0.5, 0.5]) == 0
+        assert psi([0.5, 0.5], [0.9, 0.1]) > 0.2
+
+    def test_same_distribution_is_stable(self):
+        report = compare_sketches(build_sketch(make_frame(0)), build_sketch(make_frame(1)))
+        assert report["drifted_columns"] == []
+        assert not report["retrain_recommended"]
+        assert report["columns"]["amount"]["psi"] < 0.05
+        assert report["columns"]["amount"]["ks"] < 0.05
+
+    def test_shifts_are_detected(self):
+        base = build_sketch(make_frame(0))
+        shifted = build_sketch(make_frame(1, shift=10, p_red=0.8))
+        report = compare_sketches(base, shifted)
+        assert set(report["drifted_columns"]) == {"amount", "color"}
+        assert report["columns"]["amount"]["ks"] > 0.2
+
+    def test_null_rate_and_schema_changes(self):
+        base = build_sketch(make_frame(0))
+        cur_df = make_frame(1, null_every=3).drop(columns=["when"]).assign(extra=1)
+        report = compare_sketches(base, build_sketch(cur_df))
+        assert "amount" in report["drifted_columns"]
+        assert report["added_columns"] == ["extra"]
+        assert report["removed_columns"] == ["when"]
+        assert report["retrain_recommended"]
+
+
+class TestDriftAPI:
+    @pytest.fixture
+    def stored(self, monkeypatch):
+        objects = {
+            "sketches/raw/data.csv/20240101T000000000000_aa.json": build_sketch(make_frame(0)),
+            "sketches/raw/data.csv/20240201T000000000000_bb.json": build_sketch(make_frame(1)),
+            "sketches/raw/data.csv/20240301T000000000000_cc.json": build_sketch(make_frame(2, shift=12)),
+        }
+
+        def download(name):
+            if name not in objects:
+                raise FileNotFoundError(f"Object not found in MinIO: {name}")
+            return sketch_to_bytes(objects[name])
+
+        monkeypatch.setattr(drift_module, "list_objects", lambda prefix: [n for n in objects if n.startswith(prefix)])
+        monkeypatch.setattr(drift_module, "download_bytes", download)
+        return sorted(objects)
+
+    def test_latest_versus_previous(self, stored):
+        client = TestClient(app)
+        resp = client.post("/drift", data={"dataset": "raw/data.csv"})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert (body["baseline"], body["current"]) == (stored[1], stored[2])
+        assert body["drifted_columns"] == ["amount"]
+
+    def test_explicit_versions_and_listing(self, stored):
+        client = TestClient(app)
+        assert client.get("/drift/versions", params={"dataset": "raw/data.csv"}).json()["versions"] == stored
+
+        body = client.post("/drift", data={"baseline": stored[0], "current": stored[1]}).json()
+        assert body["drifted_columns"] == []
+
+    def test_errors(self, stored):
+        client = TestClient(app)
+        assert client.post("/drift", data={}).status_code == 400
+        assert client.post("/drift", data={"dataset": "raw/other.csv"}).status_code == 404
+        assert client.post("/drift", data={"baseline": "nope", "current": stored[0]}).status_code == 404
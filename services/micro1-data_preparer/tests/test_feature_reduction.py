@@ -0,0 +1,105 @@
+# tests/test_feature_reduction.py
+# --------------------------------------------------------------------
+# Tests for the 'reduce_features' step (constant, near-zero variance,
+# duplicate and correlated columns).
+# --------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.feature_reduction import analyse_features, correlated_columns, reduce_features
+from app.services.fitted_pipeline import fit_pipeline
+from app.services.pipeline import run_pipeline
+
+
+@pytest.fixture
+def wide():
+    rng = np.random.default_rng(7)
+    n = 5000
+    x = rng.normal(size=n)
+    return pd.DataFrame({
+        "x": x,
+        "const": 3,
+        "all_null": np.nan,
+        "label": "same",
+        "rare": np.where(np.arange(n) < 40, 1, 0),
+        "x_copy": x,
+        "x_scaled": 2 * x + 1,
+        "x_noisy": x + rng.normal(scale=0.05, size=n),
+        "neg_x": -x,
+        "z": rng.normal(size=n),
+        "city": rng.choice(["a", "b", "c"], n),
+        "city_copy": None,
+        "target": 2 * x + 1,
+    }).assign(city_copy=lambda d: d["city"])
+
+
+class TestAnalyse:
+    def test_decisions(self, wide):
+        dropped = analyse_features(wide, {"exclude": ["target"]})["dropped"]
+
+        assert {c for c, d in dropped.items() if d["reason"] == "constant"} == {"const", "all_null", "label"}
+        assert (dropped["const"]["value"], dropped["all_null"]["value"]) == (3, None)
+        assert dropped["rare"]["reason"] == "near_zero_variance"
+        assert dropped["x_copy"] == {"reason": "duplicate", "of": "x"}
+        assert dropped["city_copy"] == {"reason": "duplicate", "of": "city"}
+        for col in ("x_scaled", "x_noisy", "neg_x"):
+            assert dropped[col]["reason"] == "correlated" and dropped[col]["of"] == "x"
+        assert dropped["neg_x"]["r"] == pytest.approx(-1.0, abs=1e-4)
+        assert not {"x", "z", "city", "target"} & set(dropped)
+
+    def test_options(self, wide):
+        dropped = analyse_features(wide, {"exclude": ["target"], "near_zero": False, "correlation": None})["dropped"]
+        assert "rare" not in dropped and "x_scaled" not in dropped
+        assert dropped["x_copy"]["reason"] == "duplicate"
+
+        only = analyse_features(wide, {"columns": ["x", "x_copy", "z"]})["dropped"]
+        assert set(only) == {"x_copy"}
+
+    def test_blocked_matches_single_block(self, wide):
+        columns = ["x", "z", "x_scaled", "x_noisy", "neg_x"]
+        assert correlated_columns(wide, columns, block_size=2) == correlated_columns(wide, columns, block_size=512)
+
+    def test_correlation_uses_a_sample(self, wide):
+        decisions = analyse_features(wide, {"exclude": ["target"], "sample_rows": 1000})
+        assert (decisions["rows"], decisions["sampled_rows"]) == (5000, 1000)
+        assert decisions["dropped"]["x_noisy"]["reason"] == "correlated"
+
+
+class TestReduceStep:
+    def test_pipeline_step_reports_decisions(self, wide):
+        report = []
+        steps = [{"type": "reduce_features", "exclude": ["target"]}]
+        out = run_pipeline(wide, {"steps": steps}, report=report)
+
+        assert list(out.columns) == ["x", "z", "city", "target"]
+        assert set(report[0]["details"]["dropped"]) == set(wide.columns) - set(out.columns)
+
+    def test_direct_call(self, wide):
+        out, decisions = reduce_features(wide[["x", "z"]], {})
+        assert list(out.columns) == ["x", "z"] and decisions["dropped"] == {}
+
+
+class TestFittedReduction:
+    def test_pieces_must_agree(self, wide):
+        first, second = wide.iloc[:2500].copy(), wide.iloc[2500:].copy()
+        second["const"] = 4           # constant in each piece, not overall
+        second.loc[2600, "x_copy"] = 0.0  # duplicate only in the first piece
+        pieces = [first, second]
+        steps = [{"type": "reduce_features", "exclude": ["target"]}]
+
+        fitted = fit_pipeline(steps, [0, 1], lambda i: pieces[i])
+        dropped = fitted.fitted[0]["state"]["decisions"]["dropped"]
+
+        assert "const" not in dropped and "x_copy" not in dropped
+        assert dropped["x_scaled"]["reason"] == "correlated"
+        assert fitted.fitted[0]["params"]["drop"] == list(dropped)
+        assert "x_scaled" not in fitted.transform(second).columns
+
+    def test_refit_keeps_columns(self, wide):
+        steps = [{"type": "reduce_features", "exclude": ["target"]}]
+        fitted = fit_pipeline(steps, [0], lambda i: wide)
+        before = fitted.fitted[0]["params"]
+
+        fitted.refit(fitted.partial_states(wide.assign(z=1.0), [0]))
+        assert fitted.fitted[0]["params"] == before
@@ -0,0 +1,132 @@
+# tests/test_flight_service.py
+# --------------------------------------------------------------------
+# Tests for the Arrow Flight dataset server.
+# --------------------------------------------------------------------
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+flight = pytest.importorskip("pyarrow.flight")
+
+from app.core.config import settings  # noqa: E402
+from app.services import flight_service  # noqa: E402
+from app.services.flight_service import DatasetFlightServer, parse_request, register_frame, table_cache  # noqa: E402
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(2)
+    return pd.DataFrame({"a": np.arange(1000), "b": rng.normal(size=1000), "target": rng.integers(0, 2, 1000)})
+
+
+@pytest.fixture
+def server():
+    table_cache.clear()
+    srv = DatasetFlightServer("grpc://127.0.0.1:0", endpoint_rows=300)
+    yield srv
+    srv.shutdown()
+    table_cache.clear()
+
+
+@pytest.fixture
+def client(server):
+    with flight.connect(f"grpc://127.0.0.1:{server.port}") as c:
+        yield c
+
+
+def fetch(client, **request):
+    info = client.get_flight_info(flight.FlightDescriptor.for_command(json.dumps(request)))
+    with ThreadPoolExecutor(4) as pool:
+        tables = list(pool.map(lambda e: client.do_get(e.ticket).read_all(), info.endpoints))
+    return info, pa.concat_tables(tables).to_pandas()
+
+
+def test_parse_request():
+    assert parse_request(b'{"object": "processed/x.csv"}') == {
+        "object": "processed/x.csv", "columns": None, "offset": 0, "length": None}
+    for bad in (b"not json", b'{"columns": ["a"]}', b'{"object": "processed/x", "offset": -1}',
+                b'{"object": "raw/x.csv"}', b'{"object": "processed/../raw/x.csv"}', b'{"object": 1}'):
+        with pytest.raises(ValueError):
+            parse_request(bad)
+
+
+def test_streams_registered_frame(client, frame, monkeypatch):
+    monkeypatch.setattr(settings, "FLIGHT_PORT", 8815)
+    register_frame("processed/x.csv", frame)
+
+    info, df = fetch(client, object="processed/x.csv")
+    assert len(info.endpoints) == 4 and info.total_records == 1000
+    pd.testing.assert_frame_equal(df, frame)
+
+
+def test_registered_frame_has_csv_dtypes(client, monkeypatch):
+    """A datetime / categorical frame is served as a read of its CSV gives it"""
+    monkeypatch.setattr(settings, "FLIGHT_PORT", 8815)
+    processed = pd.DataFrame({
+        "day": pd.to_datetime(["2024-01-01", None, "2024-03-05"] * 100),
+        "city": pd.Categorical(["Rabat", "Fes", None] * 100),
+        "target": [0, 1, 1] * 100,
+    })
+    register_frame("processed/dates.csv", processed)
+
+    _, df = fetch(client, object="processed/dates.csv")
+    from_csv = pd.read_csv(io.StringIO(processed.to_csv(index=False)))
+    pd.testing.assert_series_equal(df.dtypes, from_csv.dtypes)
+    pd.testing.assert_frame_equal(df, from_csv)
+
+
+def test_projection_and_row_range(client, frame):
+    table_cache.put("processed/x.csv", pa.Table.from_pandas(frame, preserve_index=False))
+
+    info, df = fetch(client, object="processed/x.csv", columns=["target", "a"], offset=100, length=450)
+    assert len(info.endpoints) == 2
+    pd.testing.assert_frame_equal(df, frame[["target", "a"]].iloc[100:550].reset_index(drop=True))
+
+
+def test_loads_from_minio_once(client, frame, monkeypatch):
+    calls = []
+    data = frame.to_csv(index=False).encode()
+
+    def chunks(name, chunk_size):
+        calls.append(name)
+        yield data
+
+    monkeypatch.setattr(flight_service, "get_object_etag", lambda name: "etag-1" if name == "processed/y.csv" else None)
+    monkeypatch.setattr(flight_service, "iter_object_chunks", chunks)
+
+    _, df = fetch(client, object="processed/y.csv", columns=["b"])
+    np.testing.assert_allclose(df["b"].to_numpy(), frame["b"].to_numpy())
+    fetch(client, object="processed/y.csv")
+    assert calls == ["processed/y.csv"]
+
+    with pytest.raises(flight.FlightServerError, match="not found"):
+        fetch(client, object="processed/missing.csv")
+
+
+def test_unknown_columns(client, frame):
+    table_cache.put("processed/x.csv", pa.Table.from_pandas(frame, preserve_index=False))
+    with pytest.raises(flight.FlightServerError, match="Unknown columns"):
+        fetch(client, object="processed/x.csv", columns=["nope"])
+
+
+def test_cache_is_bounded(frame):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    cache = flight_service.TableCache(max_bytes=int(table.nbytes * 2.5))
+    for name in ("a", "b", "c"):
+        cache.put(name, table)
+    cache.get("b")
+    cache.put("d", table)
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.get("b") is not None and cache.get("d") is not None
+
+
+def test_register_is_noop_when_disabled(frame, monkeypatch):
+    table_cache.clear()
+    monkeypatch.setattr(settings, "FLIGHT_PORT", 0)
+    register_frame("processed/x.csv", frame)
+    assert table_cache.get("processed/x.csv") is None
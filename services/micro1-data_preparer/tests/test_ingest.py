@@ -0,0 +1,113 @@
+# tests/test_ingest.py
+# --------------------------------------------------------------------
+# Tests for format sniffing and native dataset readers.
+# --------------------------------------------------------------------
+import gzip
+import io
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.ingest import (
+    DatasetFormat, UnsupportedFormatError, read_dataset, sniff_format, strip_extension
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "id": [1, 2, 3],
+        "amount": [1.5, 2.5, None],
+        "city": ["rabat", "fes", "tanger"],
+        "when": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+    })
+
+
+def _encode(df, kind):
+    buf = io.BytesIO()
+    if kind == "parquet":
+        df.to_parquet(buf)
+    elif kind == "feather":
+        df.to_feather(buf)
+    elif kind == "jsonl":
+        buf.write(df.to_json(orient="records", lines=True).encode())
+    elif kind == "csv.gz":
+        buf.write(gzip.compress(df.to_csv(index=False).encode()))
+    elif kind == "csv.zst":
+        zstd = pytest.importorskip("zstandard")
+        buf.write(zstd.ZstdCompressor().compress(df.to_csv(index=False).encode()))
+    return buf.getvalue()
+
+
+class TestSniffFormat:
+    """Tests for sniff_format"""
+
+    @pytest.mark.parametrize("kind,expected", [
+        ("parquet", DatasetFormat("parquet")),
+        ("feather", DatasetFormat("arrow")),
+        ("jsonl", DatasetFormat("jsonl")),
+        ("csv.gz", DatasetFormat("csv", "gzip")),
+        ("csv.zst", DatasetFormat("csv", "zstd")),
+    ])
+    def test_detects_format(self, frame, kind, expected):
+        pytest.importorskip("pyarrow")
+        raw = _encode(frame, kind)
+        assert sniff_format(raw[:8], f"data.{kind}") == expected
+
+    def test_magic_bytes_win_over_name(self, frame):
+        pytest.importorskip("pyarrow")
+        raw = _encode(frame, "parquet")
+        assert sniff_format(raw[:8], "export.csv").format == "parquet"
+
+    def test_plain_csv(self):
+        assert sniff_format(b"a,b\n1,2", "x.csv") == DatasetFormat("csv")
+
+    def test_unsupported(self):
+        with pytest.raises(UnsupportedFormatError):
+            sniff_format(b"hello world", "notes.txt")
+
+    def test_strip_extension(self):
+        assert strip_extension("sales.csv.gz") == "sales"
+        assert strip_extension("sales.parquet") == "sales"
+        assert strip_extension("my.data.csv") == "my.data"
+
+
+class TestReadDataset:
+    """Tests for read_dataset"""
+
+    @pytest.mark.parametrize("kind", ["parquet", "feather"])
+    def test_columnar_keeps_dtypes_and_projects(self, frame, kind):
+        pytest.importorskip("pyarrow")
+        raw = _encode(frame, kind)
+        df = read_dataset(raw, sniff_format(raw[:8], f"x.{kind}"), columns=["id", "when"])
+
+        assert list(df.columns) == ["id", "when"]
+        assert pd.api.types.is_datetime64_any_dtype(df["when"])
+        assert pd.api.types.is_integer_dtype(df["id"])
+
+    @pytest.mark.parametrize("kind", ["jsonl", "csv.gz", "csv.zst"])
+    def test_text_formats(self, frame, kind):
+        raw = _encode(frame, kind)
+        df = read_dataset(raw, sniff_format(raw[:8], f"x.{kind}"), columns=["id", "city"])
+
+        assert list(df.columns) == ["id", "city"]
+        assert df["city"].tolist() == ["rabat", "fes", "tanger"]
+
+
+class TestDetectFormats:
+    """The detect endpoint accepts non-CSV inputs"""
+
+    def test_detect_parquet_upload(self, frame):
+        pytest.importorskip("pyarrow")
+        response = client.post(
+            "/detect",
+            files={"file": ("data.parquet", _encode(frame, "parquet"), "application/octet-stream")},
+            data={"store_to_minio": "false"}
+        )
+
+        assert response.status_code == 200
+        assert "amount" in response.json()["numeric_columns"]
@@ -0,0 +1,95 @@
+# tests/test_local_handoff.py
+# --------------------------------------------------------------------
+# Tests for the local Arrow handoff of processed datasets.
+# --------------------------------------------------------------------
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.services import local_handoff
+from app.services.local_handoff import evict, link_path, publish_frame, read_frame
+from app.services.text_vectorizer import vectorize_column
+
+
+@pytest.fixture
+def handoff_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LOCAL_HANDOFF_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "LOCAL_HANDOFF_MAX_BYTES", 1024 ** 3)
+    return tmp_path
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({"x": rng.normal(size=1000), "n": np.arange(1000), "c": rng.choice(["a", "b"], 1000)})
+
+
+def test_disabled_by_default(frame, monkeypatch):
+    monkeypatch.setattr(settings, "LOCAL_HANDOFF_DIR", "")
+    assert publish_frame(frame, "processed/x.csv", b"data") is None
+    assert read_frame("processed/x.csv") is None
+
+
+def test_round_trip(handoff_dir, frame):
+    data = frame.to_csv(index=False).encode()
+    info = publish_frame(frame, "processed/x_processed.csv", data)
+
+    assert os.path.basename(info["path"]) == f"{info['content_hash']}.arrow"
+    assert os.path.islink(link_path(str(handoff_dir), "processed/x_processed.csv"))
+    pd.testing.assert_frame_equal(read_frame("processed/x_processed.csv"), frame)
+    assert read_frame("processed/other.csv") is None
+
+
+def test_handoff_matches_csv_dtypes(handoff_dir):
+    """Consumers get the frame a read of the stored CSV would give"""
+    df = pd.DataFrame({
+        "day": pd.to_datetime(["2024-01-01", "2024-02-03", None]),
+        "city": pd.Categorical(["Rabat", None, "Fes"]),
+        "count": pd.array([1, None, 3], dtype="Int64"),
+        "ratio": np.float32([0.5, 1.5, 2.5]),
+        "flag": [True, False, True],
+    })
+    data = df.to_csv(index=False).encode()
+    publish_frame(df, "processed/dates.csv", data)
+
+    from_csv = pd.read_csv(io.BytesIO(data))
+    handoff = read_frame("processed/dates.csv")
+    pd.testing.assert_series_equal(handoff.dtypes, from_csv.dtypes)
+    pd.testing.assert_frame_equal(handoff, from_csv)
+
+
+def test_same_content_is_written_once(handoff_dir, frame):
+    first = publish_frame(frame, "processed/a.csv", b"same")
+    second = publish_frame(frame, "processed/b.csv", b"same")
+    assert first["path"] == second["path"]
+    assert len([p for p in os.listdir(handoff_dir) if p.endswith(".arrow")]) == 1
+
+
+def test_sparse_columns_are_densified(handoff_dir):
+    df = vectorize_column(pd.Series(["some words here", "more words"], name="t"), {"n_features": 8})
+    publish_frame(df, "processed/t.csv", b"t")
+    back = read_frame("processed/t.csv")
+    np.testing.assert_array_equal(back.to_numpy(), df.sparse.to_dense().to_numpy())
+
+
+def test_eviction_removes_oldest(handoff_dir, frame):
+    old = publish_frame(frame, "processed/old.csv", b"old")
+    os.utime(old["path"], (0, 0))
+    new = publish_frame(frame, "processed/new.csv", b"new")
+
+    assert evict(str(handoff_dir), max_bytes=new["bytes"], keep=new["path"]) == 1
+    assert not os.path.exists(old["path"]) and read_frame("processed/old.csv") is None
+    assert not os.path.lexists(link_path(str(handoff_dir), "processed/old.csv"))
+    assert read_frame("processed/new.csv") is not None
+
+
+def test_publish_failure_is_not_raised(handoff_dir, frame, monkeypatch):
+    def broken(df, path):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(local_handoff, "_write_arrow", broken)
+    assert publish_frame(frame, "processed/x.csv", b"x") is None
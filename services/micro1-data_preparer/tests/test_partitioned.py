@@ -0,0 +1,286 @@
+# tests/test_partitioned.py
+# --------------------------------------------------------------------
+# Tests for fitted pipelines over partitioned data and the partitioned
+# prepare mode. MinIO is replaced with an in-memory object store.
+# --------------------------------------------------------------------
+import hashlib
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import prepare_router as prepare_module
+from app.core.config import settings
+from app.main import app
+from app.services import partitioned as partitioned_module
+from app.services.fitted_pipeline import FittedPipeline, fit_pipeline, fit_waves
+from app.services.partitioned import append_partition, prepare_partitioned
+from app.services.pipeline import _auto_generate_pipeline, run_pipeline
+
+
+class FakeStore:
+    def __init__(self):
+        self.objects = {}
+        self.downloads = []
+
+    def put(self, name, data, content_type="application/octet-stream"):
+        self.objects[name] = data if isinstance(data, bytes) else data.encode()
+
+    def infos(self, prefix=None):
+        return [
+            {"name": n, "etag": hashlib.md5(d).hexdigest(), "size": len(d)}
+            for n, d in sorted(self.objects.items()) if n.startswith(prefix or "")
+        ]
+
+    def chunks(self, name, chunk_size=None):
+        self.downloads.append(name)
+        yield self.objects[name]
+
+    def install(self, monkeypatch):
+        monkeypatch.setattr(partitioned_module, "list_object_infos", self.infos)
+        monkeypatch.setattr(partitioned_module, "iter_object_chunks", self.chunks)
+        monkeypatch.setattr(partitioned_module, "upload_bytes", self.put)
+        monkeypatch.setattr(partitioned_module, "download_bytes", lambda name: self.objects[name])
+        monkeypatch.setattr(partitioned_module, "object_exists", lambda name: name in self.objects)
+        monkeypatch.setattr(partitioned_module, "get_object_etag", self.etag)
+
+    def etag(self, name):
+        return hashlib.md5(self.objects[name]).hexdigest() if name in self.objects else None
+
+
+@pytest.fixture(autouse=True)
+def exact_sketches(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "QUANTILE_SKETCH_K", 10000)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "amount": rng.normal(50, 10, n).round(3),
+        "city": rng.choice(["Rabat", "Paris", "Lyon", None], n),
+        "target": rng.integers(0, 2, n),
+    })
+    df.loc[::9, "amount"] = np.nan
+    return df
+
+
+def pieces(df, n=3):
+    size = len(df) // n
+    return [df.iloc[i * size:(i + 1) * size].reset_index(drop=True) for i in range(n)]
+
+
+@pytest.fixture
+def store(monkeypatch, frame):
+    store = FakeStore()
+    for day, part in enumerate(pieces(frame), start=1):
+        store.put(f"raw/events/2024-01-0{day}.csv", part.to_csv(index=False))
+    store.put("raw/events/_SUCCESS", b"")
+    store.install(monkeypatch)
+    return store
+
+
+def read_parts(store, manifest):
+    frames = [pd.read_parquet(io.BytesIO(store.objects[e["object"]])) for e in manifest["partitions"]]
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestFittedPipeline:
+    def test_waves_group_independent_steps(self, frame):
+        steps = _auto_generate_pipeline(frame, target_column="target")["steps"]
+        # fill_median + fill_mode in one pass, label encoding + scaling in the next
+        assert fit_waves(steps) == [[1, 2], [3, 4]]
+        assert fit_waves([{"type": "handle_missing", "method": "fill_mean"},
+                          {"type": "scale_numeric", "columns": ["amount"]}]) == [[0], [1]]
+
+    @pytest.mark.parametrize("encoding", ["label", "onehot"])
+    def test_matches_single_run(self, frame, encoding):
+        conf = _auto_generate_pipeline(frame, target_column="target")
+        for step in conf["steps"]:
+            if step["type"] == "encode_categorical":
+                step["method"] = encoding
+        parts = pieces(frame)
+
+        fitted = fit_pipeline(conf["steps"], [0, 1, 2], lambda i: parts[i], workers=3)
+        combined = pd.concat([fitted.transform(p) for p in parts], ignore_index=True)
+
+        pd.testing.assert_frame_equal(combined, run_pipeline(frame, conf), check_exact=False, atol=1e-9)
+
+    def test_roundtrip_and_unseen_categories(self, frame):
+        steps = [{"type": "encode_categorical", "method": "label", "columns": ["city"]},
+                 {"type": "scale_numeric", "method": "minmax", "columns": ["amount"]}]
+        parts = pieces(frame)
+        fitted = fit_pipeline(steps, [0, 1], lambda i: parts[i])
+        restored = FittedPipeline.from_dict(json.loads(json.dumps(fitted.to_dict())))
+
+        new = parts[2].assign(city="Tokyo")
+        out = restored.transform(new)
+        assert (out["city"] == -1).all()
+        pd.testing.assert_frame_equal(out, fitted.transform(new))
+
+    def test_onehot_refit_keeps_columns(self, frame):
+        steps = [{"type": "encode_categorical", "method": "onehot", "columns": ["city"]}]
+        parts = pieces(frame)
+        fitted = fit_pipeline(steps, [0, 1], lambda i: parts[i])
+        before = fitted.fitted[0]["params"]
+        columns = list(fitted.transform(parts[0]).columns)
+
+        new = parts[2].assign(city=["Tokyo", "Paris"] * (len(parts[2]) // 2))
+        fitted.refit(fitted.partial_states(new, [0]))
+        assert fitted.fitted[0]["params"] == before
+        out = fitted.transform(new)
+        assert list(out.columns) == columns
+        assert out.loc[::2, [c for c in columns if c.startswith("city_")]].sum().sum() == 0
+
+
+class TestPartitionedPrepare:
+    def test_writes_parts_and_manifest(self, store, frame):
+        result = prepare_partitioned("raw/events/", "events", None, target_column="target", workers=2)
+        manifest = result["manifest"]
+
+        assert manifest["complete"] and manifest["rows"] == len(frame)
+        assert [e["object"] for e in manifest["partitions"]] == [
+            f"processed/events/part-2024-01-0{d}.parquet" for d in (1, 2, 3)
+        ]
+        assert "processed/events/_fitted.json" in store.objects
+        assert json.loads(store.objects["processed/events/_manifest.json"])["rows"] == len(frame)
+
+        expected = run_pipeline(frame, _auto_generate_pipeline(pieces(frame)[0], target_column="target"))
+        pd.testing.assert_frame_equal(read_parts(store, manifest), expected, check_exact=False,
+                                      atol=1e-9, check_dtype=False)
+        # Every raw partition is downloaded once; fit passes reuse the local copy
+        assert sorted(store.downloads) == sorted(set(store.downloads))
+
+    def test_resume_skips_finished_partitions(self, store, frame):
+        prepare_partitioned("raw/events/", "events", None, target_column="target")
+        fitted_before = store.objects["processed/events/_fitted.json"]
+
+        again = prepare_partitioned("raw/events/", "events", None, target_column="target")
+        assert again["processed"] == [] and len(again["skipped"]) == 3
+
+        changed = pieces(frame)[1].assign(amount=1.0)
+        store.put("raw/events/2024-01-02.csv", changed.to_csv(index=False))
+        store.downloads.clear()
+        third = prepare_partitioned("raw/events/", "events", None, target_column="target")
+        assert third["processed"] == ["raw/events/2024-01-02.csv"]
+        assert store.downloads == ["raw/events/2024-01-02.csv"]
+        assert store.objects["processed/events/_fitted.json"] == fitted_before
+
+    def test_failed_partition_is_retried(self, store):
+        store.put("raw/events/2024-01-02.csv", b'id,amount\n1,"unterminated\n')
+        first = prepare_partitioned("raw/events/", "events", {"steps": []}, pattern="*.csv")
+        assert [f["source"] for f in first["failed"]] == ["raw/events/2024-01-02.csv"]
+        assert not first["manifest"]["complete"]
+
+        store.put("raw/events/2024-01-02.csv", "id,amount,city,target\n1,2.0,Rabat,0\n")
+        second = prepare_partitioned("raw/events/", "events", {"steps": []}, pattern="*.csv")
+        assert second["processed"] == ["raw/events/2024-01-02.csv"]
+        assert second["manifest"]["complete"]
+
+    def test_pipeline_change_requires_fresh_run(self, store):
+        prepare_partitioned("raw/events/", "events", {"steps": []})
+        with pytest.raises(ValueError):
+            prepare_partitioned("raw/events/", "events", {"steps": [{"type": "drop_columns", "columns": ["id"]}]})
+        fresh = prepare_partitioned("raw/events/", "events", {"steps": [{"type": "drop_columns", "columns": ["id"]}]},
+                                    resume=False)
+        assert "id" not in fresh["manifest"]["columns"]
+
+
+class TestAppend:
+    @pytest.fixture
+    def prepared(self, store, frame):
+        """Dataset prepared from the first two days; day three arrives later"""
+        prepare_partitioned("raw/events/", "events", None, pattern="2024-01-0[12].csv", target_column="target")
+        store.downloads.clear()
+        return json.loads(store.objects["processed/events/_fitted.json"])
+
+    def test_append_with_frozen_params(self, store, frame, prepared):
+        result = append_partition("raw/events/2024-01-03.csv", "events")
+
+        assert result["appended"] and not result["refitted"]
+        assert store.downloads == ["raw/events/2024-01-03.csv"]
+        manifest = result["manifest"]
+        assert len(manifest["partitions"]) == 3 and manifest["rows"] == len(frame)
+        assert json.loads(store.objects["processed/events/_fitted.json"]) == prepared
+
+        appended = pd.read_parquet(io.BytesIO(store.objects["processed/events/part-2024-01-03.parquet"]))
+        expected = FittedPipeline.from_dict(prepared).transform(pieces(frame)[2])
+        pd.testing.assert_frame_equal(appended, expected, check_dtype=False)
+
+        # Appending the same object again is a no-op; a resumed run sees it as done
+        assert not append_partition("raw/events/2024-01-03.csv", "events")["appended"]
+        assert prepare_partitioned("raw/events/", "events", None)["processed"] == []
+
+    def test_refit_merges_new_statistics(self, store, frame, prepared):
+        day3 = pieces(frame)[2].copy()
+        day3.loc[:5, "city"] = "Agadir"
+        store.put("raw/events/2024-01-03.csv", day3.to_csv(index=False))
+
+        result = append_partition("raw/events/2024-01-03.csv", "events", refit=True)
+        assert result["refitted"] and result["manifest"]["fitted_revision"] == 2
+        assert result["entry"]["fitted_revision"] == 2
+        assert json.loads(store.objects["processed/events/_fitted-r1.json"]) == prepared
+
+        refitted = json.loads(store.objects["processed/events/_fitted.json"])["fitted"]
+        full = fit_pipeline(prepared["steps"], [0, 1, 2], lambda i: [*pieces(frame)[:2], day3][i])
+        # Imputed median is exact; scaling moments were computed after the old imputation
+        assert refitted[1]["params"] == full.fitted[1]["params"]
+        scaling, expected = refitted[4]["params"]["scaling"]["amount"], full.fitted[4]["params"]["scaling"]["amount"]
+        assert scaling["shift"] == pytest.approx(expected["shift"], rel=1e-3)
+        assert scaling["scale"] == pytest.approx(expected["scale"], rel=1e-3)
+        # Codes of known categories are kept, the new one is appended
+        old_codes = prepared["fitted"][3]["params"]["categories"]["city"]
+        assert refitted[3]["params"]["categories"]["city"] == old_codes + ["Agadir"]
+
+    def test_missing_dataset(self, store):
+        with pytest.raises(FileNotFoundError):
+            append_partition("raw/events/2024-01-03.csv", "nothing")
+
+
+class TestPartitionedAPI:
+    def test_endpoint(self, store, frame, monkeypatch):
+        monkeypatch.setattr(prepare_module.pipeline_cache, "get", lambda path, required=True: None)
+
+        async def published(step, payload):
+            published.calls.append(payload)
+        published.calls = []
+        monkeypatch.setattr(prepare_module, "publish_step_done", published)
+        client = TestClient(app)
+
+        resp = client.post("/prepare/partitioned", data={
+            "pipeline_id": "p1", "prefix": "raw/events", "pattern": "2024-01-0[12].csv", "target_column": "target",
+        })
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["manifest_object"] == "processed/events/_manifest.json"
+        assert (body["partitions"], body["processed"], body["rows"]) == (2, 2, 2000)
+        assert "target" not in body["feature_columns"]
+        assert published.calls == [{"pipelineId": "p1", "step": "DataPreparer", "status": "SUCCESS"}]
+
+        missing = client.post("/prepare/partitioned", data={"pipeline_id": "p1", "prefix": "raw/none"})
+        assert missing.status_code == 404
+
+    def test_append_endpoint(self, store, monkeypatch):
+        async def published(step, payload):
+            pass
+        monkeypatch.setattr(prepare_module, "publish_step_done", published)
+        prepare_partitioned("raw/events/", "events", {"steps": []}, pattern="2024-01-01.csv")
+        client = TestClient(app)
+
+        resp = client.post("/prepare/append", data={
+            "pipeline_id": "p1", "minio_object": "raw/events/2024-01-02.csv", "output": "events",
+        })
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["appended"] and (body["partitions"], body["rows_appended"], body["rows"]) == (2, 1000, 2000)
+
+        missing = client.post("/prepare/append", data={
+            "pipeline_id": "p1", "minio_object": "raw/events/2024-01-02.csv", "output": "other",
+        })
+        assert missing.status_code == 404
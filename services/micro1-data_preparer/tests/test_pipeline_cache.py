@@ -0,0 +1,102 @@
+# tests/test_pipeline_cache.py
+# --------------------------------------------------------------------
+# Tests for the ETag-validated pipeline config cache. Storage calls are
+# replaced with an in-memory fake so the number of round trips can be
+# asserted.
+# --------------------------------------------------------------------
+import pytest
+import yaml
+
+from app.services import pipeline_cache as cache_module
+from app.services.pipeline_cache import PipelineConfigCache
+
+
+class FakeStore:
+    def __init__(self):
+        self.objects = {}
+        self.stats = 0
+        self.downloads = 0
+
+    def etag(self, path):
+        self.stats += 1
+        obj = self.objects.get(path)
+        return None if obj is None else obj[1]
+
+    def download(self, path):
+        self.downloads += 1
+        return self.objects[path][0]
+
+    def write(self, path, conf, etag):
+        self.objects[path] = (yaml.dump(conf).encode(), etag)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    fake = FakeStore()
+    monkeypatch.setattr(cache_module, "get_object_etag", fake.etag)
+    monkeypatch.setattr(cache_module, "download_bytes", fake.download)
+    return fake
+
+
+CONF = {"steps": [{"type": "drop_columns", "columns": ["id"]}]}
+
+
+class TestPipelineConfigCache:
+    """Tests for PipelineConfigCache"""
+
+    def test_hit_within_ttl_skips_storage(self, store):
+        store.write("pipelines/a.yml", CONF, "e1")
+        cache = PipelineConfigCache(ttl=60, negative_ttl=60)
+
+        assert cache.get("pipelines/a.yml") == CONF
+        assert cache.get("pipelines/a.yml") == CONF
+        assert (store.stats, store.downloads) == (1, 1)
+
+    def test_unchanged_etag_skips_download(self, store):
+        store.write("pipelines/a.yml", CONF, "e1")
+        cache = PipelineConfigCache(ttl=0, negative_ttl=60)
+
+        cache.get("pipelines/a.yml")
+        cache.get("pipelines/a.yml")
+        assert (store.stats, store.downloads) == (2, 1)
+
+    def test_changed_etag_reloads(self, store):
+        store.write("pipelines/a.yml", CONF, "e1")
+        cache = PipelineConfigCache(ttl=0, negative_ttl=60)
+        cache.get("pipelines/a.yml")
+
+        updated = {"steps": [{"type": "parse_dates", "columns": ["d"]}]}
+        store.write("pipelines/a.yml", updated, "e2")
+        assert cache.get("pipelines/a.yml") == updated
+        assert store.downloads == 2
+
+    def test_negative_caching(self, store):
+        cache = PipelineConfigCache(ttl=60, negative_ttl=60)
+
+        assert cache.get("pipelines/missing.yml", required=False) is None
+        assert cache.get("pipelines/missing.yml", required=False) is None
+        assert store.stats == 1
+        with pytest.raises(FileNotFoundError):
+            cache.get("pipelines/missing.yml")
+
+    def test_put_replaces_negative_entry(self, store):
+        cache = PipelineConfigCache(ttl=60, negative_ttl=60)
+        cache.get("pipelines/new.yml", required=False)
+
+        cache.put("pipelines/new.yml", CONF, etag="e9")
+        assert cache.get("pipelines/new.yml") == CONF
+        assert store.downloads == 0
+
+    def test_invalid_config_rejected(self, store):
+        store.objects["pipelines/bad.yml"] = (b"just: a mapping", "e1")
+        cache = PipelineConfigCache(ttl=60, negative_ttl=60)
+
+        with pytest.raises(ValueError, match="steps"):
+            cache.get("pipelines/bad.yml")
+
+    def test_returned_config_is_a_copy(self, store):
+        store.write("pipelines/a.yml", CONF, "e1")
+        cache = PipelineConfigCache(ttl=60, negative_ttl=60)
+
+        cache.get("pipelines/a.yml")["steps"].clear()
+        assert cache.get("pipelines/a.yml") == CONF
@@ -0,0 +1,85 @@
+# tests/test_quantile_sketch.py
+# --------------------------------------------------------------------
+# Unit tests for the mergeable quantile sketch and its pipeline usage.
+# --------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.quantile_sketch import QuantileSketch, sketch_series
+
+
+class TestQuantileSketch:
+    """Tests for QuantileSketch"""
+
+    def test_small_input_is_exact(self):
+        """Sketch matches pandas exactly while under capacity"""
+        values = pd.Series([5.0, 1.0, None, 3.0, 100.0, 2.0])
+        sketch = sketch_series(values)
+
+        assert sketch.is_exact
+        assert sketch.n == 5
+        assert sketch.quantile(0.5) == values.median()
+        assert sketch.quantile(0.25) == values.quantile(0.25)
+
+    def test_large_input_within_rank_error(self):
+        """Approximate quantiles stay within the advertised rank error"""
+        rng = np.random.default_rng(7)
+        values = rng.normal(size=200_000)
+        sketch = QuantileSketch(k=200).update(values)
+
+        assert not sketch.is_exact
+        for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+            estimate = sketch.quantile(q)
+            true_rank = np.mean(values <= estimate)
+            assert abs(true_rank - q) <= 2 * sketch.rank_error
+
+    def test_merge_matches_single_sketch(self):
+        """Sketches built on chunks merge into an equivalent summary"""
+        rng = np.random.default_rng(3)
+        values = rng.exponential(size=100_000)
+        parts = [QuantileSketch(k=200, seed=i).update(chunk) for i, chunk in enumerate(np.array_split(values, 8))]
+
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+
+        assert merged.n == values.size
+        assert merged.min == values.min()
+        assert merged.max == values.max()
+        assert abs(np.mean(values <= merged.quantile(0.5)) - 0.5) <= 2 * merged.rank_error
+
+    def test_odd_compaction_leaves_either_end(self):
+        left = set()
+        for seed in range(20):
+            sketch = QuantileSketch(k=8, seed=seed).update(np.arange(9.0))
+            assert len(sketch.to_dict()["levels"][0]) == 1
+            left.add(sketch.to_dict()["levels"][0][0])
+        assert left == {0.0, 8.0}
+
+    def test_from_error_and_roundtrip(self):
+        """Error-sized sketches survive serialisation"""
+        sketch = QuantileSketch.from_error(0.01).update(np.arange(10_000, dtype=float))
+        assert sketch.rank_error <= 0.01
+
+        restored = QuantileSketch.from_dict(sketch.to_dict())
+        assert restored.n == sketch.n
+        assert restored.quantile(0.5) == sketch.quantile(0.5)
+
+    def test_invalid_error_raises(self):
+        with pytest.raises(ValueError):
+            QuantileSketch.from_error(0)
+
+    def test_empty_sketch_returns_nan(self):
+        assert np.isnan(QuantileSketch().quantile(0.5))
+
+    def test_robust_scaling_uses_configured_error(self):
+        """Robust scaling accepts a per-step quantile error"""
+        from app.services.pipeline import run_pipeline
+
+        df = pd.DataFrame({"a": np.arange(5_000, dtype=float)})
+        config = {"steps": [{"type": "scale_numeric", "method": "robust", "columns": ["a"], "quantile_error": 0.01}]}
+
+        result = run_pipeline(df, pipeline_conf=config)
+
+        assert abs(result["a"].median()) < 0.05
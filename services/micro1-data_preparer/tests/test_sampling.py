@@ -0,0 +1,87 @@
+# tests/test_sampling.py
+# --------------------------------------------------------------------
+# Tests for deterministic stratified sampling.
+# --------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.pipeline import run_pipeline
+from app.services.sampling import parse_sample_specs, sample_label, stratified_sample
+
+
+@pytest.fixture
+def imbalanced():
+    rng = np.random.default_rng(1)
+    n = 10000
+    return pd.DataFrame({
+        "x": rng.normal(size=n),
+        "target": rng.choice(["a", "b", "rare"], n, p=[0.7, 0.299, 0.001]),
+        "amount": rng.exponential(100, n),
+    })
+
+
+class TestSampleSpecs:
+    def test_parse(self):
+        assert parse_sample_specs("0.01, 0.1,5000") == [0.01, 0.1, 5000]
+        assert parse_sample_specs(None) == []
+
+    @pytest.mark.parametrize("value", ["0", "-1", "1.5", "abc"])
+    def test_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_sample_specs(value)
+
+    def test_labels(self):
+        assert sample_label(0.01) == "1pct"
+        assert sample_label(0.1) == "10pct"
+        assert sample_label(0.005) == "0_5pct"
+        assert sample_label(5000) == "5000rows"
+
+
+class TestStratifiedSample:
+    def test_fraction_preserves_class_ratios(self, imbalanced):
+        sample = stratified_sample(imbalanced, fraction=0.1, stratify="target")
+        assert len(sample) == 1000
+        full = imbalanced["target"].value_counts()
+        part = sample["target"].value_counts()
+        for label in ("a", "b"):
+            assert abs(part[label] - full[label] * 0.1) <= 2
+        assert part["rare"] >= 1  # rare classes are kept
+        assert sample.index.is_monotonic_increasing
+
+    def test_fixed_count_and_determinism(self, imbalanced):
+        first = stratified_sample(imbalanced, n=500, stratify="target", seed=7)
+        second = stratified_sample(imbalanced, n=500, stratify="target", seed=7)
+        other = stratified_sample(imbalanced, n=500, stratify="target", seed=8)
+        assert len(first) == 500
+        pd.testing.assert_frame_equal(first, second)
+        assert not first.index.equals(other.index)
+
+    def test_numeric_target_is_binned(self, imbalanced):
+        sample = stratified_sample(imbalanced, fraction=0.05, stratify="amount")
+        assert len(sample) == 500
+        assert abs(sample["amount"].median() - imbalanced["amount"].median()) < 10
+
+    def test_unstratified_and_oversized(self, imbalanced):
+        assert len(stratified_sample(imbalanced, n=123)) == 123
+        assert stratified_sample(imbalanced, n=10 ** 6) is imbalanced
+
+    def test_invalid_arguments(self, imbalanced):
+        with pytest.raises(ValueError):
+            stratified_sample(imbalanced)
+        with pytest.raises(ValueError):
+            stratified_sample(imbalanced, fraction=0.1, n=10)
+        with pytest.raises(ValueError):
+            stratified_sample(imbalanced, fraction=0.1, stratify="missing")
+
+
+class TestSampleStep:
+    def test_pipeline_step(self, imbalanced):
+        steps = [{"type": "sample", "fraction": 0.01, "stratify": "target"}]
+        result = run_pipeline(imbalanced, {"steps": steps})
+        assert len(result) == 100
+        assert set(result["target"]) == {"a", "b", "rare"}
+
+    def test_missing_stratify_column_samples_unstratified(self, imbalanced):
+        result = run_pipeline(imbalanced, {"steps": [{"type": "sample", "n": 50, "stratify": "nope"}]})
+        assert len(result) == 50
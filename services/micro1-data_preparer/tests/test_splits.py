@@ -0,0 +1,85 @@
+# tests/test_splits.py
+# --------------------------------------------------------------------
+# Tests for materialized train/val/test splits and k-fold assignments.
+# --------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.splits import (
+    assign_folds, assign_splits, build_split_index, parse_split_ratios, split_counts
+)
+
+
+@pytest.fixture
+def labelled():
+    rng = np.random.default_rng(3)
+    n = 2000
+    return pd.DataFrame({
+        "x": rng.normal(size=n),
+        "target": rng.choice([0, 1, 2], n, p=[0.6, 0.3, 0.1]),
+    })
+
+
+class TestSplitRatios:
+    def test_parse(self):
+        assert parse_split_ratios("0.7,0.15,0.15") == pytest.approx([0.7, 0.15, 0.15])
+        assert parse_split_ratios("8,2") == pytest.approx([0.8, 0.0, 0.2])
+        assert parse_split_ratios(None) is None
+
+    @pytest.mark.parametrize("value", ["0.5", "0,0.5,0.5", "a,b,c", "0.7,-0.1,0.4"])
+    def test_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_split_ratios(value)
+
+
+class TestAssignSplits:
+    def test_sizes_and_stratification(self, labelled):
+        splits = assign_splits(labelled, [0.7, 0.15, 0.15], stratify="target")
+        assert abs((splits == 0).sum() - 1400) <= 3
+        assert abs((splits == 2).sum() - 300) <= 3
+
+        full = labelled["target"].value_counts(normalize=True)
+        for code in (0, 1, 2):
+            part = labelled["target"][splits == code].value_counts(normalize=True)
+            assert (part - full).abs().max() < 0.01
+
+    def test_deterministic(self, labelled):
+        a = assign_splits(labelled, [0.8, 0.0, 0.2], seed=5)
+        b = assign_splits(labelled, [0.8, 0.0, 0.2], seed=5)
+        c = assign_splits(labelled, [0.8, 0.0, 0.2], seed=6)
+        np.testing.assert_array_equal(a, b)
+        assert not np.array_equal(a, c)
+        assert (a == 1).sum() == 0
+
+
+class TestAssignFolds:
+    def test_folds_cover_non_test_rows(self, labelled):
+        splits = assign_splits(labelled, [0.8, 0.0, 0.2], stratify="target")
+        folds = assign_folds(labelled, 5, splits, stratify="target")
+
+        assert (folds[splits == 2] == -1).all()
+        fold_sizes = np.bincount(folds[splits != 2])
+        assert len(fold_sizes) == 5
+        assert fold_sizes.max() - fold_sizes.min() <= 3
+        for fold in range(5):
+            share = (labelled["target"][folds == fold] == 2).mean()
+            assert abs(share - 0.1) < 0.03
+
+    def test_needs_two_folds(self, labelled):
+        with pytest.raises(ValueError):
+            assign_folds(labelled, 1)
+
+
+class TestSplitIndex:
+    def test_index_frame(self, labelled):
+        index = build_split_index(labelled, [0.7, 0.15, 0.15], n_folds=3, stratify="target")
+        assert list(index.columns) == ["row", "split", "fold"]
+        assert len(index) == len(labelled)
+        counts = split_counts(index)
+        assert sum(counts.values()) == len(labelled)
+        assert set(index.loc[index["split"] == "test", "fold"]) == {-1}
+
+    def test_missing_stratify_column(self, labelled):
+        with pytest.raises(ValueError):
+            build_split_index(labelled, [0.8, 0.0, 0.2], stratify="nope")
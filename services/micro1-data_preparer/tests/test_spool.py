@@ -0,0 +1,57 @@
+# tests/test_spool.py
+# --------------------------------------------------------------------
+# Tests for disk-spooled upload ingestion.
+# --------------------------------------------------------------------
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.services.ingest import UnsupportedFormatError
+from app.services.spool import spool_chunks, spool_upload
+
+CSV = b"a,b,c\n" + b"".join(f"{i},{i * 2},x{i}\n".encode() for i in range(1000))
+
+
+@pytest.fixture(autouse=True)
+def spool_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SPOOL_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestSpool:
+    """Tests for spool_upload / spool_chunks"""
+
+    def test_upload_streams_in_chunks(self):
+        upload = UploadFile(file=io.BytesIO(CSV), filename="data.csv")
+        spooled = asyncio.run(spool_upload(upload, chunk_size=100))
+
+        with spooled:
+            assert spooled.size == len(CSV)
+            assert spooled.sha256 == hashlib.sha256(CSV).hexdigest()
+            assert spooled.format.format == "csv"
+            df = spooled.read(columns=["a", "c"])
+            assert list(df.columns) == ["a", "c"]
+            assert len(df) == 1000
+        assert not os.path.exists(spooled.path)
+
+    def test_unsupported_rejected_and_cleaned_up(self, spool_dir):
+        chunks = iter([b"hello world, this is not a dataset"] * 3)
+
+        with pytest.raises(UnsupportedFormatError):
+            spool_chunks(chunks, "notes.txt")
+        assert os.listdir(spool_dir) == []
+
+    def test_short_input_is_sniffed_at_end(self):
+        with spool_chunks(iter([b"a\n1\n"]), "tiny.csv") as spooled:
+            assert spooled.format.format == "csv"
+            assert spooled.read()["a"].tolist() == [1]
+
+    def test_empty_input(self):
+        with spool_chunks(iter([]), "empty.csv") as spooled:
+            assert spooled.size == 0
+            assert spooled.format is None
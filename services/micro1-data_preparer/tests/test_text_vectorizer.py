@@ -0,0 +1,106 @@
+# tests/test_text_vectorizer.py
+# --------------------------------------------------------------------
+# Tests for the 'vectorize_text' step (streaming hashing vectorizer).
+# --------------------------------------------------------------------
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.services.autodetect import detect_metadata, metadata_to_pipeline_config
+from app.services.partitioned import frame_to_parquet
+from app.services.pipeline import run_pipeline
+from app.services.text_vectorizer import tokenize, vectorize_column, vectorize_text
+
+
+@pytest.fixture
+def reviews():
+    rng = np.random.default_rng(3)
+    words = np.array(["great", "product", "terrible", "service", "fast", "delivery", "would", "buy", "again"])
+    texts = [" ".join(rng.choice(words, rng.integers(4, 12))) for _ in range(500)]
+    texts[7] = None
+    return pd.DataFrame({"review": texts, "stars": rng.integers(1, 6, 500)})
+
+
+class TestTokenize:
+    def test_unigrams_and_bigrams(self):
+        positions, tokens = tokenize(pd.Series(["The quick fox", None, "Lazy dog"]), ngram_range=(1, 2))
+        pairs = set(zip(positions.tolist(), tokens.tolist()))
+        assert {(0, "the"), (0, "quick fox"), (2, "lazy dog")} <= pairs
+        # No n-gram spans two rows
+        assert (0, "fox lazy") not in pairs and all(p != 1 for p in positions)
+
+    def test_empty(self):
+        positions, tokens = tokenize(pd.Series(["", None, "a"]))
+        assert positions.size == 0 and tokens.size == 0
+
+
+class TestVectorize:
+    def test_fixed_width_and_sparse(self, reviews):
+        out = vectorize_column(reviews["review"], {"n_features": 64})
+        assert out.shape == (500, 64)
+        assert all(isinstance(dtype, pd.SparseDtype) for dtype in out.dtypes)
+        assert out.columns[0] == "review__h00" and out.columns[-1] == "review__h63"
+        assert out.iloc[7].sum() == 0
+
+    def test_chunks_do_not_change_the_result(self, reviews):
+        step = {"n_features": 128, "ngram_range": [1, 2]}
+        whole = vectorize_column(reviews["review"], {**step, "chunk_rows": 10_000})
+        chunked = vectorize_column(reviews["review"], {**step, "chunk_rows": 37})
+        pd.testing.assert_frame_equal(whole, chunked)
+
+    def test_counts_and_norms(self):
+        texts = pd.Series(["spam spam spam eggs", "eggs"])
+        counts = vectorize_column(texts, {"n_features": 1024, "norm": None, "alternate_sign": False})
+        assert sorted(counts.iloc[0][counts.iloc[0] != 0].tolist()) == [1.0, 3.0]
+
+        binary = vectorize_column(texts, {"n_features": 1024, "norm": None, "binary": True, "alternate_sign": False})
+        assert binary.iloc[0].sum() == 2.0
+
+        l2 = vectorize_column(texts, {"n_features": 1024})
+        dense = l2.sparse.to_dense().to_numpy()
+        assert np.linalg.norm(dense, axis=1) == pytest.approx([1.0, 1.0], abs=1e-6)
+
+    def test_same_token_same_column(self):
+        a = vectorize_column(pd.Series(["refund please"], name="t"), {"n_features": 256, "norm": None})
+        b = vectorize_column(pd.Series(["nothing", "please refund"], name="t"), {"n_features": 256, "norm": None})
+        pd.testing.assert_series_equal(a.iloc[0], b.iloc[1], check_names=False)
+
+    def test_pipeline_step(self, reviews):
+        steps = [{"type": "vectorize_text", "columns": ["review", "missing"], "n_features": 32}]
+        out = run_pipeline(reviews, {"steps": steps})
+        assert "review" not in out.columns and out.shape == (500, 33)
+
+        kept = vectorize_text(reviews, {"columns": ["review"], "n_features": 32, "drop": False})
+        assert "review" in kept.columns
+
+    def test_parquet_stores_dense(self, reviews):
+        out = vectorize_column(reviews["review"], {"n_features": 16})
+        back = pd.read_parquet(io.BytesIO(frame_to_parquet(out)))
+        assert (back.dtypes == np.float32).all()
+        np.testing.assert_array_equal(back.to_numpy(), out.sparse.to_dense().to_numpy())
+
+
+class TestDetectText:
+    def test_text_columns_are_hashed(self, reviews):
+        df = reviews.assign(color=np.where(reviews["stars"] > 2, "red", "blue"))
+        meta = detect_metadata(df)
+        assert meta["text_columns"] == ["review"]
+        assert "review" not in meta["categorical_columns"] + meta["id_columns"]
+
+        steps = metadata_to_pipeline_config(meta, target_column="stars", vectorize_text=True)["steps"]
+        assert steps[-1] == {"type": "vectorize_text", "columns": ["review"]}
+
+    def test_auto_pipeline_hashing_is_opt_in(self, reviews, monkeypatch):
+        meta = detect_metadata(reviews)
+        monkeypatch.setattr(settings, "AUTO_VECTORIZE_TEXT", False)
+        steps = metadata_to_pipeline_config(meta, target_column="stars")["steps"]
+        assert all(step["type"] != "vectorize_text" for step in steps)
+        encode = [step for step in steps if step["type"] == "encode_categorical"]
+        assert encode and "review" in encode[0]["columns"]
+
+        monkeypatch.setattr(settings, "AUTO_VECTORIZE_TEXT", True)
+        steps = metadata_to_pipeline_config(meta, target_column="stars")["steps"]
+        assert steps[-1]["type"] == "vectorize_text"
@@ -0,0 +1,283 @@
+# tests/test_upload.py
+# --------------------------------------------------------------------
+# Tests for resumable multipart uploads. MinIO multipart calls are
+# replaced with an in-memory fake; detection runs on the assembled bytes.
+# --------------------------------------------------------------------
+import base64
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import detect_router as detect_module
+from app.api import upload_router as upload_module
+from app.api.upload_router import verify_part_checksum
+from app.core.config import settings
+from app.main import app
+
+CSV = b"a,b,target\n" + b"".join(f"{i},{i % 7},{i % 2}\n".encode() for i in range(500))
+
+
+def md5_b64(data):
+    return base64.b64encode(hashlib.md5(data).digest()).decode()
+
+
+class FakeMultipart:
+    def __init__(self):
+        self.uploads = {}
+        self.objects = {}
+
+    def create(self, object_name, content_type="application/octet-stream"):
+        upload_id = f"up-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = (object_name, {})
+        return upload_id
+
+    def upload_part(self, object_name, upload_id, part_number, data, content_md5):
+        assert content_md5 == md5_b64(data)
+        etag = hashlib.md5(data).hexdigest()
+        self.uploads[upload_id][1][part_number] = (data, etag)
+        return etag
+
+    def list_parts(self, object_name, upload_id):
+        parts = self.uploads[upload_id][1]
+        return [
+            SimpleNamespace(part_number=n, etag=etag, size=len(data))
+            for n, (data, etag) in sorted(parts.items())
+        ]
+
+    def find(self, upload_id):
+        entry = self.uploads.get(upload_id)
+        return entry[0] if entry else None
+
+    def complete(self, object_name, upload_id, parts):
+        stored = self.uploads.pop(upload_id)[1]
+        self.objects[object_name] = b"".join(stored[n][0] for n in sorted(stored))
+
+    def abort(self, object_name, upload_id):
+        self.uploads.pop(upload_id)
+
+    def presign(self, object_name, expires_seconds):
+        return f"http://minio.test/bucket/{object_name}?X-Amz-Expires={expires_seconds}"
+
+    def iter_chunks(self, object_name, chunk_size):
+        if object_name not in self.objects:
+            raise FileNotFoundError(f"Object not found in MinIO: {object_name}")
+        data = self.objects[object_name]
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i + chunk_size]
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    fake = FakeMultipart()
+    monkeypatch.setattr(settings, "SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(upload_module, "create_multipart_upload", fake.create)
+    monkeypatch.setattr(upload_module, "upload_part", fake.upload_part)
+    monkeypatch.setattr(upload_module, "list_uploaded_parts", fake.list_parts)
+    monkeypatch.setattr(upload_module, "find_multipart_upload", fake.find)
+    monkeypatch.setattr(upload_module, "complete_multipart_upload", fake.complete)
+    monkeypatch.setattr(upload_module, "abort_multipart_upload", fake.abort)
+    monkeypatch.setattr(upload_module, "presigned_put_url", fake.presign)
+    monkeypatch.setattr(detect_module, "iter_object_chunks", fake.iter_chunks)
+    upload_module._sessions.clear()
+    return fake
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestPartChecksum:
+    """Tests for verify_part_checksum"""
+
+    def test_md5_and_sha256_accepted(self):
+        data = b"some part"
+        assert verify_part_checksum(data, md5_b64(data), None) == md5_b64(data)
+        assert verify_part_checksum(data, None, hashlib.sha256(data).hexdigest()) == md5_b64(data)
+
+    def test_missing_checksum(self):
+        with pytest.raises(ValueError, match="required"):
+            verify_part_checksum(b"x", None, None)
+
+    def test_mismatch(self):
+        with pytest.raises(ValueError, match="Content-MD5"):
+            verify_part_checksum(b"x", md5_b64(b"y"), None)
+        with pytest.raises(ValueError, match="SHA256"):
+            verify_part_checksum(b"x", None, hashlib.sha256(b"y").hexdigest())
+
+
+class TestUploadAPI:
+    """Tests for the /uploads endpoints"""
+
+    def test_parts_out_of_order_then_complete(self, client, store):
+        init = client.post("/uploads", data={"filename": "../data.csv"}).json()
+        upload_id = init["upload_id"]
+        assert init["object_name"] == "raw/data.csv"
+
+        third = len(CSV) // 3
+        chunks = [CSV[:third], CSV[third:2 * third], CSV[2 * third:]]
+        for number in (3, 1, 2):
+            data = chunks[number - 1]
+            resp = client.put(
+                f"/uploads/{upload_id}/parts/{number}", content=data,
+                headers={"Content-MD5": md5_b64(data)}
+            )
+            assert resp.status_code == 200
+            assert resp.json()["size"] == len(data)
+
+        status = client.get(f"/uploads/{upload_id}").json()
+        assert [p["part_number"] for p in status["parts"]] == [1, 2, 3]
+
+        resp = client.post(f"/uploads/{upload_id}/complete", data={"store_to_minio": "false"})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert store.objects["raw/data.csv"] == CSV
+        assert body["parts"] == 3
+        assert body["size_bytes"] == len(CSV)
+        assert "target" in body["numeric_columns"] + body["categorical_columns"]
+        assert body["sha256"] == hashlib.sha256(CSV).hexdigest()
+
+    def test_resume_after_restart(self, client, store):
+        upload_id = client.post("/uploads", data={"filename": "data.csv"}).json()["upload_id"]
+        upload_module._sessions.clear()  # session registry lost
+
+        resp = client.put(
+            f"/uploads/{upload_id}/parts/1", content=CSV,
+            headers={"X-Checksum-SHA256": hashlib.sha256(CSV).hexdigest()}
+        )
+        assert resp.status_code == 200
+
+    def test_bad_checksum_rejected(self, client, store):
+        upload_id = client.post("/uploads", data={"filename": "data.csv"}).json()["upload_id"]
+
+        resp = client.put(f"/uploads/{upload_id}/parts/1", content=CSV, headers={"Content-MD5": md5_b64(b"x")})
+        assert resp.status_code == 400
+        resp = client.put(f"/uploads/{upload_id}/parts/1", content=CSV)
+        assert resp.status_code == 400
+        assert store.uploads[upload_id][1] == {}
+
+    def test_oversized_part(self, client, store, monkeypatch):
+        monkeypatch.setattr(settings, "UPLOAD_MAX_PART_SIZE", 100)
+        upload_id = client.post("/uploads", data={"filename": "data.csv"}).json()["upload_id"]
+
+        resp = client.put(f"/uploads/{upload_id}/parts/1", content=CSV, headers={"Content-MD5": md5_b64(CSV)})
+        assert resp.status_code == 413
+
+    def test_unknown_upload_and_abort(self, client, store):
+        assert client.get("/uploads/nope").status_code == 404
+
+        upload_id = client.post("/uploads", data={"filename": "data.csv"}).json()["upload_id"]
+        assert client.post(f"/uploads/{upload_id}/complete").status_code == 400
+        assert client.delete(f"/uploads/{upload_id}").json()["status"] == "aborted"
+        assert client.get(f"/uploads/{upload_id}").status_code == 404
+
+
+class TestPresignedUploadAPI:
+    """Tests for /uploads/presign and /uploads/presign/complete"""
+
+    def test_presign_then_complete(self, client, store):
+        resp = client.post("/uploads/presign", data={"filename": "big.csv"})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["method"] == "PUT"
+        assert body["object_name"] == "raw/big.csv"
+        assert body["url"].startswith("http://minio.test/bucket/raw/big.csv")
+
+        store.objects["raw/big.csv"] = CSV  # client PUTs straight to MinIO
+        resp = client.post("/uploads/presign/complete", data={"object_name": "raw/big.csv", "store_to_minio": "false"})
+        assert resp.status_code == 200
+        assert resp.json()["sha256"] == hashlib.sha256(CSV).hexdigest()
+
+    def test_complete_missing_object(self, client, store):
+        resp = client.post("/uploads/presign/complete", data={"object_name": "raw/missing.csv"})
+        assert resp.status_code == 404
+
+    def test_complete_rejects_other_prefixes(self, client, store):
+        for name in ("processed/x.csv", "raw/../pipelines/x.yml", "raw/"):
+            resp = client.post("/uploads/presign/complete", data={"object_name": name})
+            assert resp.status_code == 400
+
+    def test_url_signed_for_public_endpoint(self, monkeypatch):
+        from app.storage import minio_client
+
+        monkeypatch.setattr(settings, "MINIO_PUBLIC_ENDPOINT", "files.example.com:9443")
+        monkeypatch.setattr(settings, "MINIO_PUBLIC_SECURE", True)
+        monkeypatch.setattr(minio_client, "_public_client", None)
+        monkeypatch.setattr(minio_client, "ensure_bucket_exists", lambda: None)
+
+        url = minio_client.presigned_put_url("raw/big.csv", 60)
+        assert url.startswith(f"https://files.example.com:9443/{settings.MINIO_BUCKET}/raw/big.csv?")
+        assert "X-Amz-Signature=" in url
+
+
+class FakeMinio:
+    """Minio stand-in with the private multipart methods and plain object calls"""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+
+    def _create_multipart_upload(self, bucket, object_name, headers):
+        upload_id = f"id/{len(self.uploads) + 1}+"
+        self.uploads[upload_id] = object_name
+        return upload_id
+
+    def _abort_multipart_upload(self, bucket, object_name, upload_id):
+        del self.uploads[upload_id]
+
+    def _complete_multipart_upload(self, bucket, object_name, upload_id, parts):
+        self.objects[self.uploads.pop(upload_id)] = b""
+
+    def _list_multipart_uploads(self, *args, **kwargs):
+        raise AssertionError("upload ids must not be resolved by listing uploads")
+
+    def put_object(self, bucket_name, object_name, data, length, content_type):
+        self.objects[object_name] = data.read()
+
+    def get_object(self, bucket_name, object_name):
+        from minio.error import S3Error
+
+        if object_name not in self.objects:
+            raise S3Error(None, "NoSuchKey", "missing", object_name, "", "")
+        return SimpleNamespace(read=lambda: self.objects[object_name], close=lambda: None,
+                               release_conn=lambda: None)
+
+    def remove_object(self, bucket_name, object_name):
+        self.objects.pop(object_name, None)
+
+
+class TestUploadRecords:
+    """Upload id -> object name records kept next to the multipart uploads"""
+
+    @pytest.fixture
+    def fake_minio(self, monkeypatch):
+        from app.storage import minio_client
+
+        fake = FakeMinio()
+        monkeypatch.setattr(minio_client, "minio_client", fake)
+        monkeypatch.setattr(minio_client, "_multipart", minio_client._MultipartApi(fake))
+        monkeypatch.setattr(minio_client, "ensure_bucket_exists", lambda: None)
+        return fake
+
+    def test_upload_id_resolves_from_record(self, fake_minio):
+        from app.storage import minio_client
+
+        upload_id = minio_client.create_multipart_upload("raw/big.csv", "text/csv")
+        records = [name for name in fake_minio.objects if name.startswith(minio_client.UPLOAD_SESSION_PREFIX)]
+        assert len(records) == 1 and "/" not in records[0][len(minio_client.UPLOAD_SESSION_PREFIX):]
+        assert minio_client.find_multipart_upload(upload_id) == "raw/big.csv"
+        assert minio_client.find_multipart_upload("unknown") is None
+
+        minio_client.complete_multipart_upload("raw/big.csv", upload_id, [])
+        assert minio_client.find_multipart_upload(upload_id) is None
+        assert "raw/big.csv" in fake_minio.objects
+
+    def test_abort_forgets_upload(self, fake_minio):
+        from app.storage import minio_client
+
+        upload_id = minio_client.create_multipart_upload("raw/big.csv")
+        minio_client.abort_multipart_upload("raw/big.csv", upload_id)
+        assert minio_client.find_multipart_upload(upload_id) is None
+        assert fake_minio.uploads == {} and fake_minio.objects == {}
@@ -0,0 +1,91 @@
+# tests/test_validator.py
+# --------------------------------------------------------------------
+# Tests for declarative data-quality validation.
+# --------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.pipeline import run_pipeline
+from app.services.validator import DataValidationError, validate_dataframe
+
+
+@pytest.fixture
+def users():
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5, 5],
+        "age": [25, 31, None, 140, 52, 40],
+        "country": ["FR", "MA", "US", "XX", "FR", None],
+        "email": ["a@x.io", "b@y.io", "nope", "c@z.io", None, "d@x.io"],
+    })
+
+
+def by_check(report):
+    return {(c["column"], c["check"]): c for c in report["checks"]}
+
+
+class TestValidateDataframe:
+    def test_all_constraint_kinds(self, users):
+        rules = {
+            "row_count": {"min": 1, "max": 100},
+            "columns": {
+                "id": {"unique": True},
+                "age": {"max_null_ratio": 0.1, "min": 0, "max": 120},
+                "country": {"allowed": ["FR", "MA", "US"]},
+                "email": {"regex": r"[^@]+@[^@]+"},
+            },
+        }
+        report = validate_dataframe(users, rules)
+        checks = by_check(report)
+
+        assert not report["passed"]
+        assert report["failed_checks"] == 5
+        assert checks[(None, "row_count")]["passed"]
+        assert checks[("id", "unique")]["failing_rows"] == 2
+        assert checks[("age", "max_null_ratio")]["observed"] == pytest.approx(1 / 6, abs=1e-6)
+        assert checks[("age", "range")]["examples"] == [140.0]
+        assert checks[("country", "allowed")]["examples"] == ["XX"]
+        assert checks[("email", "regex")]["examples"] == ["nope"]
+
+    def test_passing_rules(self, users):
+        rules = {
+            "unique": ["id", "age"],
+            "columns": {"age": {"min": 0}, "country": {"max_null_ratio": 0.5}},
+        }
+        report = validate_dataframe(users.iloc[:5], rules)
+        assert report["passed"]
+        assert report["failed_checks"] == 0
+
+    def test_missing_and_non_numeric_columns(self, users):
+        report = validate_dataframe(users, {"row_count": {"min": 10}, "columns": {"zip": {}, "country": {"min": 0}}})
+        checks = by_check(report)
+        assert not checks[(None, "row_count")]["passed"]
+        assert not checks[("zip", "exists")]["passed"]
+        assert checks[("country", "range")]["expected"] == "numeric column"
+
+    def test_large_inputs_are_sampled(self):
+        n = 50000
+        df = pd.DataFrame({"code": np.where(np.arange(n) % 1000 == 0, "bad", "ok")})
+        report = validate_dataframe(df, {"columns": {"code": {"allowed": ["ok"], "max_null_ratio": 0}}}, sample_rows=5000)
+
+        checks = by_check(report)
+        assert report["sampled_rows"] == 5000
+        assert checks[("code", "allowed")]["sampled"]
+        assert not checks[("code", "allowed")]["passed"]
+        assert not checks[("code", "max_null_ratio")]["sampled"]
+
+
+class TestValidateStep:
+    def test_fail_fast_stops_pipeline(self, users):
+        steps = [
+            {"type": "validate", "columns": {"age": {"max": 120}}},
+            {"type": "scale_numeric", "method": "standard", "columns": ["age"]},
+        ]
+        with pytest.raises(DataValidationError) as info:
+            run_pipeline(users, {"steps": steps})
+        assert info.value.report["failed_checks"] == 1
+
+    def test_warn_only(self, users):
+        step = {"type": "validate", "fail_fast": False, "columns": {"age": {"max": 120}}}
+        result = run_pipeline(users, {"steps": [step]})
+        assert len(result) == len(users)
@@ -6,12 +6,11 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
 
-from app.services.model_catalog import ModelCatalog
+from app.services.model_catalog import model_catalog as catalog
 from app.models.response_models import ModelInfo
 from app.core.logger import logger
 
 router = APIRouter()
-catalog = ModelCatalog()
 
 
 @router.get("/")
@@ -13,9 +13,15 @@ from app.services.publisher import publish_step_done
 
 from app.services.model_selector import ModelSelectorService
 from app.services.dataset_analyzer import DatasetAnalyzer
+from app.services.dataset_profile import load_profile
+from app.services.analysis_cache import analysis_cache, analysis_key, normalize_analysis
 from app.models.request_models import SelectionRequest
 from app.models.response_models import SelectionResponse, ModelCandidate
 from app.storage.minio_client import download_bytes
+from app.storage.local_handoff import read_local_dataset
+from app.storage.flight_client import read_flight_dataset
+from app.storage.postgres_client import save_selection
+from app.core.config import settings
 from app.core.logger import logger
 
 router = APIRouter()
@@ -23,6 +29,40 @@ selector_service = ModelSelectorService()
 analyzer = DatasetAnalyzer()
 
 
+def _analyze_object(minio_object: str, task_type: Optional[str]) -> dict:
+    """Analyze a prepared dataset, from its profile when the DataPreparer stored one"""
+    # Profile stored by the DataPreparer: analyze without loading the dataset
+    profile = load_profile(minio_object)
+    if profile is not None:
+        if profile["n_rows"] == 0:
+            raise HTTPException(status_code=400, detail="Dataset is empty")
+        return analyzer.analyze_profile(profile, task_type)
+    
+    try:
+        # Colocated DataPreparer: memory-mapped Arrow copy; then Flight; then MinIO
+        df = read_local_dataset(minio_object)
+        if df is None:
+            df = read_flight_dataset(minio_object)
+        if df is None:
+            logger.info(f"Loading dataset from MinIO: {minio_object}")
+            raw_data = download_bytes(minio_object)
+            df = pd.read_csv(io.BytesIO(raw_data))
+        
+        if df.empty:
+            raise HTTPException(status_code=400, detail="Dataset is empty")
+        
+        logger.info(f"Loaded dataset: {len(df)} rows, {len(df.columns)} columns")
+        
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Dataset not found in MinIO: {minio_object}")
+    except Exception as e:
+        logger.error(f"Failed to load dataset: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to load dataset: {str(e)}")
+    
+    # Analyze dataset
+    return analyzer.analyze(df, task_type, sample_rows=settings.ANALYSIS_SAMPLE_ROWS)
+
+
 @router.get("")
 async def select_models(
     minio_object: Optional[str] = Query(None, description="Path to prepared dataset in MinIO"),
@@ -54,25 +94,17 @@ async def select_models(
             detail="minio_object parameter is required. Provide path to prepared dataset."
         )
     
-    try:
-        # Download and load dataset from MinIO
-        logger.info(f"Loading dataset from MinIO: {minio_object}")
-        raw_data = download_bytes(minio_object)
-        df = pd.read_csv(io.BytesIO(raw_data))
-        
-        if df.empty:
-            raise HTTPException(status_code=400, detail="Dataset is empty")
-        
-        logger.info(f"Loaded dataset: {len(df)} rows, {len(df.columns)} columns")
-        
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail=f"Dataset not found in MinIO: {minio_object}")
-    except Exception as e:
-        logger.error(f"Failed to load dataset: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to load dataset: {str(e)}")
-    
-    # Analyze dataset
-    analysis = analyzer.analyze(df, task_type)
+    # Same dataset content analyzed before (e.g. the user toggled the metric)
+    cache_key = analysis_key(minio_object, task_type)
+    analysis = analysis_cache.get(cache_key) if cache_key else None
+    cached = analysis is not None
+    if cached:
+        logger.info(f"Using cached analysis {cache_key}")
+    else:
+        # Same form as a cached analysis, whichever path served it
+        analysis = normalize_analysis(_analyze_object(minio_object, task_type))
+        if cache_key:
+            analysis_cache.put(cache_key, analysis)
     logger.info(f"Dataset analysis complete: task_type={analysis['task_type']}, target={analysis.get('target_column')}")
     
     # Select models
@@ -83,6 +115,19 @@ async def select_models(
         include_deep_learning=include_deep_learning
     )
 
+    # Persist the new analysis so other workers and restarts reuse it
+    if cache_key and not cached:
+        save_selection(
+            dataset_hash=cache_key,
+            dataset_rows=analysis["n_rows"],
+            dataset_columns=analysis["n_columns"],
+            task_type=analysis["task_type"],
+            metric=metric,
+            selected_models=[c.model_id for c in candidates],
+            top_model=candidates[0].model_id if candidates else None,
+            analysis=analysis
+        )
+
     # Notify orchestrator that ModelSelector step succeeded
     if pipeline_id:
         try:
@@ -142,7 +187,7 @@ async def select_models_with_upload(
         raise HTTPException(status_code=400, detail=f"Failed to read CSV: {str(e)}")
     
     # Analyze dataset
-    analysis = analyzer.analyze(df, task_type, target_column)
+    analysis = analyzer.analyze(df, task_type, target_column, sample_rows=settings.ANALYSIS_SAMPLE_ROWS)
     
     # Select models
     candidates = selector_service.select_models(
@@ -181,7 +226,7 @@ async def analyze_dataset(
         if df.empty:
             raise HTTPException(status_code=400, detail="CSV contains no data")
         
-        analysis = analyzer.analyze(df, target_column=target_column)
+        analysis = analyzer.analyze(df, target_column=target_column, sample_rows=settings.ANALYSIS_SAMPLE_ROWS)
         return analysis
         
     except Exception as e:
@@ -21,6 +21,24 @@ class Settings:
     MINIO_BUCKET: str
     MINIO_SECURE: bool
 
+    # Local handoff directory shared with a colocated DataPreparer
+    LOCAL_HANDOFF_DIR: str
+
+    # DataPreparer Arrow Flight endpoint (e.g. grpc://datapreparer:8815)
+    FLIGHT_LOCATION: str
+    FLIGHT_STREAMS: int
+    FLIGHT_TIMEOUT: float
+
+    # Analyses kept in memory for repeated /select calls
+    ANALYSIS_CACHE_SIZE: int
+    # Rows analyzed when a dataset is very_large
+    ANALYSIS_SAMPLE_ROWS: int
+
+    # Model catalog source: builtin, postgres or file (versioned JSON)
+    MODEL_CATALOG_SOURCE: str
+    MODEL_CATALOG_PATH: str
+    MODEL_CATALOG_REFRESH_SECONDS: float
+
     # Service settings
     PROJECT_NAME: str
     DATA_PREPARER_URL: str
@@ -40,6 +58,24 @@ class Settings:
         self.MINIO_BUCKET = os.getenv("MINIO_BUCKET", "data-preparer")
         self.MINIO_SECURE = os.getenv("MINIO_SECURE", "false").lower() in ("true", "1", "yes")
 
+        # Local handoff (empty: always read from MinIO)
+        self.LOCAL_HANDOFF_DIR = os.getenv("LOCAL_HANDOFF_DIR", "")
+
+        # Arrow Flight (empty location: read from MinIO)
+        self.FLIGHT_LOCATION = os.getenv("FLIGHT_LOCATION", "")
+        self.FLIGHT_STREAMS = int(os.getenv("FLIGHT_STREAMS", "4"))
+        self.FLIGHT_TIMEOUT = float(os.getenv("FLIGHT_TIMEOUT", "5"))
+
+        # Analysis cache (0: no in-memory cache, selection history only)
+        self.ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "128"))
+        # Sampled analysis (0: always analyze every row)
+        self.ANALYSIS_SAMPLE_ROWS = int(os.getenv("ANALYSIS_SAMPLE_ROWS", "200000"))
+
+        # Model catalog (checked for changes every MODEL_CATALOG_REFRESH_SECONDS)
+        self.MODEL_CATALOG_SOURCE = os.getenv("MODEL_CATALOG_SOURCE", "builtin").lower()
+        self.MODEL_CATALOG_PATH = os.getenv("MODEL_CATALOG_PATH", "")
+        self.MODEL_CATALOG_REFRESH_SECONDS = float(os.getenv("MODEL_CATALOG_REFRESH_SECONDS", "30"))
+
         # Service
         self.PROJECT_NAME = os.getenv("PROJECT_NAME", "Model Selector")
         self.DATA_PREPARER_URL = os.getenv("DATA_PREPARER_URL", "http://data-preparer:8000")
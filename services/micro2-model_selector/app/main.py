@@ -9,7 +9,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.health_router import router as health_router
 from app.api.select_router import router as select_router
 from app.api.models_router import router as models_router
-from app.storage.postgres_client import init_db
+from app.services.model_catalog import ModelCatalog
+from app.storage.postgres_client import init_db, seed_model_catalog
 from app.core.logger import logger
 
 app = FastAPI(
@@ -38,6 +39,7 @@ async def startup_event():
     try:
         logger.info("Initializing PostgreSQL connection...")
         init_db()
+        seed_model_catalog(ModelCatalog(source="builtin").list_models())
         logger.info("✓ PostgreSQL initialized successfully")
     except Exception as e:
         logger.error(f"✗ Failed to initialize PostgreSQL: {e}")
@@ -0,0 +1,85 @@
+# app/services/analysis_cache.py
+# --------------------------------------------------------------------
+# Cache of dataset analyses for GET /select.
+#
+# The frontend calls /select again for every metric / max_models toggle,
+# while the analysis only depends on the dataset and the task type
+# override. Analyses are keyed by the object's MinIO ETag (the MD5 of
+# its content for regular uploads), the analyzer version and the sample
+# size, plus the override:
+#   <etag>:v<version>s<sample_rows>               auto-detected task type
+#   <etag>:v<version>s<sample_rows>:<task_type>   explicit task type
+# and kept in a per-process LRU. The same key is stored in
+# selection_history.dataset_hash, so an analysis survives restarts and
+# is shared between workers: a miss in the LRU looks up the latest row.
+# Analyses are cached in their JSON form (e.g. string class_distribution
+# keys), the form they have when read back from selection_history.
+# --------------------------------------------------------------------
+import copy
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.dataset_analyzer import ANALYSIS_VERSION
+from app.storage.minio_client import get_object_info
+from app.storage.postgres_client import get_cached_analysis
+
+
+def analysis_key(object_name: str, task_type: Optional[str] = None) -> Optional[str]:
+    """Cache key of the analysis of object_name, or None if it has no ETag"""
+    try:
+        info = get_object_info(object_name)
+    except Exception as e:
+        logger.warning(f"Cannot stat {object_name}: {e}")
+        return None
+    if not info or not info.get("etag"):
+        return None
+    etag = info["etag"].strip('"')
+    key = f"{etag}:v{ANALYSIS_VERSION}s{settings.ANALYSIS_SAMPLE_ROWS}"
+    return f"{key}:{task_type}" if task_type else key
+
+
+def normalize_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Analysis as stored in selection_history (JSON types, string keys)"""
+    return json.loads(json.dumps(analysis))
+
+
+class AnalysisCache:
+    """LRU of analyses by key, falling back to selection_history"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+        if analysis is None:
+            analysis = get_cached_analysis(key)
+            if analysis is None:
+                return None
+            logger.info(f"Analysis {key} loaded from selection history")
+            self.put(key, analysis)
+        return copy.deepcopy(analysis)
+
+    def put(self, key: str, analysis: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = normalize_analysis(analysis)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+analysis_cache = AnalysisCache(settings.ANALYSIS_CACHE_SIZE)
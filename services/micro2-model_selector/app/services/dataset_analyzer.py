@@ -2,12 +2,21 @@
 # --------------------------------------------------------------------
 # Service for analyzing datasets and determining their characteristics.
 # Used to inform model selection decisions.
+#
+# The analysis works from a per-column profile: analyze() profiles a
+# loaded DataFrame, analyze_profile() uses the sidecar the DataPreparer
+# stores next to prepared datasets, without loading the dataset.
 # --------------------------------------------------------------------
 import pandas as pd
 import numpy as np
 from typing import Optional, Dict, Any, List
 
 from app.core.logger import logger
+from app.services.dataset_profile import profile_frame, value_counts
+
+# Version of the analysis output; part of the analysis cache key, so bump
+# it whenever the analysis changes and stored analyses must be recomputed
+ANALYSIS_VERSION = 1
 
 
 def convert_numpy_types(obj: Any) -> Any:
@@ -44,7 +53,8 @@ class DatasetAnalyzer:
         self,
         df: pd.DataFrame,
         task_type: Optional[str] = None,
-        target_column: Optional[str] = None
+        target_column: Optional[str] = None,
+        sample_rows: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Analyze a dataset and return its characteristics.
@@ -53,24 +63,56 @@ class DatasetAnalyzer:
             df: DataFrame to analyze
             task_type: Override for task type detection
             target_column: Name of target column for supervised learning
+            sample_rows: For very_large datasets, analyze a uniform sample of
+                this many rows; the result then has a "sampling" entry with
+                standard errors of the estimated means and class proportions
             
         Returns:
             Dictionary containing dataset analysis results
         """
         logger.info(f"Analyzing dataset: {df.shape[0]} rows, {df.shape[1]} columns")
+        if sample_rows and self._categorize_size(len(df)) != "very_large":
+            sample_rows = None
+        return self._analyze(profile_frame(df, sample_rows), task_type, target_column, df)
+    
+    def analyze_profile(
+        self,
+        profile: Dict[str, Any],
+        task_type: Optional[str] = None,
+        target_column: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyze a dataset from its profile (see app.services.dataset_profile)
+        without loading it. Same result as analyze() on the dataset, except
+        that a classification target with more than PROFILE_MAX_VALUES classes
+        has no class distribution.
+        """
+        logger.info(f"Analyzing dataset profile: {profile['n_rows']} rows, {len(profile['columns'])} columns")
+        return self._analyze(profile, task_type, target_column)
+    
+    def _analyze(
+        self,
+        profile: Dict[str, Any],
+        task_type: Optional[str],
+        target_column: Optional[str],
+        df: Optional[pd.DataFrame] = None
+    ) -> Dict[str, Any]:
+        columns = profile["columns"]
+        n_rows = profile["n_rows"]
         
         analysis = {
-            "n_rows": len(df),
-            "n_columns": len(df.columns),
-            "columns": list(df.columns),
-            "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()}
+            "n_rows": n_rows,
+            "n_columns": len(columns),
+            "columns": list(columns),
+            "dtypes": {col: entry["dtype"] for col, entry in columns.items()}
         }
         
         # Categorize columns by type
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-        datetime_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
-        bool_cols = df.select_dtypes(include=['bool']).columns.tolist()
+        dtypes = self._empty_frame(columns)
+        numeric_cols = dtypes.select_dtypes(include=[np.number]).columns.tolist()
+        categorical_cols = dtypes.select_dtypes(include=['object', 'category']).columns.tolist()
+        datetime_cols = dtypes.select_dtypes(include=['datetime64']).columns.tolist()
+        bool_cols = dtypes.select_dtypes(include=['bool']).columns.tolist()
         
         analysis["numeric_columns"] = numeric_cols
         analysis["categorical_columns"] = categorical_cols
@@ -79,7 +121,7 @@ class DatasetAnalyzer:
         
         # Detect target column if not provided
         if target_column is None:
-            target_column = self._detect_target_column(df)
+            target_column = self._detect_target_column(columns)
         
         analysis["target_column"] = target_column
         
@@ -87,39 +129,46 @@ class DatasetAnalyzer:
         if task_type:
             analysis["task_type"] = task_type
         else:
-            analysis["task_type"] = self._detect_task_type(df, target_column)
+            analysis["task_type"] = self._detect_task_type(columns, target_column, n_rows)
         
         # Analyze target column if present
-        if target_column and target_column in df.columns:
-            target_analysis = self._analyze_target(df[target_column], analysis["task_type"])
+        if target_column and target_column in columns:
+            target = columns[target_column]
+            if "value_counts" not in target and df is not None:
+                target = dict(target, value_counts=value_counts(df[target_column]))
+            target_analysis = self._analyze_target(target, analysis["task_type"])
             analysis.update(target_analysis)
         
         # Calculate feature count (excluding target)
-        feature_cols = [c for c in df.columns if c != target_column]
+        feature_cols = [c for c in columns if c != target_column]
         analysis["n_features"] = len(feature_cols)
         analysis["feature_columns"] = feature_cols
         
         # Missing values analysis
-        missing_info = self._analyze_missing_values(df)
+        missing_info = self._analyze_missing_values(columns, n_rows)
         analysis.update(missing_info)
         
         # Data size categorization
-        analysis["data_size_category"] = self._categorize_size(len(df))
+        analysis["data_size_category"] = self._categorize_size(n_rows)
         
         # Feature-target ratio (important for overfitting risk)
         if target_column:
-            analysis["feature_target_ratio"] = len(feature_cols) / max(1, len(df))
+            analysis["feature_target_ratio"] = len(feature_cols) / max(1, n_rows)
         
         # Statistical summary for numeric columns
         if numeric_cols:
-            analysis["numeric_stats"] = self._get_numeric_stats(df[numeric_cols])
+            analysis["numeric_stats"] = self._get_numeric_stats(columns, numeric_cols)
         
         # Cardinality for categorical columns
         if categorical_cols:
             analysis["categorical_cardinality"] = {
-                col: df[col].nunique() for col in categorical_cols
+                col: columns[col]["unique"] for col in categorical_cols
             }
         
+        # Precision of the estimates when profiled from a sample
+        if profile.get("sample_rows"):
+            analysis["sampling"] = self._sampling_errors(profile, numeric_cols, target_column, analysis)
+        
         # Generate warnings and recommendations
         analysis["warnings"] = self._generate_warnings(analysis)
         analysis["recommendations"] = self._generate_recommendations(analysis)
@@ -129,7 +178,18 @@ class DatasetAnalyzer:
         # Convert numpy types to Python native types for JSON serialization
         return convert_numpy_types(analysis)
     
-    def _detect_target_column(self, df: pd.DataFrame) -> Optional[str]:
+    @staticmethod
+    def _empty_frame(columns: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        """Zero-row frame with the profiled dtypes, for dtype-based column selection"""
+        series = {}
+        for col, entry in columns.items():
+            try:
+                series[col] = pd.Series(dtype=entry["dtype"])
+            except (TypeError, ValueError):
+                series[col] = pd.Series(dtype=object)
+        return pd.DataFrame(series)
+    
+    def _detect_target_column(self, columns: Dict[str, Dict[str, Any]]) -> Optional[str]:
         """Attempt to detect the target column heuristically"""
         common_target_names = [
             'target', 'label', 'class', 'y', 'output',
@@ -137,38 +197,42 @@ class DatasetAnalyzer:
         ]
         
         # Check for exact matches (case-insensitive)
-        for col in df.columns:
+        for col in columns:
             if col.lower() in common_target_names:
                 logger.info(f"Auto-detected target column: {col}")
                 return col
         
         # Check for partial matches
-        for col in df.columns:
+        for col in columns:
             for target_name in common_target_names:
                 if target_name in col.lower():
                     logger.info(f"Auto-detected target column (partial match): {col}")
                     return col
         
         # If last column is categorical with few unique values, assume it's target
-        last_col = df.columns[-1]
-        if df[last_col].dtype == 'object' or df[last_col].nunique() < 20:
+        last_col = list(columns)[-1]
+        if columns[last_col]["dtype"] == 'object' or columns[last_col]["unique"] < 20:
             logger.info(f"Assuming last column as target: {last_col}")
             return last_col
         
         return None
     
-    def _detect_task_type(self, df: pd.DataFrame, target_column: Optional[str]) -> str:
+    def _detect_task_type(
+        self,
+        columns: Dict[str, Dict[str, Any]],
+        target_column: Optional[str],
+        n_samples: int
+    ) -> str:
         """Detect whether this is classification, regression, or clustering"""
-        if target_column is None or target_column not in df.columns:
+        if target_column is None or target_column not in columns:
             logger.info("No target column - assuming clustering task")
             return "clustering"
         
-        target = df[target_column]
-        n_unique = target.nunique()
-        n_samples = len(df)
+        target = columns[target_column]
+        n_unique = target["unique"]
         
         # Check if numeric
-        if pd.api.types.is_numeric_dtype(target):
+        if self._is_numeric(target["dtype"]):
             # Binary classification (0/1, True/False, or 2 unique values)
             if n_unique == 2:
                 logger.info(f"Binary numeric target (2 unique values) - classification")
@@ -180,7 +244,7 @@ class DatasetAnalyzer:
                 return "classification"
             
             # If all values are integers and small range, likely classification
-            if target.dtype in ['int64', 'int32'] and n_unique < 30:
+            if target["dtype"] in ['int64', 'int32'] and n_unique < 30:
                 logger.info(f"Integer target with {n_unique} unique values - classification")
                 return "classification"
             
@@ -192,39 +256,45 @@ class DatasetAnalyzer:
             logger.info(f"Categorical target with {n_unique} classes - classification")
             return "classification"
     
-    def _analyze_target(self, target: pd.Series, task_type: str) -> Dict[str, Any]:
-        """Analyze the target column"""
+    @staticmethod
+    def _is_numeric(dtype: str) -> bool:
+        try:
+            return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtype))
+        except (TypeError, ValueError):
+            return False
+    
+    def _analyze_target(self, target: Dict[str, Any], task_type: str) -> Dict[str, Any]:
+        """Analyze the target column from its profile entry"""
         result = {
-            "target_type": str(target.dtype),
-            "target_unique_values": target.nunique()
+            "target_type": target["dtype"],
+            "target_unique_values": target["unique"]
         }
         
         if task_type == "classification":
-            result["n_classes"] = target.nunique()
-            result["class_distribution"] = target.value_counts().to_dict()
+            result["n_classes"] = target["unique"]
+            counts = target.get("value_counts", [])
+            result["class_distribution"] = {value: count for value, count in counts}
             
             # Check for class imbalance
-            counts = target.value_counts()
             if len(counts) > 1:
-                imbalance_ratio = counts.max() / counts.min()
+                imbalance_ratio = counts[0][1] / counts[-1][1]
                 result["class_imbalance_ratio"] = round(imbalance_ratio, 2)
                 result["is_imbalanced"] = imbalance_ratio > 3
         
         elif task_type == "regression":
-            result["target_mean"] = float(target.mean())
-            result["target_std"] = float(target.std())
-            result["target_min"] = float(target.min())
-            result["target_max"] = float(target.max())
+            result["target_mean"] = target.get("mean")
+            result["target_std"] = target.get("std")
+            result["target_min"] = target.get("min")
+            result["target_max"] = target.get("max")
         
         return result
     
-    def _analyze_missing_values(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_missing_values(self, columns: Dict[str, Dict[str, Any]], n_rows: int) -> Dict[str, Any]:
         """Analyze missing values in the dataset"""
-        missing_counts = df.isnull().sum()
-        total_missing = missing_counts.sum()
-        total_cells = df.shape[0] * df.shape[1]
+        total_missing = sum(entry["nulls"] for entry in columns.values())
+        total_cells = n_rows * len(columns)
         
-        columns_with_missing = missing_counts[missing_counts > 0].to_dict()
+        columns_with_missing = {col: entry["nulls"] for col, entry in columns.items() if entry["nulls"] > 0}
         
         return {
             "has_missing_values": total_missing > 0,
@@ -233,6 +303,35 @@ class DatasetAnalyzer:
             "n_columns_with_missing": len(columns_with_missing)
         }
     
+    def _sampling_errors(
+        self,
+        profile: Dict[str, Any],
+        numeric_cols: List[str],
+        target_column: Optional[str],
+        analysis: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Standard errors of sample means and class proportions (with finite population correction)"""
+        n, m = profile["n_rows"], profile["sample_rows"]
+        fpc = np.sqrt((n - m) / (n - 1)) if n > 1 else 0.0
+        columns = profile["columns"]
+        
+        mean_errors = {}
+        for col in numeric_cols:
+            std = columns[col].get("std")
+            mean_errors[col] = None if std is None else std / np.sqrt(m) * fpc
+        
+        class_errors = {}
+        if analysis["task_type"] == "classification" and target_column in columns:
+            for value, count in columns[target_column].get("value_counts", []):
+                p = count / n
+                class_errors[value] = np.sqrt(p * (1 - p) / m) * fpc
+        
+        return {
+            "sample_rows": m,
+            "mean_standard_errors": mean_errors,
+            "class_proportion_standard_errors": class_errors
+        }
+    
     def _categorize_size(self, n_rows: int) -> str:
         """Categorize dataset by size"""
         if n_rows < self.SIZE_THRESHOLDS["small"]:
@@ -244,15 +343,20 @@ class DatasetAnalyzer:
         else:
             return "very_large"
     
-    def _get_numeric_stats(self, df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    def _get_numeric_stats(
+        self,
+        columns: Dict[str, Dict[str, Any]],
+        numeric_cols: List[str]
+    ) -> Dict[str, Dict[str, float]]:
         """Get basic statistics for numeric columns"""
         stats = {}
-        for col in df.columns:
+        for col in numeric_cols:
+            entry = columns[col]
             stats[col] = {
-                "mean": float(df[col].mean()) if not df[col].isna().all() else None,
-                "std": float(df[col].std()) if not df[col].isna().all() else None,
-                "min": float(df[col].min()) if not df[col].isna().all() else None,
-                "max": float(df[col].max()) if not df[col].isna().all() else None
+                "mean": entry.get("mean"),
+                "std": entry.get("std"),
+                "min": entry.get("min"),
+                "max": entry.get("max")
             }
         return stats
     
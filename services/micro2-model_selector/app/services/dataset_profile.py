@@ -0,0 +1,104 @@
+# app/services/dataset_profile.py
+# --------------------------------------------------------------------
+# Per-column dataset profile: the summaries DatasetAnalyzer works from.
+#
+# The DataPreparer stores the same profile as a JSON sidecar of every
+# prepared dataset (<object without extension>_profile.json), so model
+# selection can skip downloading and parsing the dataset. For uploads
+# and datasets without a sidecar, profile_frame computes it locally.
+#
+# Layout (PROFILE_VERSION 1):
+#   {"version": 1, "n_rows": N,
+#    "columns": {name: {"dtype", "nulls", "unique",
+#                       "mean", "std", "min", "max",      # numeric only
+#                       "value_counts": [[value, count], ...]}},  # unique <= PROFILE_MAX_VALUES
+#    "sample_rows": M}                                    # only when profiled from a sample
+# --------------------------------------------------------------------
+import json
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.logger import logger
+from app.storage.minio_client import download_bytes
+
+PROFILE_VERSION = 1
+PROFILE_SUFFIX = "_profile.json"
+PROFILE_MAX_VALUES = 100
+
+
+def profile_object_name(object_name: str) -> str:
+    """Sidecar of a prepared dataset: same name, extension replaced by _profile.json"""
+    return os.path.splitext(object_name)[0] + PROFILE_SUFFIX
+
+
+def _native(value: Any) -> Any:
+    return value.item() if hasattr(value, "item") else value
+
+
+def _float(value) -> Optional[float]:
+    return None if pd.isna(value) else float(value)
+
+
+def value_counts(series: pd.Series) -> list:
+    """[[value, count], ...] by decreasing count, NaN excluded"""
+    return [[_native(v), int(c)] for v, c in series.value_counts().items()]
+
+
+def profile_frame(df: pd.DataFrame, sample_rows: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Profile of a loaded DataFrame, in the sidecar layout.
+
+    Null counts come from one isna() pass and the numeric statistics from
+    one aggregation over the numeric block; each column is then hashed
+    once for its distinct count, and counted only when that is small.
+
+    With sample_rows smaller than the frame, everything but n_rows and the
+    null counts is computed on a uniform sample of that many rows: value
+    counts are scaled to the full row count, distinct counts are those of
+    the sample, and the profile records "sample_rows".
+    """
+    n_rows = len(df)
+    nulls = df.isna().sum()
+    sampled = bool(sample_rows) and sample_rows < n_rows
+    if sampled:
+        rows = np.sort(np.random.default_rng(0).choice(n_rows, size=sample_rows, replace=False))
+        df = df.take(rows)
+    scale = n_rows / len(df) if sampled else 1
+
+    numeric = df.select_dtypes(include=[np.number])
+    stats = numeric.agg(["mean", "std", "min", "max"]) if len(numeric.columns) else pd.DataFrame()
+
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        entry = {"dtype": str(series.dtype), "nulls": int(nulls[col]), "unique": int(series.nunique())}
+        if col in stats.columns:
+            entry.update({stat: _float(stats.at[stat, col]) for stat in ("mean", "std", "min", "max")})
+        if entry["unique"] <= PROFILE_MAX_VALUES:
+            entry["value_counts"] = [[_native(v), int(round(c * scale))] for v, c in series.value_counts().items()]
+        columns[col] = entry
+
+    profile = {"version": PROFILE_VERSION, "n_rows": n_rows, "columns": columns}
+    if sampled:
+        profile["sample_rows"] = len(df)
+    return profile
+
+
+def load_profile(object_name: str) -> Optional[Dict[str, Any]]:
+    """Sidecar profile stored by the DataPreparer for object_name, or None"""
+    name = profile_object_name(object_name)
+    try:
+        profile = json.loads(download_bytes(name))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Cannot read dataset profile {name}: {e}")
+        return None
+    if profile.get("version") != PROFILE_VERSION:
+        logger.warning(f"Ignoring dataset profile {name} with version {profile.get('version')}")
+        return None
+    logger.info(f"Using dataset profile {name}")
+    return profile
@@ -2,18 +2,128 @@
 # --------------------------------------------------------------------
 # Catalog of available ML models with metadata.
 # Contains all supported models and their characteristics.
+#
+# MODEL_CATALOG_SOURCE selects where the catalog is read from:
+#   builtin   the definitions below
+#   postgres  the model_catalog table, seeded with the definitions below
+#             by init_db (see app/storage/postgres_client.py)
+#   file      a versioned JSON file at MODEL_CATALOG_PATH:
+#             {"version": ..., "models": {model_id: {...}}, "categories": {...}}
+# The source is checked for changes at most every
+# MODEL_CATALOG_REFRESH_SECONDS and reloaded in place, so every worker
+# picks up added or edited models without a restart. Lookups go through
+# indexes by task type and category built at load time.
 # --------------------------------------------------------------------
-from typing import Dict, Any, List, Optional
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 
+from app.core.config import settings
 from app.core.logger import logger
+from app.storage.postgres_client import get_model_catalog_version, load_model_catalog
 
 
 class ModelCatalog:
     """Catalog of available ML models with comprehensive metadata"""
     
-    def __init__(self):
-        self._models = self._initialize_models()
-        self._categories = self._initialize_categories()
+    # Metadata filled in for models added with only the model_catalog columns
+    MODEL_DEFAULTS = {
+        "description": "",
+        "interpretability": "medium",
+        "training_complexity": "medium",
+        "prediction_speed": "medium",
+        "memory_usage": "medium",
+        "supports_gpu": False,
+        "default_params": {},
+        "tunable_params": {},
+        "suitable_for": [],
+        "not_suitable_for": [],
+        "sklearn_compatible": True,
+        "requires_scaling": False,
+        "handles_missing": False,
+        "handles_categorical": False
+    }
+    
+    def __init__(self, source: Optional[str] = None, refresh_seconds: Optional[float] = None):
+        self.source = source or settings.MODEL_CATALOG_SOURCE
+        self.refresh_seconds = settings.MODEL_CATALOG_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._categories: Dict[str, Dict[str, Any]] = {}
+        self._by_task: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_task_category: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._refresh(force=True)
+    
+    # ---------------- loading ----------------
+    
+    def _source_version(self) -> Any:
+        """Cheap fingerprint of the source, compared before reloading"""
+        if self.source == "file":
+            stat = os.stat(settings.MODEL_CATALOG_PATH)
+            return (stat.st_mtime_ns, stat.st_size)
+        if self.source == "postgres":
+            return get_model_catalog_version()
+        return "builtin"
+    
+    def _read_source(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """(models, categories) from the configured source"""
+        if self.source == "file":
+            with open(settings.MODEL_CATALOG_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            logger.info(f"Loading model catalog version {data.get('version')} from {settings.MODEL_CATALOG_PATH}")
+            return data["models"], data.get("categories") or self._initialize_categories()
+        if self.source == "postgres":
+            models = load_model_catalog()
+            if not models:
+                raise ValueError("model_catalog table is empty")
+            return models, self._initialize_categories()
+        return self._initialize_models(), self._initialize_categories()
+    
+    def _refresh(self, force: bool = False) -> None:
+        """Reload the catalog if its source changed since the last check"""
+        now = time.monotonic()
+        if not force and (self.source == "builtin" or now - self._checked_at < self.refresh_seconds):
+            return
+        with self._lock:
+            if not force and now - self._checked_at < self.refresh_seconds:
+                return
+            self._checked_at = now
+            try:
+                version = self._source_version()
+                if version == self._version and self._models:
+                    return
+                models, categories = self._read_source()
+            except Exception as exc:
+                if self._models:
+                    logger.warning(f"Keeping current model catalog, cannot reload from {self.source}: {exc}")
+                    return
+                logger.warning(f"Cannot load model catalog from {self.source}, using built-in catalog: {exc}")
+                version, models, categories = None, self._initialize_models(), self._initialize_categories()
+            self._index(models, categories)
+            self._version = version
+            logger.info(f"Model catalog loaded: {len(models)} models from {self.source}")
+    
+    def _index(self, models: Dict[str, Dict[str, Any]], categories: Dict[str, Dict[str, Any]]) -> None:
+        models = {
+            model_id: {**self.MODEL_DEFAULTS, **model, "model_id": model_id}
+            for model_id, model in models.items()
+        }
+        by_task: Dict[str, List[Dict[str, Any]]] = {}
+        by_category: Dict[str, List[Dict[str, Any]]] = {}
+        by_task_category: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for model in models.values():
+            by_category.setdefault(model["category"], []).append(model)
+            for task_type in model["task_types"]:
+                by_task.setdefault(task_type, []).append(model)
+                by_task_category.setdefault((task_type, model["category"]), []).append(model)
+        # Replaced, never mutated: readers keep a consistent view of each index
+        self._models, self._categories = models, categories
+        self._by_task, self._by_category, self._by_task_category = by_task, by_category, by_task_category
     
     def _initialize_models(self) -> Dict[str, Dict[str, Any]]:
         """Initialize the model catalog with all supported models"""
@@ -654,31 +764,35 @@ class ModelCatalog:
             }
         }
     
+    # ---------------- lookups ----------------
+    
     def list_models(
         self,
         task_type: Optional[str] = None,
         category: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """List all models, optionally filtered by task type or category"""
-        models = list(self._models.values())
+        self._refresh()
         
+        if task_type and category:
+            return list(self._by_task_category.get((task_type, category), []))
         if task_type:
-            models = [m for m in models if task_type in m["task_types"]]
-        
+            return list(self._by_task.get(task_type, []))
         if category:
-            models = [m for m in models if m["category"] == category]
-        
-        return models
+            return list(self._by_category.get(category, []))
+        return list(self._models.values())
     
     def get_model(self, model_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific model by ID"""
+        self._refresh()
         return self._models.get(model_id)
     
     def list_categories(self) -> Dict[str, Any]:
         """List all categories with model counts"""
+        self._refresh()
         result = {}
         for cat_id, cat_info in self._categories.items():
-            models_in_cat = [m["model_id"] for m in self._models.values() if m["category"] == cat_id]
+            models_in_cat = [m["model_id"] for m in self._by_category.get(cat_id, [])]
             result[cat_id] = {
                 **cat_info,
                 "model_count": len(models_in_cat),
@@ -723,3 +837,6 @@ class ModelCatalog:
         scored.sort(key=lambda x: x["recommendation_score"], reverse=True)
         
         return scored[:5]  # Top 5 recommendations
+
+
+model_catalog = ModelCatalog()
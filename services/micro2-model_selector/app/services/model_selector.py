@@ -5,7 +5,7 @@
 # --------------------------------------------------------------------
 from typing import Dict, Any, List, Optional
 
-from app.services.model_catalog import ModelCatalog
+from app.services.model_catalog import model_catalog
 from app.models.response_models import ModelCandidate
 from app.core.logger import logger
 
@@ -14,7 +14,7 @@ class ModelSelectorService:
     """Service for selecting appropriate ML models based on dataset analysis"""
     
     def __init__(self):
-        self.catalog = ModelCatalog()
+        self.catalog = model_catalog
     
     def select_models(
         self,
@@ -0,0 +1,51 @@
+# app/storage/flight_client.py
+# --------------------------------------------------------------------
+# Arrow Flight client for datasets served by the DataPreparer.
+#
+# The DataPreparer exposes stored datasets (by MinIO object name) on an
+# Arrow Flight endpoint. A request may project columns and select a row
+# range; the server splits the answer into several endpoints which are
+# streamed in parallel and concatenated, so no CSV is re-parsed.
+#
+# Returns None when Flight is not configured or fails, so callers fall
+# back to MinIO.
+# --------------------------------------------------------------------
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+def read_flight_dataset(
+    object_name: str,
+    columns: Optional[List[str]] = None,
+    offset: int = 0,
+    length: Optional[int] = None,
+) -> Optional[pd.DataFrame]:
+    """Dataset streamed from the DataPreparer's Flight server, or None"""
+    if not settings.FLIGHT_LOCATION:
+        return None
+    try:
+        import pyarrow as pa
+        from pyarrow import flight
+
+        command = json.dumps({"object": object_name, "columns": columns, "offset": offset, "length": length})
+        with flight.connect(settings.FLIGHT_LOCATION) as client:
+            # Bounded wait for the metadata call so an unreachable server fails fast
+            options = flight.FlightCallOptions(timeout=settings.FLIGHT_TIMEOUT)
+            info = client.get_flight_info(flight.FlightDescriptor.for_command(command), options)
+            endpoints = info.endpoints
+            with ThreadPoolExecutor(max_workers=max(1, min(settings.FLIGHT_STREAMS, len(endpoints)))) as pool:
+                tables = list(pool.map(lambda endpoint: client.do_get(endpoint.ticket).read_all(), endpoints))
+
+        table = pa.concat_tables(tables) if tables else info.schema.empty_table()
+        df = table.to_pandas(split_blocks=True)
+        logger.info(f"Streamed {object_name} over Flight ({len(df)} rows, {len(endpoints)} streams)")
+        return df
+    except Exception as e:
+        logger.warning(f"Flight unavailable for {object_name}, using MinIO: {e}")
+        return None
@@ -0,0 +1,45 @@
+# app/storage/local_handoff.py
+# --------------------------------------------------------------------
+# Reads prepared datasets handed off locally by the DataPreparer.
+#
+# When the DataPreparer runs on the same host with LOCAL_HANDOFF_DIR set
+# (typically a shared /dev/shm directory), every processed dataset is
+# also stored there as an Arrow IPC file, linked under its MinIO object
+# name:
+#
+#   <dir>/by-name/<quoted object name> -> ../<sha256>.arrow
+#
+# The file is memory-mapped, so no download and no CSV parsing happen.
+# Any miss (other node, evicted file, pyarrow missing, feature disabled)
+# returns None and the caller downloads from MinIO.
+# --------------------------------------------------------------------
+import os
+from typing import Optional
+from urllib.parse import quote
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logger import logger
+
+LINKS_DIR = "by-name"
+
+
+def read_local_dataset(object_name: str) -> Optional[pd.DataFrame]:
+    """Memory-mapped dataset published for object_name on this host, or None"""
+    root = settings.LOCAL_HANDOFF_DIR
+    if not root:
+        return None
+    link = os.path.join(root, LINKS_DIR, quote(object_name, safe=""))
+    if not os.path.exists(link):
+        return None
+    try:
+        import pyarrow as pa
+
+        table = pa.ipc.open_file(pa.memory_map(os.path.realpath(link), "r")).read_all()
+        df = table.to_pandas(split_blocks=True)
+        logger.info(f"Loaded {object_name} from local handoff ({len(df)} rows)")
+        return df
+    except Exception as e:
+        logger.warning(f"Local handoff unavailable for {object_name}, using MinIO: {e}")
+        return None
@@ -45,6 +45,8 @@ def init_db():
         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
 
+    ALTER TABLE model_catalog ADD COLUMN IF NOT EXISTS metadata JSONB;
+
     -- Model selection history table
     CREATE TABLE IF NOT EXISTS selection_history (
         id SERIAL PRIMARY KEY,
@@ -74,6 +76,7 @@ def init_db():
     -- Create indexes for better query performance
     CREATE INDEX IF NOT EXISTS idx_selection_history_task_type ON selection_history(task_type);
     CREATE INDEX IF NOT EXISTS idx_selection_history_created ON selection_history(created_at);
+    CREATE INDEX IF NOT EXISTS idx_selection_history_dataset ON selection_history(dataset_hash, created_at);
     CREATE INDEX IF NOT EXISTS idx_model_performance_model ON model_performance(model_id);
     """
     
@@ -88,6 +91,87 @@ def init_db():
         raise
 
 
+def seed_model_catalog(models: List[Dict[str, Any]]) -> int:
+    """Insert catalog models missing from model_catalog; existing rows are left as edited"""
+    sql = """
+    INSERT INTO model_catalog
+    (model_id, model_name, model_class, category, task_types, interpretability,
+     training_complexity, supports_gpu, default_params, metadata)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (model_id) DO NOTHING
+    """
+    
+    import json
+    inserted = 0
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            for model in models:
+                cur.execute(sql, (
+                    model["model_id"],
+                    model["model_name"],
+                    model["model_class"],
+                    model["category"],
+                    model["task_types"],
+                    model.get("interpretability"),
+                    model.get("training_complexity"),
+                    model.get("supports_gpu", False),
+                    json.dumps(model.get("default_params") or {}),
+                    json.dumps(model)
+                ))
+                inserted += cur.rowcount
+            conn.commit()
+    logger.info(f"Model catalog seeded: {inserted} new models")
+    return inserted
+
+
+def load_model_catalog() -> Dict[str, Dict[str, Any]]:
+    """Load all catalog models; table columns take precedence over the metadata document"""
+    sql = """
+    SELECT model_id, model_name, model_class, category, task_types, interpretability,
+           training_complexity, supports_gpu, default_params, metadata
+    FROM model_catalog
+    ORDER BY created_at, model_id
+    """
+    
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+            rows = cur.fetchall()
+    
+    models = {}
+    for row in rows:
+        model = dict(row[9] or {})
+        model.update({
+            "model_id": row[0],
+            "model_name": row[1],
+            "model_class": row[2],
+            "category": row[3],
+            "task_types": list(row[4]),
+            "supports_gpu": bool(row[7])
+        })
+        if row[5] is not None:
+            model["interpretability"] = row[5]
+        if row[6] is not None:
+            model["training_complexity"] = row[6]
+        if row[8] is not None:
+            model["default_params"] = row[8]
+        models[row[0]] = model
+    return models
+
+
+def get_model_catalog_version() -> Optional[str]:
+    """Checksum of the model_catalog table, changes with any insert, update or delete"""
+    sql = """
+    SELECT md5(string_agg(t::text, '|' ORDER BY t.model_id)) FROM model_catalog t
+    """
+    
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+            row = cur.fetchone()
+            return row[0] if row else None
+
+
 def save_selection(
     dataset_hash: Optional[str],
     dataset_rows: int,
@@ -173,6 +257,26 @@ def get_selection_history(
         return []
 
 
+def get_cached_analysis(dataset_hash: str) -> Optional[Dict[str, Any]]:
+    """Get the latest analysis stored for a dataset hash"""
+    sql = """
+    SELECT analysis
+    FROM selection_history
+    WHERE dataset_hash = %s AND analysis IS NOT NULL
+    ORDER BY created_at DESC LIMIT 1
+    """
+    
+    try:
+        with get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (dataset_hash,))
+                row = cur.fetchone()
+                return row[0] if row else None
+    except Exception as exc:
+        logger.warning(f"Failed to get cached analysis: {exc}")
+        return None
+
+
 def save_model_performance(
     model_id: str,
     dataset_hash: Optional[str],
@@ -0,0 +1,98 @@
+# tests/test_analysis_cache.py
+# --------------------------------------------------------------------
+# Tests for the /select analysis cache.
+# --------------------------------------------------------------------
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import select_router
+from app.main import app
+from app.services import analysis_cache as cache_module
+from app.core.config import settings
+from app.services.analysis_cache import AnalysisCache, analysis_cache, analysis_key
+from app.services.dataset_analyzer import ANALYSIS_VERSION
+
+
+@pytest.fixture
+def history(monkeypatch):
+    """selection_history replaced by a dict of dataset_hash -> analysis"""
+    rows = {}
+    monkeypatch.setattr(cache_module, "get_cached_analysis", rows.get)
+    monkeypatch.setattr(select_router, "save_selection",
+                        lambda dataset_hash, analysis, **kwargs: rows.update({dataset_hash: analysis}))
+    analysis_cache.clear()
+    yield rows
+    analysis_cache.clear()
+
+
+def test_key_from_etag(monkeypatch):
+    monkeypatch.setattr(cache_module, "get_object_info", lambda name: {"etag": '"abc"'} if name == "x.csv" else None)
+    monkeypatch.setattr(settings, "ANALYSIS_SAMPLE_ROWS", 200000)
+    assert analysis_key("x.csv") == f"abc:v{ANALYSIS_VERSION}s200000"
+    assert analysis_key("x.csv", "regression") == f"abc:v{ANALYSIS_VERSION}s200000:regression"
+    assert analysis_key("missing.csv") is None
+
+    # Analyses of another sample size (or analyzer version) are not reused
+    monkeypatch.setattr(settings, "ANALYSIS_SAMPLE_ROWS", 0)
+    assert analysis_key("x.csv") == f"abc:v{ANALYSIS_VERSION}s0"
+
+    # Longest key still fits selection_history.dataset_hash VARCHAR(64)
+    monkeypatch.setattr(settings, "ANALYSIS_SAMPLE_ROWS", 1000000)
+    monkeypatch.setattr(cache_module, "get_object_info", lambda name: {"etag": "f" * 32 + "-10000"})
+    assert len(analysis_key("x.csv", "classification")) <= 64
+
+
+def test_lru_and_history_fallback(history):
+    cache = AnalysisCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"key": key})
+    assert cache.get("a") is None
+    assert cache.get("c") == {"key": "c"}
+
+    history["a"] = {"key": "a"}
+    assert cache.get("a") == {"key": "a"}
+    history.clear()
+    assert cache.get("a") == {"key": "a"}  # now in the LRU
+
+    cache.get("a")["key"] = "mutated"
+    assert cache.get("a") == {"key": "a"}
+
+
+def test_cached_analysis_has_history_form(history):
+    """A fresh analysis and one read back from selection_history look the same"""
+    cache = AnalysisCache(max_entries=2)
+    cache.put("fresh", {"class_distribution": {0: 10, 1: 5}})
+    history["stored"] = {"class_distribution": {"0": 10, "1": 5}}
+    assert cache.get("fresh") == cache.get("stored") == {"class_distribution": {"0": 10, "1": 5}}
+
+
+def test_repeated_selection_skips_download(history, monkeypatch, sample_classification_data):
+    downloads = []
+    data = sample_classification_data.to_csv(index=False).encode()
+
+    def download(name):
+        downloads.append(name)
+        return data
+
+    monkeypatch.setattr(cache_module, "get_object_info", lambda name: {"etag": "etag-1"})
+    monkeypatch.setattr(select_router, "load_profile", lambda name: None)
+    monkeypatch.setattr(select_router, "read_local_dataset", lambda name: None)
+    monkeypatch.setattr(select_router, "read_flight_dataset", lambda name: None)
+    monkeypatch.setattr(select_router, "download_bytes", download)
+
+    client = TestClient(app)
+    first = client.get("/select", params={"minio_object": "processed/x.csv"})
+    second = client.get("/select", params={"minio_object": "processed/x.csv", "metric": "f1", "max_models": 2})
+    assert first.status_code == second.status_code == 200
+    assert downloads == ["processed/x.csv"]
+    assert second.json()["dataset_analysis"] == first.json()["dataset_analysis"]
+    assert len(second.json()["candidates"]) == 2
+    key = analysis_key("processed/x.csv")
+    assert key in history
+
+    analysis_cache.clear()
+    client.get("/select", params={"minio_object": "processed/x.csv"})
+    assert downloads == ["processed/x.csv"]  # from selection history
+
+    client.get("/select", params={"minio_object": "processed/x.csv", "task_type": "regression"})
+    assert len(downloads) == 2 and f"{key}:regression" in history
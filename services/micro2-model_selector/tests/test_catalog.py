@@ -2,8 +2,14 @@
 # --------------------------------------------------------------------
 # Tests for the model catalog service.
 # --------------------------------------------------------------------
+import json
+import os
+import time
+
 import pytest
 
+from app.core.config import settings
+from app.services import model_catalog
 from app.services.model_catalog import ModelCatalog
 
 
@@ -186,3 +192,79 @@ class TestModelMetadata:
         assert "clustering" in model["task_types"]
         assert model["requires_scaling"] == True
         assert "n_clusters" in model["default_params"]
+
+
+class TestCatalogSources:
+    """Tests for loading and hot-reloading the catalog from a file or Postgres"""
+    
+    @pytest.fixture
+    def builtin(self):
+        return ModelCatalog(source="builtin")
+    
+    def test_indexes_match_filtering(self, builtin):
+        """Test that indexed lookups return the same models as a full scan"""
+        models = builtin.list_models()
+        for task_type in ("classification", "regression", "clustering"):
+            for category in (None, "ensemble", "linear"):
+                expected = [
+                    m for m in models
+                    if task_type in m["task_types"] and (category is None or m["category"] == category)
+                ]
+                assert builtin.list_models(task_type=task_type, category=category) == expected
+        assert builtin.list_models(task_type="unknown") == []
+    
+    def test_file_source_hot_reload(self, builtin, tmp_path, monkeypatch):
+        """Test that edits to the catalog file are picked up without a restart"""
+        path = tmp_path / "catalog.json"
+        models = {m["model_id"]: m for m in builtin.list_models(task_type="regression")}
+        path.write_text(json.dumps({"version": 1, "models": models}))
+        monkeypatch.setattr(settings, "MODEL_CATALOG_PATH", str(path))
+        
+        catalog = ModelCatalog(source="file", refresh_seconds=0)
+        assert catalog.list_models(task_type="classification") == []
+        
+        models["new_regressor"] = {
+            "model_id": "new_regressor",
+            "model_name": "New Regressor",
+            "model_class": "sklearn.linear_model.HuberRegressor",
+            "category": "linear",
+            "task_types": ["regression"]
+        }
+        path.write_text(json.dumps({"version": 2, "models": models}))
+        os.utime(path, ns=(time.time_ns() + 10**9,) * 2)
+        
+        model = catalog.get_model("new_regressor")
+        assert model is not None and model["prediction_speed"] == "medium"
+        assert "new_regressor" in catalog.list_categories()["linear"]["models"]
+        
+        path.write_text("not json")
+        os.utime(path, ns=(time.time_ns() + 2 * 10**9,) * 2)
+        assert catalog.get_model("new_regressor") is not None  # broken file keeps the last catalog
+    
+    def test_postgres_source(self, builtin, monkeypatch):
+        """Test that the catalog reloads from Postgres only when the table changes"""
+        rows = {m["model_id"]: m for m in builtin.list_models(task_type="clustering")}
+        loads = []
+        
+        def load():
+            loads.append(1)
+            return dict(rows)
+        
+        monkeypatch.setattr(model_catalog, "load_model_catalog", load)
+        monkeypatch.setattr(model_catalog, "get_model_catalog_version", lambda: str(len(rows)))
+        
+        catalog = ModelCatalog(source="postgres", refresh_seconds=0)
+        catalog.list_models()
+        assert len(loads) == 1 and catalog.list_models(task_type="regression") == []
+        
+        del rows["kmeans"]
+        assert catalog.get_model("kmeans") is None and len(loads) == 2
+    
+    def test_unavailable_source_falls_back_to_builtin(self, builtin, monkeypatch):
+        """Test that the built-in catalog is used when Postgres cannot be read"""
+        def fail():
+            raise ConnectionError("no database")
+        
+        monkeypatch.setattr(model_catalog, "get_model_catalog_version", fail)
+        catalog = ModelCatalog(source="postgres")
+        assert catalog.list_models() == builtin.list_models()
@@ -0,0 +1,82 @@
+# tests/test_dataset_profile.py
+# --------------------------------------------------------------------
+# Tests for analyzing datasets from their DataPreparer profile sidecar.
+# --------------------------------------------------------------------
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import dataset_profile
+from app.services.dataset_analyzer import DatasetAnalyzer
+from app.services.dataset_profile import load_profile, profile_frame
+
+
+def _round_trip(profile):
+    return json.loads(json.dumps(profile))
+
+
+def test_profile_analysis_matches_dataframe(sample_classification_data, sample_regression_data):
+    analyzer = DatasetAnalyzer()
+    for df in (sample_classification_data, sample_regression_data):
+        assert analyzer.analyze_profile(_round_trip(profile_frame(df))) == analyzer.analyze(df)
+
+    df = sample_classification_data.assign(target=sample_classification_data["target"].astype(str))
+    expected = analyzer.analyze(df, task_type="classification")
+    assert analyzer.analyze_profile(_round_trip(profile_frame(df)), "classification") == expected
+
+
+def test_high_cardinality_target_without_distribution():
+    df = pd.DataFrame({"feature": range(300), "target": [f"c{i}" for i in range(300)]})
+    profile = _round_trip(profile_frame(df))
+    assert "value_counts" not in profile["columns"]["target"]
+
+    analysis = DatasetAnalyzer().analyze_profile(profile)
+    assert analysis["task_type"] == "classification" and analysis["n_classes"] == 300
+    assert analysis["class_distribution"] == {}
+    assert len(DatasetAnalyzer().analyze(df)["class_distribution"]) == 300
+
+
+def test_load_profile(monkeypatch, sample_classification_data):
+    stored = {"processed/x_profile.json": json.dumps(profile_frame(sample_classification_data)).encode()}
+
+    def download(name):
+        if name not in stored:
+            raise FileNotFoundError(name)
+        return stored[name]
+
+    monkeypatch.setattr(dataset_profile, "download_bytes", download)
+    assert load_profile("processed/x.csv")["n_rows"] == len(sample_classification_data)
+    assert load_profile("processed/missing.csv") is None
+
+    stored["processed/old_profile.json"] = b'{"version": 0}'
+    assert load_profile("processed/old.csv") is None
+
+
+def test_sampled_analysis_of_very_large_dataset():
+    rng = np.random.default_rng(0)
+    n = 150_000
+    df = pd.DataFrame({
+        "x": rng.normal(5.0, 2.0, n),
+        "cat": rng.choice(["a", "b", "c"], n),
+        "target": rng.choice([0, 1], n, p=[0.8, 0.2]),
+    })
+    analyzer = DatasetAnalyzer()
+    full = analyzer.analyze(df)
+    sampled = analyzer.analyze(df, sample_rows=20_000)
+
+    assert "sampling" not in full
+    assert sampled["n_rows"] == n and sampled["sampling"]["sample_rows"] == 20_000
+    assert sampled["task_type"] == "classification" and sampled["n_classes"] == 2
+    assert sum(sampled["class_distribution"].values()) == pytest.approx(n, abs=2)
+
+    se = sampled["sampling"]["mean_standard_errors"]["x"]
+    assert 0 < se < 0.05
+    assert abs(sampled["numeric_stats"]["x"]["mean"] - full["numeric_stats"]["x"]["mean"]) < 4 * se
+    for cls, se in sampled["sampling"]["class_proportion_standard_errors"].items():
+        error = sampled["class_distribution"][cls] / n - full["class_distribution"][cls] / n
+        assert abs(error) < 4 * se
+
+    # Only very_large datasets are sampled
+    assert "sampling" not in analyzer.analyze(df.head(5000), sample_rows=1000)
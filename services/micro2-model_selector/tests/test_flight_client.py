@@ -0,0 +1,56 @@
+# tests/test_flight_client.py
+# --------------------------------------------------------------------
+# Tests for streaming datasets from the DataPreparer over Arrow Flight.
+# --------------------------------------------------------------------
+import json
+
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.storage.flight_client import read_flight_dataset
+
+pa = pytest.importorskip("pyarrow")
+flight = pytest.importorskip("pyarrow.flight")
+
+
+class SplittingServer(flight.FlightServerBase):
+    """Serves one table as two endpoints, like the DataPreparer does"""
+
+    def __init__(self, table):
+        super().__init__("grpc://127.0.0.1:0")
+        self.table = table
+
+    def get_flight_info(self, context, descriptor):
+        request = json.loads(descriptor.command)
+        half = self.table.num_rows // 2
+        tickets = [dict(request, offset=0, length=half), dict(request, offset=half, length=None)]
+        endpoints = [flight.FlightEndpoint(json.dumps(t).encode(), []) for t in tickets]
+        return flight.FlightInfo(self.table.schema, descriptor, endpoints, self.table.num_rows, -1)
+
+    def do_get(self, context, ticket):
+        request = json.loads(ticket.ticket)
+        table = self.table.select(request["columns"]) if request["columns"] else self.table
+        return flight.RecordBatchStream(table.slice(request["offset"], request["length"]))
+
+
+def test_streams_all_endpoints(monkeypatch, sample_classification_data):
+    server = SplittingServer(pa.Table.from_pandas(sample_classification_data, preserve_index=False))
+    try:
+        monkeypatch.setattr(settings, "FLIGHT_LOCATION", f"grpc://127.0.0.1:{server.port}")
+        df = read_flight_dataset("processed/x.csv")
+        pd.testing.assert_frame_equal(df, sample_classification_data)
+
+        projected = read_flight_dataset("processed/x.csv", columns=["target"])
+        assert list(projected.columns) == ["target"] and len(projected) == len(sample_classification_data)
+    finally:
+        server.shutdown()
+
+
+def test_disabled_or_unreachable_falls_back(monkeypatch):
+    monkeypatch.setattr(settings, "FLIGHT_LOCATION", "")
+    assert read_flight_dataset("processed/x.csv") is None
+
+    monkeypatch.setattr(settings, "FLIGHT_LOCATION", "grpc://127.0.0.1:1")
+    monkeypatch.setattr(settings, "FLIGHT_TIMEOUT", 1.0)
+    assert read_flight_dataset("processed/x.csv") is None
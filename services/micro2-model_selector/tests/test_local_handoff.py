@@ -0,0 +1,44 @@
+# tests/test_local_handoff.py
+# --------------------------------------------------------------------
+# Tests for reading datasets handed off locally by the DataPreparer.
+# --------------------------------------------------------------------
+import os
+from urllib.parse import quote
+
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.storage.local_handoff import read_local_dataset
+
+pa = pytest.importorskip("pyarrow")
+
+
+def _publish(root, object_name, df):
+    """Same layout as the DataPreparer: <hash>.arrow linked under by-name/"""
+    os.makedirs(os.path.join(root, "by-name"), exist_ok=True)
+    path = os.path.join(root, "abc123.arrow")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.symlink("../abc123.arrow", os.path.join(root, "by-name", quote(object_name, safe="")))
+
+
+def test_reads_published_dataset(tmp_path, monkeypatch, sample_classification_data):
+    monkeypatch.setattr(settings, "LOCAL_HANDOFF_DIR", str(tmp_path))
+    _publish(str(tmp_path), "processed/iris_processed.csv", sample_classification_data)
+
+    df = read_local_dataset("processed/iris_processed.csv")
+    pd.testing.assert_frame_equal(df, sample_classification_data)
+
+
+def test_misses_fall_back(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LOCAL_HANDOFF_DIR", "")
+    assert read_local_dataset("processed/x.csv") is None
+
+    monkeypatch.setattr(settings, "LOCAL_HANDOFF_DIR", str(tmp_path))
+    assert read_local_dataset("processed/x.csv") is None
+
+    os.makedirs(tmp_path / "by-name")
+    os.symlink("../gone.arrow", tmp_path / "by-name" / quote("processed/x.csv", safe=""))
+    assert read_local_dataset("processed/x.csv") is None
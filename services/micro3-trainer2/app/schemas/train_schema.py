@@ -8,6 +8,9 @@ class TrainRequest(BaseModel):
     target_column: str
     hyperparameters: Dict = {}
     pipeline_id: Optional[str] = None
+    # Split index written by the data preparer (<processed>_splits.csv);
+    # looked up next to data_id when omitted
+    split_index: Optional[str] = None
 
 
 class TrainResponse(BaseModel):
@@ -4,7 +4,7 @@ import os
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, mean_squared_error
 from app.services.model_factory import create_model
-from app.storage.minio_client import load_dataset
+from app.storage.minio_client import load_dataset, object_exists
 import numpy as np
 import traceback
 from app.storage.minio_client import upload_model
@@ -14,6 +14,41 @@ from app.core.logger import logger
 BASE_DIR = "models"
 os.makedirs(BASE_DIR, exist_ok=True)
 
+# Seed of the fallback split when the data preparer stored no split index
+SPLIT_SEED = 42
+
+
+def default_split_index(data_id: str) -> str:
+    """Object the data preparer stores the split index of a processed dataset at"""
+    stem = data_id[:-4] if data_id.endswith(".csv") else data_id
+    return f"{stem}_splits.csv"
+
+
+def split_dataset(X, y, task_type: str, split_index=None):
+    """
+    Return X_train, X_val, y_train, y_val.
+
+    With a split index (DataFrame with a 'split' column aligned to the rows)
+    the materialized partitions are reused: train on 'train', score on 'val'
+    (or 'test' when there is no validation split). Otherwise a seeded,
+    stratified (for classification) 70/30 split is made.
+    """
+    if split_index is not None:
+        if len(split_index) != len(X):
+            raise ValueError(
+                f"Split index has {len(split_index)} rows but the dataset has {len(X)}"
+            )
+        labels = split_index["split"].to_numpy()
+        eval_label = "val" if (labels == "val").any() else "test"
+        train_mask = labels == "train"
+        eval_mask = labels == eval_label
+        return X[train_mask], X[eval_mask], y[train_mask], y[eval_mask]
+
+    stratify = None
+    if task_type == "classification" and y.value_counts().min() >= 2:
+        stratify = y
+    return train_test_split(X, y, test_size=0.3, random_state=SPLIT_SEED, stratify=stratify)
+
 class TrainingOrchestrator:
 
     def __init__(self):
@@ -93,7 +128,8 @@ class TrainingOrchestrator:
                     f"Classification requires discrete integer labels, got {y.dtype}"
                 )
 
-        X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.3)
+        split_index = self.load_split_index(req)
+        X_train, X_val, y_train, y_val = split_dataset(X, y, req.task_type, split_index)
 
         model = create_model(req.model_id, req.hyperparameters, req.task_type)
         model.fit(X_train, y_train)
@@ -140,6 +176,15 @@ class TrainingOrchestrator:
 
         self.jobs[job_id]["status"] = "completed"
 
+    def load_split_index(self, req):
+        """Materialized split index for the request's dataset, if one exists"""
+        index_name = req.split_index or default_split_index(req.data_id)
+        if not req.split_index and not object_exists(index_name):
+            logger.info(f"No split index for {req.data_id}, using seeded split")
+            return None
+        logger.info(f"Using split index {index_name}")
+        return load_dataset(index_name)
+
     def get_job(self, job_id: str):
         return self.jobs.get(job_id)
 
@@ -0,0 +1,46 @@
+# app/storage/flight_client.py
+# --------------------------------------------------------------------
+# Arrow Flight client for datasets served by the DataPreparer.
+#
+# With FLIGHT_LOCATION set (e.g. grpc://datapreparer:8815), datasets are
+# streamed as Arrow record batches over several parallel streams instead
+# of being downloaded and parsed from CSV. Returns None when Flight is
+# not configured or fails, so the caller falls back to MinIO.
+# --------------------------------------------------------------------
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import pandas as pd
+
+from app.core.logger import logger
+
+FLIGHT_LOCATION = os.getenv("FLIGHT_LOCATION", "")
+FLIGHT_STREAMS = int(os.getenv("FLIGHT_STREAMS", "4"))
+FLIGHT_TIMEOUT = float(os.getenv("FLIGHT_TIMEOUT", "5"))
+
+
+def read_flight_dataset(object_name: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """Dataset streamed from the DataPreparer's Flight server, or None"""
+    if not FLIGHT_LOCATION:
+        return None
+    try:
+        import pyarrow as pa
+        from pyarrow import flight
+
+        command = json.dumps({"object": object_name, "columns": columns})
+        with flight.connect(FLIGHT_LOCATION) as client:
+            options = flight.FlightCallOptions(timeout=FLIGHT_TIMEOUT)
+            info = client.get_flight_info(flight.FlightDescriptor.for_command(command), options)
+            endpoints = info.endpoints
+            with ThreadPoolExecutor(max_workers=max(1, min(FLIGHT_STREAMS, len(endpoints)))) as pool:
+                tables = list(pool.map(lambda endpoint: client.do_get(endpoint.ticket).read_all(), endpoints))
+
+        table = pa.concat_tables(tables) if tables else info.schema.empty_table()
+        df = table.to_pandas(split_blocks=True)
+        logger.info(f"Streamed {object_name} over Flight ({len(df)} rows, {len(endpoints)} streams)")
+        return df
+    except Exception as e:
+        logger.warning(f"Flight unavailable for {object_name}, using MinIO: {e}")
+        return None
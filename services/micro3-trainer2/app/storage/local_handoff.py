@@ -0,0 +1,39 @@
+# app/storage/local_handoff.py
+# --------------------------------------------------------------------
+# Reads prepared datasets handed off locally by the DataPreparer.
+#
+# With LOCAL_HANDOFF_DIR pointing at the directory the DataPreparer
+# publishes to (e.g. a /dev/shm directory shared between containers on
+# one host), datasets are memory-mapped from Arrow IPC files instead of
+# being downloaded and parsed from CSV. Returns None on any miss so the
+# caller falls back to MinIO.
+# --------------------------------------------------------------------
+import os
+from typing import Optional
+from urllib.parse import quote
+
+import pandas as pd
+
+from app.core.logger import logger
+
+HANDOFF_DIR = os.getenv("LOCAL_HANDOFF_DIR", "")
+LINKS_DIR = "by-name"
+
+
+def read_local_dataset(object_name: str) -> Optional[pd.DataFrame]:
+    """Memory-mapped dataset published for object_name on this host, or None"""
+    if not HANDOFF_DIR:
+        return None
+    link = os.path.join(HANDOFF_DIR, LINKS_DIR, quote(object_name, safe=""))
+    if not os.path.exists(link):
+        return None
+    try:
+        import pyarrow as pa
+
+        table = pa.ipc.open_file(pa.memory_map(os.path.realpath(link), "r")).read_all()
+        df = table.to_pandas(split_blocks=True)
+        logger.info(f"Loaded {object_name} from local handoff ({len(df)} rows)")
+        return df
+    except Exception as e:
+        logger.warning(f"Local handoff unavailable for {object_name}, using MinIO: {e}")
+        return None
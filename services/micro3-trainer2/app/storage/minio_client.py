@@ -1,8 +1,12 @@
 from minio import Minio
+from minio.error import S3Error
 import pandas as pd
 import os 
 from io import BytesIO
 
+from app.storage.flight_client import read_flight_dataset
+from app.storage.local_handoff import read_local_dataset
+
 client = Minio(
     "minio:9000",
     access_key="minioadmin",
@@ -13,9 +17,24 @@ client = Minio(
 BUCKET = "data-preparer"
 
 def load_dataset(object_name: str) -> pd.DataFrame:
+    # Colocated DataPreparer: memory-mapped Arrow copy; then Flight; then MinIO
+    df = read_local_dataset(object_name)
+    if df is None:
+        df = read_flight_dataset(object_name)
+    if df is not None:
+        return df
     response = client.get_object(BUCKET, object_name)
     return pd.read_csv(response)
 
+def object_exists(object_name: str) -> bool:
+    try:
+        client.stat_object(BUCKET, object_name)
+        return True
+    except S3Error as e:
+        if e.code in ("NoSuchKey", "NoSuchObject"):
+            return False
+        raise
+
 def upload_model(local_path: str, object_name: str):
     """
     Uploads a local file (trained model) to MinIO.
@@ -0,0 +1,34 @@
+# tests/conftest.py
+# --------------------------------------------------------------------
+# Pytest configuration and fixtures for trainer tests.
+# --------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def processed_dataset():
+    """Processed classification dataset as stored by the DataPreparer"""
+    rng = np.random.default_rng(42)
+    n_samples = 300
+
+    return pd.DataFrame({
+        "feature1": rng.normal(size=n_samples),
+        "feature2": rng.normal(size=n_samples),
+        "target": rng.choice([0, 1], n_samples),
+    })
+
+
+@pytest.fixture
+def stored_split_index(processed_dataset):
+    """Split index CSV in the DataPreparer's format ('row', 'split', 'fold')"""
+    rng = np.random.default_rng(7)
+    n_rows = len(processed_dataset)
+    index = pd.DataFrame({
+        "row": np.arange(n_rows),
+        "split": rng.choice(["train", "val", "test"], n_rows, p=[0.7, 0.15, 0.15]),
+        "fold": rng.integers(0, 5, n_rows),
+    })
+    return index.to_csv(index=False).encode()
+
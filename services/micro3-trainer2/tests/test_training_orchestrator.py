@@ -0,0 +1,77 @@
+# tests/test_training_orchestrator.py
+# --------------------------------------------------------------------
+# Tests for reusing the DataPreparer's materialized train/val/test split.
+# MinIO is replaced with an in-memory object store.
+# --------------------------------------------------------------------
+import io
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.services import training_orchestrator as orchestrator_module
+from app.services.training_orchestrator import TrainingOrchestrator, default_split_index, split_dataset
+
+
+def read_stored(data: bytes) -> pd.DataFrame:
+    """Parse a stored CSV object the way the trainer's MinIO fallback does"""
+    return pd.read_csv(io.BytesIO(data))
+
+
+@pytest.fixture
+def store(monkeypatch, processed_dataset, stored_split_index):
+    objects = {
+        "processed/x_processed_20250101_120000.csv": processed_dataset.to_csv(index=False).encode(),
+        "processed/x_processed_20250101_120000_splits.csv": stored_split_index,
+    }
+    monkeypatch.setattr(orchestrator_module, "object_exists", lambda name: name in objects)
+    monkeypatch.setattr(orchestrator_module, "load_dataset", lambda name: read_stored(objects[name]))
+    return objects
+
+
+def request(data_id, split_index=None):
+    return SimpleNamespace(data_id=data_id, split_index=split_index)
+
+
+def test_default_split_index_name():
+    assert default_split_index("processed/x_processed_20250101_120000.csv") == \
+        "processed/x_processed_20250101_120000_splits.csv"
+
+
+def test_split_matches_stored_index(store, processed_dataset):
+    req = request("processed/x_processed_20250101_120000.csv")
+    index = TrainingOrchestrator().load_split_index(req)
+    stored = read_stored(store["processed/x_processed_20250101_120000_splits.csv"])
+    pd.testing.assert_frame_equal(index, stored)
+
+    X, y = processed_dataset.drop(columns=["target"]), processed_dataset["target"]
+    X_train, X_val, y_train, y_val = split_dataset(X, y, "classification", index)
+
+    assert X_train.index.tolist() == stored.loc[stored["split"] == "train", "row"].tolist()
+    assert X_val.index.tolist() == stored.loc[stored["split"] == "val", "row"].tolist()
+    assert y_train.index.equals(X_train.index) and y_val.index.equals(X_val.index)
+    # Test rows are held out from both training and scoring
+    held_out = set(stored.loc[stored["split"] == "test", "row"])
+    assert held_out.isdisjoint(X_train.index) and held_out.isdisjoint(X_val.index)
+
+
+def test_scores_on_test_split_without_validation(processed_dataset):
+    X, y = processed_dataset.drop(columns=["target"]), processed_dataset["target"]
+    index = pd.DataFrame({"row": range(len(X)), "split": ["train", "test"] * (len(X) // 2)})
+
+    X_train, X_val, _, _ = split_dataset(X, y, "classification", index)
+    assert X_train.index.tolist() == list(range(0, len(X), 2))
+    assert X_val.index.tolist() == list(range(1, len(X), 2))
+
+    with pytest.raises(ValueError):
+        split_dataset(X, y, "classification", index.iloc[:-1])
+
+
+def test_seeded_split_without_index(store, processed_dataset):
+    req = request("processed/other.csv")
+    assert TrainingOrchestrator().load_split_index(req) is None
+
+    X, y = processed_dataset.drop(columns=["target"]), processed_dataset["target"]
+    first = split_dataset(X, y, "classification")
+    second = split_dataset(X, y, "classification")
+    assert first[0].index.equals(second[0].index) and len(first[1]) == 90